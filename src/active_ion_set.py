@@ -0,0 +1,47 @@
+import numpy as np
+
+
+class ActiveIonSet ():
+    """
+    Free ions of a running simulation with O(1) removal.
+
+    The set works in place on the ion list of the simulation. A removed ion
+    is replaced by the last ion of the list, so removal never shifts the
+    remaining ions and a sweep over indices visits every ion exactly once.
+
+    Attributes:
+        ions (list): Ion list of the simulation.
+    """
+    def __init__(self, ions: list) -> None:
+        """
+        Initialize the active set.
+
+        Args:
+            ions (list): Ion list of the simulation, modified in place.
+        """
+        self.ions = ions
+
+    def __len__(self) -> int:
+        """Number of free ions."""
+        return len(self.ions)
+
+    def __getitem__(self, index: int):
+        """Free ion at the given position of the set."""
+        return self.ions[index]
+
+    def remove_at(self, index: int) -> None:
+        """
+        Remove the ion at a position by moving the last ion into its place.
+
+        Args:
+            index (int): Position of the removed ion.
+        """
+        last = self.ions.pop()
+        if index < len(self.ions):
+            self.ions[index] = last
+
+    def shuffle(self) -> None:
+        """
+        Put the ions into a random order drawn from the global NumPy generator.
+        """
+        self.ions[:] = [self.ions[i] for i in np.random.permutation(len(self.ions))]
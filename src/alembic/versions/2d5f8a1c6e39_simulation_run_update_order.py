@@ -0,0 +1,28 @@
+"""Simulation Run Update Order
+
+Revision ID: 2d5f8a1c6e39
+Revises: 7b2e9d4c1f85
+Create Date: 2026-10-18 19:12:54.117402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d5f8a1c6e39'
+down_revision: Union[str, Sequence[str], None] = '7b2e9d4c1f85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('simulation_run', sa.Column('update_order', sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('simulation_run', 'update_order')
@@ -0,0 +1,40 @@
+"""Simulation Run
+
+Revision ID: 3c7e1a9b5d42
+Revises: 508fd020fba3
+Create Date: 2026-10-18 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e1a9b5d42'
+down_revision: Union[str, Sequence[str], None] = '508fd020fba3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('simulation_run',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('atoms', sa.Integer(), nullable=False),
+    sa.Column('layout', sa.String(length=16), nullable=False),
+    sa.Column('gyration_radius', sa.Float(), nullable=False),
+    sa.Column('max_generation', sa.Integer(), nullable=True),
+    sa.Column('leaf_count', sa.Integer(), nullable=True),
+    sa.Column('branch_point_count', sa.Integer(), nullable=True),
+    sa.Column('longest_path', sa.Integer(), nullable=True),
+    sa.Column('mean_subtree_size', sa.Float(), nullable=True),
+    sa.Column('generation_histogram', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('simulation_run')
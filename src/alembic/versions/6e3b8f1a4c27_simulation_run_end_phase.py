@@ -0,0 +1,28 @@
+"""Simulation Run End Phase
+
+Revision ID: 6e3b8f1a4c27
+Revises: 2d5f8a1c6e39
+Create Date: 2026-10-19 10:41:07.532918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e3b8f1a4c27'
+down_revision: Union[str, Sequence[str], None] = '2d5f8a1c6e39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('simulation_run', sa.Column('end_phase_threshold', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('simulation_run', 'end_phase_threshold')
@@ -0,0 +1,28 @@
+"""Simulation Run Precision
+
+Revision ID: 7b2e9d4c1f85
+Revises: e4a7c3b9d216
+Create Date: 2026-10-18 18:26:33.804217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e9d4c1f85'
+down_revision: Union[str, Sequence[str], None] = 'e4a7c3b9d216'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('simulation_run', sa.Column('precision', sa.String(length=8), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('simulation_run', 'precision')
@@ -0,0 +1,30 @@
+"""Simulation Run Timing
+
+Revision ID: 9f4b2d6e8a13
+Revises: 3c7e1a9b5d42
+Create Date: 2026-10-18 13:40:05.771902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4b2d6e8a13'
+down_revision: Union[str, Sequence[str], None] = '3c7e1a9b5d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('simulation_run', sa.Column('engine', sa.String(length=16), nullable=True))
+    op.add_column('simulation_run', sa.Column('duration', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('simulation_run', 'duration')
+    op.drop_column('simulation_run', 'engine')
@@ -0,0 +1,32 @@
+"""Simulation Run Params
+
+Revision ID: c1d8e5f2a7b0
+Revises: 9f4b2d6e8a13
+Create Date: 2026-10-18 15:02:47.318640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1d8e5f2a7b0'
+down_revision: Union[str, Sequence[str], None] = '9f4b2d6e8a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('simulation_run', sa.Column('step', sa.Float(), nullable=True))
+    op.add_column('simulation_run', sa.Column('direc_prob', sa.Float(), nullable=True))
+    op.add_column('simulation_run', sa.Column('atom_radius', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('simulation_run', 'atom_radius')
+    op.drop_column('simulation_run', 'direc_prob')
+    op.drop_column('simulation_run', 'step')
@@ -0,0 +1,28 @@
+"""Simulation Run Electrode
+
+Revision ID: e4a7c3b9d216
+Revises: c1d8e5f2a7b0
+Create Date: 2026-10-18 17:41:09.526114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c3b9d216'
+down_revision: Union[str, Sequence[str], None] = 'c1d8e5f2a7b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('simulation_run', sa.Column('electrode', sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('simulation_run', 'electrode')
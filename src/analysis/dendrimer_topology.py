@@ -0,0 +1,133 @@
+import numpy as np
+
+
+class DendrimerTopology ():
+    """
+    Tree statistics of a dendrimer described by an integer parent index array.
+
+    Electrodes are indexed in the order they joined the dendrimer, so every
+    parent index is smaller than the index of its child. Roots have parent -1:
+    the seed electrode, or every particle bound directly to an extended
+    electrode surface. All statistics are computed with vectorized passes over
+    generation levels instead of recursion over electrode objects.
+
+    Attributes:
+        parents (np.ndarray): Parent index of every electrode (-1 for roots).
+        generations (np.ndarray): Generation of every electrode (0 for roots).
+        children_counts (np.ndarray): Number of direct children of every electrode.
+        subtree_sizes (np.ndarray): Number of electrodes in the subtree of every electrode (itself included).
+        heights (np.ndarray): Length of the longest downward path from every electrode.
+    """
+    def __init__(self, parents: np.ndarray) -> None:
+        """
+        Initialize the topology and compute per-electrode statistics.
+
+        Args:
+            parents (np.ndarray): Parent index of every electrode (-1 for roots).
+        """
+        self.parents = np.asarray(parents, dtype=np.int64)
+        self._children = np.nonzero(self.parents >= 0)[0]
+        self.generations = self._calc_generations()
+        self.children_counts = np.bincount(self.parents[self._children], minlength=len(self.parents))
+        self._levels = self._split_levels()
+        self.subtree_sizes = self._calc_subtree_sizes()
+        self.heights = self._calc_heights()
+
+    @property
+    def max_generation(self) -> int:
+        """Length of the longest path from a root."""
+        return int(self.generations.max()) if len(self.parents) > 0 else 0
+
+    @property
+    def leaf_count(self) -> int:
+        """Number of electrodes without children."""
+        return int(np.count_nonzero(self.children_counts == 0))
+
+    @property
+    def branch_point_count(self) -> int:
+        """Number of electrodes with more than one child."""
+        return int(np.count_nonzero(self.children_counts > 1))
+
+    @property
+    def mean_subtree_size(self) -> float:
+        """Mean subtree size over all electrodes."""
+        return float(self.subtree_sizes.mean()) if len(self.parents) > 0 else 0.0
+
+    @property
+    def generation_histogram(self) -> np.ndarray:
+        """Number of electrodes in each generation."""
+        return np.bincount(self.generations)
+
+    @property
+    def longest_path(self) -> int:
+        """
+        Number of bonds on the longest path between any two electrodes.
+
+        Computed from the two highest child subtrees of every electrode.
+        """
+        if len(self._children) == 0:
+            return 0
+        child_parents = self.parents[self._children]
+        child_heights = self.heights[self._children] + 1
+        order = np.lexsort((child_heights, child_parents))
+        child_parents = child_parents[order]
+        child_heights = child_heights[order]
+        group_last = np.append(child_parents[1:] != child_parents[:-1], True)
+        best = np.zeros(len(self.parents), dtype=np.int64)
+        best[child_parents[group_last]] = child_heights[group_last]
+        second = np.zeros(len(self.parents), dtype=np.int64)
+        has_second = group_last[1:] & (child_parents[1:] == child_parents[:-1])
+        second[child_parents[1:][has_second]] = child_heights[:-1][has_second]
+        return int((best + second).max())
+
+    def _calc_generations(self) -> np.ndarray:
+        """
+        Calculate generations by pointer jumping over the parent array.
+
+        Returns:
+            np.ndarray: Generation of every electrode.
+        """
+        ancestors = self.parents.copy()
+        generations = (ancestors >= 0).astype(np.int64)
+        active = np.nonzero(ancestors >= 0)[0]
+        while len(active) > 0:
+            jump = ancestors[active]
+            generations[active] += generations[jump]
+            ancestors[active] = ancestors[jump]
+            active = active[ancestors[active] >= 0]
+        return generations
+
+    def _split_levels(self) -> list[np.ndarray]:
+        """
+        Group electrode indices by generation.
+
+        Returns:
+            list[np.ndarray]: Electrode indices of every generation, roots first.
+        """
+        order = np.argsort(self.generations, kind="stable")
+        bounds = np.cumsum(np.bincount(self.generations))[:-1]
+        return np.split(order, bounds)
+
+    def _calc_subtree_sizes(self) -> np.ndarray:
+        """
+        Accumulate subtree sizes from the deepest generation up to the roots.
+
+        Returns:
+            np.ndarray: Subtree size of every electrode.
+        """
+        sizes = np.ones(len(self.parents), dtype=np.int64)
+        for level in reversed(self._levels[1:]):
+            np.add.at(sizes, self.parents[level], sizes[level])
+        return sizes
+
+    def _calc_heights(self) -> np.ndarray:
+        """
+        Propagate the longest downward path from the deepest generation up to the roots.
+
+        Returns:
+            np.ndarray: Height of every electrode (0 for leaves).
+        """
+        heights = np.zeros(len(self.parents), dtype=np.int64)
+        for level in reversed(self._levels[1:]):
+            np.maximum.at(heights, self.parents[level], heights[level] + 1)
+        return heights
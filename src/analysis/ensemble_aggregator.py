@@ -0,0 +1,91 @@
+import numpy as np
+
+from layout.layout import Layout
+
+
+class EnsembleAggregator ():
+    """
+    Fold finished simulations into running ensemble statistics.
+
+    Only a few numbers per (layout, number of atoms) are kept, so the memory
+    of a sweep does not grow with the number of runs.
+
+    Attributes:
+        counts (dict): Number of runs for each (layout, atoms) key.
+        means (dict): Running mean of the gyration radius for each key.
+        generation_histograms (dict): Summed generation histogram for each key.
+    """
+    def __init__(self) -> None:
+        """
+        Initialize an empty aggregator.
+        """
+        self.counts = {}
+        self.means = {}
+        self._m2 = {}
+        self.generation_histograms = {}
+
+    def add_run(self, layout: Layout, atoms_num: int, radius_of_gyration: float, generation_histogram: np.ndarray) -> None:
+        """
+        Fold one finished simulation into the statistics (Welford update).
+
+        Args:
+            layout (Layout): Starting layout of the simulation.
+            atoms_num (int): Number of atoms in the simulation.
+            radius_of_gyration (float): Gyration radius of the resulting dendrimer.
+            generation_histogram (np.ndarray): Number of electrodes in each generation.
+        """
+        key = (layout, atoms_num)
+        count = self.counts.get(key, 0) + 1
+        mean = self.means.get(key, 0.0)
+        delta = radius_of_gyration - mean
+        mean += delta / count
+        self.counts[key] = count
+        self.means[key] = mean
+        self._m2[key] = self._m2.get(key, 0.0) + delta * (radius_of_gyration - mean)
+        self.generation_histograms[key] = self._add_histograms(
+            self.generation_histograms.get(key, np.zeros(0, dtype=np.int64)), generation_histogram)
+
+    def variance(self, layout: Layout, atoms_num: int) -> float:
+        """
+        Sample variance of the gyration radius.
+
+        Args:
+            layout (Layout): Starting layout of the simulations.
+            atoms_num (int): Number of atoms in the simulations.
+
+        Returns:
+            float: Sample variance, NaN for fewer than two runs.
+        """
+        key = (layout, atoms_num)
+        if self.counts.get(key, 0) < 2:
+            return float("nan")
+        return self._m2[key] / (self.counts[key] - 1)
+
+    def report(self) -> None:
+        """
+        Print the ensemble statistics of all aggregated runs.
+        """
+        for layout, atoms_num in sorted(self.counts, key=lambda key: (key[0].value, key[1])):
+            key = (layout, atoms_num)
+            histogram = self.generation_histograms[key]
+            mean_generation = np.dot(np.arange(len(histogram)), histogram) / histogram.sum()
+            print(f"{layout.value}, N = {atoms_num}: runs = {self.counts[key]}, "
+                  f"Rg = {self.means[key]:.4f} +- {np.sqrt(self.variance(layout, atoms_num)):.4f}, "
+                  f"max generation = {len(histogram) - 1}, mean generation = {mean_generation:.2f}")
+
+    @staticmethod
+    def _add_histograms(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """
+        Sum two histograms of possibly different lengths.
+
+        Args:
+            first (np.ndarray): First histogram.
+            second (np.ndarray): Second histogram.
+
+        Returns:
+            np.ndarray: Elementwise sum padded to the longer histogram.
+        """
+        total = np.zeros(max(len(first), len(second)), dtype=np.int64)
+        total[:len(first)] += first
+        total[:len(second)] += second
+        return total
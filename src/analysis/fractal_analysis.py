@@ -0,0 +1,226 @@
+import numpy as np
+
+import config
+
+
+class FractalAnalysis ():
+    """
+    Fractal analysis of a single final aggregate.
+
+    All methods work on a plain (N, 3) array of particle positions, so one
+    finished dendrimer is enough to estimate its fractal dimension.
+
+    Attributes:
+        positions (np.ndarray): Positions of all aggregate particles, shape (N, 3).
+        seed_position (np.ndarray): Position of the seed electrode.
+        atom_radius (float): Radius of a single particle.
+    """
+    def __init__(self, positions: np.ndarray, seed_position: np.ndarray | None = None,
+                 atom_radius: float = config.ATOM_RADIUS) -> None:
+        """
+        Initialize the analysis.
+
+        Args:
+            positions (np.ndarray): Positions of all aggregate particles, shape (N, 3).
+            seed_position (np.ndarray | None): Seed electrode position, origin if None.
+            atom_radius (float): Radius of a single particle.
+        """
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        self.seed_position = np.zeros(3) if seed_position is None else np.asarray(seed_position, dtype=np.float64)
+        self.atom_radius = atom_radius
+
+    def box_counting_dimension(self, box_sizes: np.ndarray | None = None) -> tuple:
+        """
+        Estimate the box-counting dimension of the aggregate.
+
+        Args:
+            box_sizes (np.ndarray | None): Edge lengths of the counting boxes.
+                Geometric sequence from one particle diameter to the aggregate extent if None.
+
+        Returns:
+            tuple: (float, np.ndarray, np.ndarray) - dimension, box sizes and occupied box counts.
+        """
+        if box_sizes is None:
+            extent = np.ptp(self.positions, axis=0).max() if len(self.positions) > 1 else 0.0
+            box_sizes = self._geometric_range(2 * self.atom_radius, extent)
+        box_sizes = np.asarray(box_sizes, dtype=np.float64)
+        origin = self.positions.min(axis=0)
+        counts = np.empty(len(box_sizes), dtype=np.int64)
+        for i, size in enumerate(box_sizes):
+            cells = np.floor((self.positions - origin) / size).astype(np.int64)
+            counts[i] = len(np.unique(self._cell_keys(cells), axis=0))
+        dimension = -self._fit_slope(np.log(box_sizes), np.log(counts))
+        return dimension, box_sizes, counts
+
+    def mass_radius_dimension(self, radii: np.ndarray | None = None) -> tuple:
+        """
+        Estimate the fractal dimension from mass-radius scaling around the seed electrode.
+
+        Args:
+            radii (np.ndarray | None): Radii of the counting spheres.
+                Geometric sequence from two particle diameters to half of the aggregate radius if None.
+
+        Returns:
+            tuple: (float, np.ndarray, np.ndarray) - dimension, radii and particle counts within each radius.
+        """
+        distances = np.sort(np.linalg.norm(self.positions - self.seed_position, axis=1))
+        if radii is None:
+            radii = self._geometric_range(4 * self.atom_radius, distances[-1] / 2)
+        radii = np.asarray(radii, dtype=np.float64)
+        masses = np.searchsorted(distances, radii, side="right")
+        dimension = self._fit_slope(np.log(radii), np.log(np.maximum(masses, 1)))
+        return dimension, radii, masses
+
+    def pair_correlation(self, r_max: float | None = None, bins: int = config.ANALYSIS_PAIR_BINS) -> tuple:
+        """
+        Calculate the pair-correlation function of the aggregate.
+
+        The result is the mean number density of particles in a spherical shell
+        at distance r around a particle of the aggregate, which scales as r^(Df - 3).
+        Pairs are found through a cell list, so memory stays bounded by
+        config.ANALYSIS_PAIR_CHUNK distances at any time.
+
+        Args:
+            r_max (float | None): Largest pair distance, ANALYSIS_PAIR_RANGE particle diameters if None.
+            bins (int): Number of distance bins.
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray) - bin centers and pair-correlation values.
+        """
+        if r_max is None:
+            r_max = config.ANALYSIS_PAIR_RANGE * 2 * self.atom_radius
+        edges = np.linspace(0, r_max, bins + 1)
+        histogram = self._pair_distance_histogram(r_max, bins)
+        shell_volumes = 4 / 3 * np.pi * (edges[1:] ** 3 - edges[:-1] ** 3)
+        correlation = 2 * histogram / (len(self.positions) * shell_volumes)
+        return (edges[1:] + edges[:-1]) / 2, correlation
+
+    def _pair_distance_histogram(self, r_max: float, bins: int) -> np.ndarray:
+        """
+        Histogram of all pair distances shorter than r_max.
+
+        Particles are sorted into cubic cells with edge r_max / 2, so only pairs
+        from cells at most two cells apart are ever evaluated. Differences are
+        taken in float32, which is far below the bin width in precision.
+
+        Args:
+            r_max (float): Largest pair distance.
+            bins (int): Number of equally wide distance bins.
+
+        Returns:
+            np.ndarray: Number of unordered particle pairs in each bin.
+        """
+        histogram = np.zeros(bins, dtype=np.int64)
+        relative = self.positions - self.positions.min(axis=0)
+        cells = np.floor(relative / (r_max / 2)).astype(np.int64)
+        keys = self._cell_keys(cells)
+        order = np.argsort(keys, kind="stable")
+        positions = relative[order].astype(np.float32)
+        keys = keys[order]
+        cell_keys, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+        cell_coords = cells[order][starts]
+        for offset in self._half_shell_offsets(2):
+            neighbour_keys = self._cell_keys(cell_coords + offset)
+            idx = np.minimum(np.searchsorted(cell_keys, neighbour_keys), len(cell_keys) - 1)
+            found = cell_keys[idx] == neighbour_keys
+            if not offset.any():
+                found &= counts > 1
+            if not found.any():
+                continue
+            a, b = np.nonzero(found)[0], idx[found]
+            for i, j in self._expand_cell_pairs(starts[a], counts[a], starts[b], counts[b]):
+                if not offset.any():
+                    upper = i < j
+                    i, j = i[upper], j[upper]
+                diff = positions[i] - positions[j]
+                dist_sq = np.einsum("ij,ij->i", diff, diff)
+                dist = np.sqrt(dist_sq[dist_sq < r_max * r_max])
+                bin_idx = np.minimum((dist * (bins / r_max)).astype(np.int64), bins - 1)
+                histogram += np.bincount(bin_idx, minlength=bins)
+        return histogram
+
+    @staticmethod
+    def _expand_cell_pairs(start_a: np.ndarray, count_a: np.ndarray, start_b: np.ndarray, count_b: np.ndarray):
+        """
+        Expand matched cell pairs into particle index pairs in bounded chunks.
+
+        Args:
+            start_a (np.ndarray): First sorted particle index of each cell A.
+            count_a (np.ndarray): Number of particles in each cell A.
+            start_b (np.ndarray): First sorted particle index of each cell B.
+            count_b (np.ndarray): Number of particles in each cell B.
+
+        Yields:
+            tuple: (np.ndarray, np.ndarray) - particle indices i and j of a chunk of pairs.
+        """
+        sizes = count_a * count_b
+        cumulative = np.cumsum(sizes)
+        first = 0
+        while first < len(sizes):
+            base = cumulative[first] - sizes[first]
+            last = max(np.searchsorted(cumulative, base + config.ANALYSIS_PAIR_CHUNK, side="right"), first + 1)
+            chunk_sizes = sizes[first:last]
+            pair_cell = np.repeat(np.arange(first, last), chunk_sizes)
+            chunk_offsets = cumulative[first:last] - chunk_sizes - base
+            local = np.arange(chunk_sizes.sum()) - np.repeat(chunk_offsets, chunk_sizes)
+            yield (start_a[pair_cell] + local // count_b[pair_cell],
+                   start_b[pair_cell] + local % count_b[pair_cell])
+            first = last
+
+    @staticmethod
+    def _half_shell_offsets(reach: int) -> np.ndarray:
+        """
+        Neighbour cell offsets covering every cell pair exactly once.
+
+        Args:
+            reach (int): Largest offset along a single axis.
+
+        Returns:
+            np.ndarray: The zero offset followed by one of each pair of opposite offsets.
+        """
+        axis = np.arange(-reach, reach + 1)
+        offsets = np.array(np.meshgrid(axis, axis, axis, indexing="ij")).reshape(3, -1).T
+        return offsets[len(offsets) // 2:]
+
+    @staticmethod
+    def _cell_keys(cells: np.ndarray) -> np.ndarray:
+        """
+        Map integer cell coordinates to unique scalar keys.
+
+        Args:
+            cells (np.ndarray): Integer cell coordinates, shape (N, 3).
+
+        Returns:
+            np.ndarray: One int64 key per cell.
+        """
+        shifted = cells + (1 << 20)
+        return (shifted[:, 0] << 42) | (shifted[:, 1] << 21) | shifted[:, 2]
+
+    @staticmethod
+    def _geometric_range(low: float, high: float) -> np.ndarray:
+        """
+        Geometric sequence of scales for the scaling fits.
+
+        Args:
+            low (float): Smallest scale.
+            high (float): Largest scale.
+
+        Returns:
+            np.ndarray: ANALYSIS_SCALES values from low to high (at least two distinct values).
+        """
+        high = max(high, 2 * low)
+        return np.geomspace(low, high, config.ANALYSIS_SCALES)
+
+    @staticmethod
+    def _fit_slope(x: np.ndarray, y: np.ndarray) -> float:
+        """
+        Slope of the least-squares line through the given points.
+
+        Args:
+            x (np.ndarray): Independent variable.
+            y (np.ndarray): Dependent variable.
+
+        Returns:
+            float: Slope of the fitted line.
+        """
+        return float(np.polyfit(x, y, 1)[0])
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+class RunningRegression ():
+    """
+    Least-squares line fitted from running sums.
+
+    Points are added in batches; only the count and the sums of x, y, x^2
+    and x*y are kept, so adding a batch costs O(batch) and the fit O(1) no
+    matter how many points were added before.
+
+    Attributes:
+        count (int): Number of added points.
+        x_min (float): Smallest added x, inf before the first point.
+        x_max (float): Largest added x, -inf before the first point.
+    """
+    def __init__(self) -> None:
+        """
+        Initialize an empty regression.
+        """
+        self.count = 0
+        self.x_min = np.inf
+        self.x_max = -np.inf
+        self._sums = np.zeros(4) # x, y, x^2, x*y
+
+    def add(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Add a batch of points.
+
+        Args:
+            x (np.ndarray): Independent values.
+            y (np.ndarray): Dependent values.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(x) == 0:
+            return
+        self.count += len(x)
+        self.x_min = min(self.x_min, float(x.min()))
+        self.x_max = max(self.x_max, float(x.max()))
+        self._sums += [x.sum(), y.sum(), np.dot(x, x), np.dot(x, y)]
+
+    def fit(self) -> tuple:
+        """
+        Slope and intercept of the least-squares line.
+
+        Returns:
+            tuple: (float, float) - slope and intercept, NaN while all added x are equal.
+        """
+        sum_x, sum_y, sum_xx, sum_xy = self._sums
+        sxx = self.count * sum_xx - sum_x ** 2
+        if self.count < 2 or sxx <= 1e-12 * self.count * sum_xx:
+            return np.nan, np.nan
+        slope = (self.count * sum_xy - sum_x * sum_y) / sxx
+        return slope, (sum_y - slope * sum_x) / self.count
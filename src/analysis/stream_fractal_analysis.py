@@ -0,0 +1,114 @@
+import numpy as np
+
+import config
+from analysis.fractal_analysis import FractalAnalysis
+from storage.cluster_store import ClusterStore
+
+
+class StreamFractalAnalysis (FractalAnalysis):
+    """
+    Fractal analysis of an aggregate kept in a ClusterStore.
+
+    The box-counting and mass-radius dimensions are accumulated chunk by
+    chunk, so only one chunk of positions and the set of occupied boxes are
+    in memory at any time. The pair-correlation function needs the whole
+    aggregate and is not available.
+
+    Attributes:
+        store (ClusterStore): Storage of the aggregate particles.
+        seed_position (np.ndarray): Position of the seed electrode.
+        atom_radius (float): Radius of a single particle.
+    """
+    def __init__(self, store: ClusterStore, seed_position: np.ndarray | None = None,
+                 atom_radius: float = config.ATOM_RADIUS) -> None:
+        """
+        Initialize the analysis.
+
+        Args:
+            store (ClusterStore): Storage of the aggregate particles.
+            seed_position (np.ndarray | None): Seed electrode position, origin if None.
+            atom_radius (float): Radius of a single particle.
+        """
+        self.store = store
+        self.seed_position = np.zeros(3) if seed_position is None else np.asarray(seed_position, dtype=np.float64)
+        self.atom_radius = atom_radius
+
+    def box_counting_dimension(self, box_sizes: np.ndarray | None = None) -> tuple:
+        """
+        Estimate the box-counting dimension of the aggregate.
+
+        Args:
+            box_sizes (np.ndarray | None): Edge lengths of the counting boxes.
+                Geometric sequence from one particle diameter to the aggregate extent if None.
+
+        Returns:
+            tuple: (float, np.ndarray, np.ndarray) - dimension, box sizes and occupied box counts.
+        """
+        low, high = self._bounds()
+        if box_sizes is None:
+            box_sizes = self._geometric_range(2 * self.atom_radius, float(np.max(high - low)))
+        box_sizes = np.asarray(box_sizes, dtype=np.float64)
+        occupied = [np.zeros(0, dtype=np.int64) for _ in box_sizes]
+        for positions in self._chunks():
+            for i, size in enumerate(box_sizes):
+                cells = np.floor((positions - low) / size).astype(np.int64)
+                occupied[i] = np.union1d(occupied[i], self._cell_keys(cells))
+        counts = np.array([len(keys) for keys in occupied], dtype=np.int64)
+        dimension = -self._fit_slope(np.log(box_sizes), np.log(counts))
+        return dimension, box_sizes, counts
+
+    def mass_radius_dimension(self, radii: np.ndarray | None = None) -> tuple:
+        """
+        Estimate the fractal dimension from mass-radius scaling around the seed electrode.
+
+        Args:
+            radii (np.ndarray | None): Radii of the counting spheres.
+                Geometric sequence from two particle diameters to half of the aggregate radius if None.
+
+        Returns:
+            tuple: (float, np.ndarray, np.ndarray) - dimension, radii and particle counts within each radius.
+        """
+        if radii is None:
+            max_distance = max((float(np.linalg.norm(positions - self.seed_position, axis=1).max())
+                                for positions in self._chunks()), default=0.0)
+            radii = self._geometric_range(4 * self.atom_radius, max_distance / 2)
+        radii = np.asarray(radii, dtype=np.float64)
+        masses = np.zeros(len(radii), dtype=np.int64)
+        for positions in self._chunks():
+            distances = np.sort(np.linalg.norm(positions - self.seed_position, axis=1))
+            masses += np.searchsorted(distances, radii, side="right")
+        dimension = self._fit_slope(np.log(radii), np.log(np.maximum(masses, 1)))
+        return dimension, radii, masses
+
+    def pair_correlation(self, r_max: float | None = None, bins: int = config.ANALYSIS_PAIR_BINS) -> tuple:
+        """
+        Not available for streamed aggregates.
+
+        Raises:
+            NotImplementedError: Always.
+        """
+        raise NotImplementedError("Pair correlation needs the whole aggregate in memory.")
+
+    def _chunks(self):
+        """
+        Iterate over the stored positions chunk by chunk.
+
+        Yields:
+            np.ndarray: Positions of a chunk in float64.
+        """
+        for positions, _, _ in self.store.iter_chunks():
+            yield np.asarray(positions, dtype=np.float64)
+
+    def _bounds(self) -> tuple:
+        """
+        Bounding box of the aggregate.
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray) - lowest and highest coordinates.
+        """
+        low = np.full(3, np.inf)
+        high = np.full(3, -np.inf)
+        for positions in self._chunks():
+            low = np.minimum(low, positions.min(axis=0))
+            high = np.maximum(high, positions.max(axis=0))
+        return low, high
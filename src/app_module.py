@@ -2,9 +2,12 @@ from injector import Module, singleton, provider
 from sqlalchemy.orm import Session
 from sqlalchemy.engine import Engine
 
-from database.db_connect import get_engine, get_session
+from database.db_connect import get_engine, ScopedSession
 from database.repositories.gyration_ratio_repository import GyrationRatioRepository
 from database.services.gyration_ratio_service import GyrationRatioService
+from database.repositories.simulation_run_repository import SimulationRunRepository
+from database.services.simulation_run_service import SimulationRunService
+from query.results_cache import ResultsCache
 
 class AppModule(Module):
 
@@ -15,7 +18,8 @@ class AppModule(Module):
 
     @provider
     def provide_session(self) -> Session:
-        return next(get_session())
+        # thread-local proxy, closed at the end of every session_scope
+        return ScopedSession
 
     @provider
     def provide_gyration_ratio_repository(self, session : Session) -> GyrationRatioRepository:
@@ -24,3 +28,17 @@ class AppModule(Module):
     @provider
     def provide_gyration_ratio_service(self, repo : GyrationRatioRepository) -> GyrationRatioService:
         return GyrationRatioService(repo)
+
+    @provider
+    def provide_simulation_run_repository(self, session : Session) -> SimulationRunRepository:
+        return SimulationRunRepository(session)
+
+    @provider
+    def provide_simulation_run_service(self, repo : SimulationRunRepository) -> SimulationRunService:
+        return SimulationRunService(repo)
+
+    @singleton
+    @provider
+    def provide_results_cache(self, gyration_ratio_service : GyrationRatioService,
+                              simulation_run_service : SimulationRunService) -> ResultsCache:
+        return ResultsCache(gyration_ratio_service, simulation_run_service)
@@ -13,18 +13,21 @@ class AtomBase(ABC):
 
     Attributes:
         position (np.array): 3D position of the atom in space.
+        radius (float): Radius of the atom.
         positions_list (list): List of all positions occupied during the simulation.
         sphere: Visual representation of the atom as a sphere.
         color: Color of the atom for visualization.
     """
-    def __init__(self, position: np.ndarray) -> None:
+    def __init__(self, position: np.ndarray, radius: float = config.ATOM_RADIUS) -> None:
         """
         Initialize an Atom instance.
 
         Args:
             position (np.ndarray): 3D position of the atom in space [x, y, z].
+            radius (float): Radius of the atom.
         """
         self.position = position
+        self.radius = radius
         self.positions_list = [self.position]
         self.sphere = None
         self.color = None
@@ -58,7 +61,7 @@ class AtomBase(ABC):
             position (np.ndarray): 3D position where the sphere should be placed [x, y, z].
         """
         self.sphere = scene.visuals.Sphere(
-            radius=config.ATOM_RADIUS,
+            radius=self.radius,
             method='ico',
             parent=view.scene,
             color = self.color,
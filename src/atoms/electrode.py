@@ -13,19 +13,22 @@ class Electrode(AtomBase):
     Attributes:
         position (np.array): 3D position of the atom in space.
         generation (int): Generation index of the particle within the dendrimer.
+        index (int): Order in which the electrode joined the dendrimer (0 for the seed).
         positions_list (list): List of all positions occupied during the simulation.
     """
-    def __init__(self, position: np.ndarray) -> None:
+    def __init__(self, position: np.ndarray, radius: float = config.ATOM_RADIUS) -> None:
         """
         Initialize an Electrode instance.
 
         Args:
             position (np.ndarray): 3D position of the electrode in space [x, y, z].
+            radius (float): Radius of the electrode.
         """
-        super().__init__(position)
+        super().__init__(position, radius)
         self.generation = 0
         self.orig_generation = self.generation
         self.parent_electrode = None
+        self.index = 0
 
     def display(self, view, sim_time: str) -> None:
         """
@@ -16,18 +16,26 @@ class Ion(AtomBase):
         position (np.array): 3D position of the atom in space.
         positions_list (list): List of all positions occupied during the simulation.
         electrode_dist (float): Distance to the nearest electrode position.
+        neighbour_list (np.ndarray | None): Indices of the electrodes that can be nearest to the ion
+            during its next moves, None until the first nearest search.
+        neighbour_count (int): Number of electrodes when the neighbour list was built.
+        neighbour_moves (int): Number of moves for which the neighbour list stays valid.
         parent_electrode (Atom): For ions: None. For electrodes: reference to the
             neighboring electrode with lower generation.
     """
-    def __init__(self, position: np.ndarray) -> None:
+    def __init__(self, position: np.ndarray, radius: float = config.ATOM_RADIUS) -> None:
         """
         Initialize an Ion instance.
 
         Args:
             position (np.ndarray): 3D position of the ion in space [x, y, z].
+            radius (float): Radius of the ion.
         """
-        super().__init__(position)
+        super().__init__(position, radius)
         self.electrode_dist = Calculation.vec_magnitude(Calculation.opposite_direction(self.position))
+        self.neighbour_list = None
+        self.neighbour_count = 0
+        self.neighbour_moves = 0
 
     def display(self, view, sim_time: str) -> None:
         """
@@ -41,18 +49,19 @@ class Ion(AtomBase):
         self.color = self._set_fg_color()
         self._display_sphere(view, position)
 
-    def transform_to_electrode(self, nearest_electrode) -> None:
+    def transform_to_electrode(self, nearest_electrode, atom_radius: float) -> None:
         """
         Convert an ion into an electrode when it becomes bound to the dendrimer.
 
         Args:
             nearest_electrode (Electrode): Nearest (parent) electrode to this ion.
+            atom_radius (float): Radius of a single atom.
         """
         self.__class__ = Electrode
         self.parent_electrode = nearest_electrode
         self.generation = self.parent_electrode.generation + 1
         self.orig_generation = None
-        new_pos = Calculation.final_pos_optimalization(self)
+        new_pos = Calculation.final_pos_optimalization(self, atom_radius)
         self.update_position(new_pos)
 
     def _set_fg_color(self, generation: Optional[int] = None) -> Any:
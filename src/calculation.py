@@ -1,6 +1,8 @@
 import numpy as np
 
 import config
+from active_ion_set import ActiveIonSet
+from update_order_type import UpdateOrderType
 
 class Calculation ():
     """
@@ -9,18 +11,38 @@ class Calculation ():
     Attributes:
         simulation (Simulation): Parent simulation instance.
         ions (list): List of all ion objects in the simulation.
+        active (ActiveIonSet): Free ions with O(1) removal, working on the ions list.
         electrodes (list): List of all electrode objects in the simulation.
+        params (SimulationParams): Physical parameters of the simulation.
+        geometry (ElectrodeGeometry | None): Analytic electrode surface, None for a single seed electrode.
+        dtype (np.dtype): Floating-point type of particle positions.
+        reporter (ProgressReporter | None): Receiver of progress events, None to run silently.
+        ion_steps (int): Total number of ion steps performed.
     """
-    def __init__(self, simulation) -> None:
+    def __init__(self, simulation, reporter=None) -> None:
         """
         Initialize the Calculation helper.
 
         Args:
             simulation (Simulation): Parent simulation instance.
+            reporter (ProgressReporter | None): Receiver of progress events, None to run silently.
         """
         self.master = simulation
         self.ions = simulation.ions
+        self.active = ActiveIonSet(self.ions)
         self.electrodes = simulation.electrodes
+        self.params = simulation.params
+        self.geometry = simulation.geometry
+        self.dtype = simulation.precision.dtype
+        self.reporter = reporter
+        self.ion_steps = 0
+        self._pos_sum = np.zeros(3)
+        self._sq_sum = 0.0
+        self._cluster_count = 0
+        self._electrode_positions = np.zeros((max(len(self.electrodes), 64), 3), dtype=self.dtype)
+        for i, electrode in enumerate(self.electrodes):
+            self._add_to_cluster_sums(electrode.position)
+            self._electrode_positions[i] = electrode.position
 
     def calculate_sim(self) -> None:
         """
@@ -28,34 +50,109 @@ class Calculation ():
 
         The simulation advances while there is at least one free ion in space;
         otherwise the calculation (and the whole simulation) terminates.
+        Progress is passed to the reporter once per sweep. Positions stay in the
+        precision of the simulation, while the cluster sums are kept in float64.
+        Once at most end_phase_threshold ions are left, the end phase takes over.
         """
-        while len(self.ions) != 0:
-            for ion in self.ions:
-                shortest_dist, nearest_elec = self._shortest_electrode_dist(ion)
-                if self._is_electrode(ion, nearest_elec):
-                    continue
-                ion.electrode_dist = shortest_dist
-                shift_vec = self._gen_biased_vector(ion, nearest_elec)
-                ion.update_position(ion.position + shift_vec * config.STEP)
+        while len(self.active) != 0:
+            if len(self.active) <= self.params.end_phase_threshold:
+                self._end_phase_sweep()
+            else:
+                self.ion_steps += len(self.active)
+                if self.params.update_order == UpdateOrderType.SYNCHRONOUS:
+                    self._synchronous_sweep()
+                else:
+                    if self.params.update_order == UpdateOrderType.RANDOM:
+                        self.active.shuffle()
+                    self._sequential_sweep()
+            if self.reporter is not None:
+                self.reporter.update(len(self.active), self.ion_steps, self.cluster_gyration())
+        if self.reporter is not None:
+            self.reporter.finish(self.ion_steps, self.cluster_gyration())
+
+    def _sequential_sweep(self) -> None:
+        """
+        Advance every free ion once, in the order of the active set.
+
+        Ions see the electrodes bound earlier in the same sweep. A bound ion is
+        replaced by the last ion of the set, which is then advanced in its place.
+        """
+        i = 0
+        while i < len(self.active):
+            ion = self.active[i]
+            shortest_dist, nearest_elec = self._shortest_electrode_dist(ion)
+            if self._is_electrode(ion, nearest_elec):
+                self.active.remove_at(i)
+                continue
+            self._move_ion(ion, shortest_dist, nearest_elec)
+            i += 1
+
+    def _synchronous_sweep(self) -> None:
+        """
+        Advance every free ion once against the dendrimer as it was at the start of the sweep.
+
+        Ions that bond are bound after the sweep in the order of the active set.
+        """
+        bonding = []
+        for i in range(len(self.active)):
+            ion = self.active[i]
+            shortest_dist, nearest_elec = self._shortest_electrode_dist(ion)
+            if ion.electrode_dist <= self.params.bond_distance:
+                bonding.append((i, nearest_elec))
+                continue
+            self._move_ion(ion, shortest_dist, nearest_elec)
+        for i, nearest_elec in bonding:
+            self._attach(self.active[i], nearest_elec)
+        for i, _ in reversed(bonding):
+            self.active.remove_at(i)
+
+    def _move_ion(self, ion, shortest_dist: float, nearest_electrode) -> None:
+        """
+        Move a free ion by one biased step.
+
+        Args:
+            ion (Ion): Free ion of interest.
+            shortest_dist (float): Distance from the ion to its nearest electrode.
+            nearest_electrode (Electrode): Nearest electrode to the ion.
+        """
+        ion.electrode_dist = shortest_dist
+        shift_vec = self._gen_biased_vector(ion, nearest_electrode)
+        ion.update_position(np.asarray(ion.position + shift_vec * self.params.step, dtype=self.dtype))
+
+    def cluster_gyration(self) -> float:
+        """
+        Radius of gyration of the electrodes, kept up to date from running sums.
+
+        Returns:
+            float: Current radius of gyration of the dendrimer.
+        """
+        count = self._cluster_count
+        if count == 0:
+            return 0.0
+        center = self._pos_sum / count
+        return float(np.sqrt(max(self._sq_sum / count - np.dot(center, center), 0.0)))
 
     @staticmethod
-    def final_pos_optimalization(atom) -> np.ndarray:
+    def final_pos_optimalization(atom, atom_radius: float) -> np.ndarray:
         """
         Optimize a particle's final position when the ion is bound to the dendrimer.
 
         Args:
             atom (Atom): Atom of interest.
+            atom_radius (float): Radius of a single atom.
 
         Returns:
-            np.ndarray: Adjusted position of the atom at exactly 2*ATOM_RADIUS distance from parent.
+            np.ndarray: Adjusted position of the atom at exactly 2*atom_radius distance from parent,
+                in the floating-point type of the atom position.
         """
+        dtype = atom.position.dtype
         electrode_pos = atom.parent_electrode.position
-        elec_to_ion = np.array(atom.position - electrode_pos)
+        elec_to_ion = atom.position - electrode_pos
         distance = np.linalg.norm(elec_to_ion)
         if distance == 0:
             return np.array(atom.position)
-        norm_elec_to_ion = np.array(elec_to_ion / distance)
-        return np.array(electrode_pos + norm_elec_to_ion * 2 * config.ATOM_RADIUS)
+        norm_elec_to_ion = elec_to_ion / distance
+        return np.asarray(electrode_pos + norm_elec_to_ion * 2 * atom_radius, dtype=dtype)
 
 
     @staticmethod
@@ -88,28 +185,80 @@ class Calculation ():
         """
         Calculate the distance from an ion to the nearest electrode of the dendrimer.
 
+        With an analytic electrode surface, the surface competes with the
+        electrode particles through a virtual anchor particle below its nearest point.
+
+        Args:
+            ion (Ion): Free ion of interest.
+
+        Returns:
+            tuple: (float, Electrode) - shortest distance and the nearest electrode object.
+        """
+        shortest_dist, nearest_elec = self._scan_electrodes(ion, self._neighbour_candidates(ion))
+        if config.NEIGHBOUR_LIST_CHECK and (shortest_dist, nearest_elec) != self._scan_electrodes(ion, self.electrodes):
+            raise RuntimeError(f"Neighbour list of the ion at {ion.position} misses its nearest electrode")
+        if self.geometry is not None:
+            surface_dist = self.geometry.surface_distance(ion.position) + self.params.atom_radius
+            if nearest_elec is None or surface_dist < shortest_dist:
+                shortest_dist = surface_dist
+                nearest_elec = self.geometry.anchor(ion.position, self.params.atom_radius)
+        return shortest_dist, nearest_elec
+
+    def _scan_electrodes(self, ion, electrodes) -> tuple:
+        """
+        Find the nearest of the given electrodes.
+
         Args:
             ion (Ion): Free ion of interest.
+            electrodes (Iterable[Electrode]): Searched electrodes in ascending index order.
 
         Returns:
             tuple: (float, Electrode) - shortest distance and the nearest electrode object.
         """
         shortest_dist = 1000
         nearest_elec = self.master.electrode
-        for electrode in self.electrodes:
+        for electrode in electrodes:
             actual_distance = np.linalg.norm(ion.position - electrode.position)
             if actual_distance < shortest_dist:
                 shortest_dist = actual_distance
                 nearest_elec = electrode
         return shortest_dist, nearest_elec
 
+    def _neighbour_candidates(self, ion) -> list:
+        """
+        Electrodes that can be the nearest electrode of a free ion, in ascending index order.
+
+        The list of an ion holds the electrodes closer than d + 2 * k * step
+        to the position it was built at, where d is the distance to the
+        nearest electrode and k is NEIGHBOUR_LIST_MOVES. An ion moves by one
+        step between two searches, so during the next k - 1 searches every
+        other electrode stays farther than the electrodes on the list.
+        Electrodes bound after the list was built are always candidates. The
+        list is rebuilt once it has been used k times.
+
+        Args:
+            ion (Ion): Free ion of interest.
+
+        Returns:
+            list: Candidate electrodes.
+        """
+        count = len(self.electrodes)
+        if ion.neighbour_moves <= 0 or ion.neighbour_list is None:
+            distances = np.sqrt(np.sum((self._electrode_positions[:count] - ion.position) ** 2, axis=1, dtype=np.float64))
+            reach = (distances.min() if count > 0 else 0.0) + 2 * config.NEIGHBOUR_LIST_MOVES * self.params.step
+            ion.neighbour_list = np.flatnonzero(distances <= reach)
+            ion.neighbour_count = count
+            ion.neighbour_moves = config.NEIGHBOUR_LIST_MOVES
+        ion.neighbour_moves -= 1
+        return [self.electrodes[i] for i in ion.neighbour_list] + self.electrodes[ion.neighbour_count:count]
+
     def _is_electrode(self, ion, nearest_electrode) -> bool:
         """
         Check whether a free ion is close enough to an electrode to bond.
 
         If the ion is within the bonding threshold, transform its attributes
-        to electrode configuration, reassign it to the electrode group, and
-        return True.
+        to electrode configuration, reassign it to the electrode group, record
+        its parent index, and return True. The caller removes the ion from the active set.
 
         Args:
             ion (Ion): Free ion of interest.
@@ -118,20 +267,138 @@ class Calculation ():
         Returns:
             bool: True if the ion was transformed into an electrode; otherwise False.
         """
-        if ion.electrode_dist <= config.ATOM_RADIUS*2 + config.STEP/2:
-            self.ions.remove(ion)
-            ion.transform_to_electrode(nearest_electrode)
-            self.electrodes.append(ion)
+        if ion.electrode_dist <= self.params.bond_distance:
+            self._attach(ion, nearest_electrode)
             return True
         return False
 
+    def _attach(self, ion, nearest_electrode) -> None:
+        """
+        Bind a free ion to the dendrimer.
+
+        Transforms the ion into an electrode, appends it to the electrode group
+        and records its parent index. The caller removes the ion from the active set.
+
+        Args:
+            ion (Ion): Free ion of interest.
+            nearest_electrode (Electrode): Parent electrode of the ion.
+        """
+        ion.transform_to_electrode(nearest_electrode, self.params.atom_radius)
+        ion.index = len(self.electrodes)
+        self.master.parent_indices.append(nearest_electrode.index)
+        self.electrodes.append(ion)
+        self._add_to_cluster_sums(ion.position)
+        self._store_electrode_position(ion.position)
+
+    def _store_electrode_position(self, position: np.ndarray) -> None:
+        """
+        Append the position of the newest electrode to the array used by the vectorized distance kernels.
+
+        Args:
+            position (np.ndarray): Position of the new electrode.
+        """
+        count = len(self.electrodes)
+        if count > len(self._electrode_positions):
+            grown = np.zeros((2 * len(self._electrode_positions), 3), dtype=self.dtype)
+            grown[:count - 1] = self._electrode_positions[:count - 1]
+            self._electrode_positions = grown
+        self._electrode_positions[count - 1] = position
+
+    def _end_phase_sweep(self) -> None:
+        """
+        Advance every straggler by up to END_PHASE_STEPS steps in turn.
+
+        With only a few ions left, the cost of a sweep is dominated by the
+        per-ion overhead, so every ion takes a whole batch of steps per call.
+        """
+        i = 0
+        while i < len(self.active):
+            if self._advance_straggler(self.active[i]):
+                self.active.remove_at(i)
+                continue
+            i += 1
+
+    def _advance_straggler(self, ion) -> bool:
+        """
+        Move a single ion by up to END_PHASE_STEPS steps until it binds.
+
+        Within k steps the ion moves at most k * step, so its nearest electrode
+        is always one of the electrodes closer than d + 2 * k * step to its
+        starting position, where d is its starting distance to the dendrimer.
+        Only these candidates are searched in every step, and the dendrimer
+        does not change until the ion binds. As in a sweep, the ion bonds to
+        its current nearest electrode when its distance to the dendrimer before
+        its last step was within the bonding distance.
+
+        Args:
+            ion (Ion): Free ion of interest.
+
+        Returns:
+            bool: True if the ion was bound to the dendrimer; otherwise False.
+        """
+        steps = config.END_PHASE_STEPS
+        step = self.params.step
+        probability = self.params.direc_prob
+        rand_direcs = np.random.randn(steps, 3)
+        rand_direcs /= np.linalg.norm(rand_direcs, axis=1, keepdims=True)
+        position = ion.position
+        last_dist = ion.electrode_dist
+        candidates = self._electrode_positions[:len(self.electrodes)]
+        candidate_idx = np.arange(len(candidates))
+        if len(candidates) > 0:
+            distances = np.sqrt(np.sum((candidates - position) ** 2, axis=1))
+            reachable = distances <= distances.min() + 2 * steps * step
+            candidates, candidate_idx = candidates[reachable], candidate_idx[reachable]
+        for k in range(steps):
+            nearest_dist, nearest_elec, pref_direc = np.inf, None, None
+            if len(candidates) > 0:
+                diff = candidates - position
+                distances = np.sqrt(np.sum(diff ** 2, axis=1))
+                nearest = np.argmin(distances)
+                nearest_dist, nearest_elec, pref_direc = distances[nearest], candidate_idx[nearest], diff[nearest]
+            if self.geometry is not None:
+                surface_dist = self.geometry.surface_distance(position) + self.params.atom_radius
+                if surface_dist < nearest_dist:
+                    nearest_dist, nearest_elec = surface_dist, None
+                    pref_direc = -self.geometry.surface_normal(position)
+            if last_dist <= self.params.bond_distance:
+                self.ion_steps += k
+                ion.update_position(position)
+                ion.electrode_dist = last_dist
+                parent = (self.electrodes[nearest_elec] if nearest_elec is not None
+                          else self.geometry.anchor(position, self.params.atom_radius))
+                self._attach(ion, parent)
+                return True
+            last_dist = nearest_dist
+            biased_vec = (1 - probability) * rand_direcs[k] + probability * pref_direc / np.linalg.norm(pref_direc)
+            position = np.asarray(position + biased_vec / np.linalg.norm(biased_vec) * step, dtype=self.dtype)
+        self.ion_steps += steps
+        ion.update_position(position)
+        ion.electrode_dist = last_dist
+        ion.neighbour_moves = 0
+        return False
+
+    def _add_to_cluster_sums(self, position: np.ndarray) -> None:
+        """
+        Add a new electrode to the running sums of the cluster gyration radius.
+
+        The sums are accumulated in float64 for any precision of positions.
+
+        Args:
+            position (np.ndarray): Position of the new electrode.
+        """
+        position = np.asarray(position, dtype=np.float64)
+        self._cluster_count += 1
+        self._pos_sum = self._pos_sum + position
+        self._sq_sum += float(np.dot(position, position))
+
     def _gen_biased_vector(self, ion, nearest_electrode) -> np.ndarray:
         """
         Calculate a biased motion vector for the ion.
 
         The returned vector is a normalized combination of the preferred
-        direction (towards the nearest electrode, weighted by DIREC_PROB)
-        and a random direction (weighted by 1 - DIREC_PROB).
+        direction (towards the nearest electrode, weighted by direc_prob)
+        and a random direction (weighted by 1 - direc_prob).
 
         Args:
             ion (Ion): Free ion of interest.
@@ -140,7 +407,7 @@ class Calculation ():
         Returns:
             np.ndarray: Normalized motion vector for the ion movement.
         """
-        probability = config.DIREC_PROB
+        probability = self.params.direc_prob
         pref_direc = nearest_electrode.position - ion.position
         norm_pref_direc = pref_direc / np.linalg.norm(pref_direc)
         rand_direc = np.random.randn(3)
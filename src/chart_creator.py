@@ -1,9 +1,17 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+import config
 from DI_container import injector
+from database.db_connect import session_scope
 from layout.layout import Layout
-from database.services.gyration_ratio_service import GyrationRatioService
+from engine_type import EngineType
+from simulation_params import SimulationParams
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from precision_type import PrecisionType
+from query.results_cache import ResultsCache
+from analysis.running_regression import RunningRegression
+from database.services.simulation_run_service import SimulationRunService
 
 
 class ChartCreator ():
@@ -12,46 +20,65 @@ class ChartCreator ():
 
     Chart content:
         log N (number of particles in the simulation) vs. log Rg (gyration radius).
-        Shows the estimated fractal dimension of dendrimers created from a layout.
+        Shows the estimated fractal dimension of dendrimers created from a layout
+        together with its bootstrap confidence interval.
+
+    In watch mode, the chart follows a running sweep instead: every refresh
+    reads only the runs stored after the last one seen, adds them to the
+    plot and refits the line from running least-squares sums, so a refresh
+    costs the same however many runs are stored. The bootstrap interval is
+    not computed in watch mode.
     """
 
-    def __init__(self, layout: Layout):
+    def __init__(self, layout: Layout, watch_interval: float | None = None, engine: EngineType = EngineType.REFERENCE,
+                 electrode_type: ElectrodeGeometryType = ElectrodeGeometryType.POINT, params: SimulationParams | None = None,
+                 precision: PrecisionType = PrecisionType.FLOAT64):
         """
         Initialize the chart creator and display a plot.
 
         Args:
             layout (Layout): Type of layout for which to plot the results.
+            watch_interval (float | None): Seconds between two refreshes of the chart in watch mode,
+                None to plot the stored results once.
+            engine (EngineType): Engine whose aggregation model is plotted; runs of other models are left out.
+            electrode_type (ElectrodeGeometryType): Electrode whose runs are plotted; runs on other electrodes are left out.
+            params (SimulationParams | None): Parameters whose runs are plotted, defaults if None.
+            precision (PrecisionType): Precision whose runs are plotted.
         """
-        self._gyratio_ratio_service = injector.get(GyrationRatioService)
         self.layout = layout
+        self.engine = engine
+        self.electrode_type = electrode_type
+        self.params = params if params is not None else SimulationParams()
+        self.precision = precision
         self.atoms_numbers = []
         self.gyrations = []
+        if watch_interval is not None:
+            self._watch(watch_interval)
+            return
         self._load_simulation_data_from_db()
         if len(self.atoms_numbers) <= 0 or len(self.gyrations) <= 0:
             print("No data to plot.")
             return
         self._calc_data()
+        self._calc_bootstrap()
+        self._report()
         self._plot()
 
     def _load_simulation_data_from_db(self) -> None:
         """
-        Load simulation data from the database for the specified layout.
+        Load simulation data of the specified layout through the results cache.
+
+        Every stored run of the aggregation model of the engine with the electrode, parameters and precision is used, so
+        replicates with the same number of atoms enter the fit individually. Databases without per-run records fall back
+        to one gyration radius per number of atoms.
         """
-        simulation_data = self._gyratio_ratio_service.get_all_gyration_ratios_with_layout(self.layout)
-        self.gyrations = [
-            (
-                x.cube_gr if self.layout == Layout.CUBE
-                else x.sphere_gr if self.layout == Layout.SPHERE
-                else x.random_gr
-            )
-            for x in simulation_data
-        ]
-        self.atoms_numbers = [x.atoms for x in simulation_data]
+        self.atoms_numbers, self.gyrations = injector.get(ResultsCache).samples(
+            self.layout, self.engine, self.electrode_type, self.params, self.precision)
 
     def _calc_data(self) -> None:
         """
         Prepare data for the chart and calculate the fractal dimension of the dendrimers.
-        
+
         Performs logarithmic transformation and polynomial fit to determine fractal dimension.
         """
         self.log_n = np.log10(self.atoms_numbers)
@@ -60,13 +87,111 @@ class ChartCreator ():
         self.p = np.poly1d(coeffs)
         self.fractal_dimension = np.round(coeffs[0], 4)
 
+    def _calc_bootstrap(self) -> None:
+        """
+        Calculate bootstrap confidence intervals of the fractal dimension and of the fitted line.
+
+        Runs are resampled with replacement within each number of atoms (or across
+        all runs when no number of atoms has replicates), and all BOOTSTRAP_RESAMPLES
+        least-squares fits are solved at once from the resampled moments.
+        """
+        rng = np.random.default_rng()
+        resample_idx = self._draw_resample_indices(rng)
+        x = self.log_rg[resample_idx]
+        y = self.log_n[resample_idx]
+        x_mean = x.mean(axis=1, keepdims=True)
+        y_mean = y.mean(axis=1, keepdims=True)
+        sxx = np.sum((x - x_mean) ** 2, axis=1)
+        sxy = np.sum((x - x_mean) * (y - y_mean), axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slopes = sxy / sxx
+        intercepts = y_mean[:, 0] - slopes * x_mean[:, 0]
+        valid = np.isfinite(slopes)
+        slopes, intercepts = slopes[valid], intercepts[valid]
+        alpha = (1 - config.BOOTSTRAP_CONFIDENCE) / 2
+        self.band_log_rg = np.linspace(self.log_rg.min(), self.log_rg.max(), 100)
+        if len(slopes) == 0:
+            self.fractal_dimension_ci = (np.nan, np.nan)
+            self.band_low = self.band_high = self.p(self.band_log_rg)
+            return
+        self.fractal_dimension_ci = tuple(np.round(np.quantile(slopes, [alpha, 1 - alpha]), 4))
+        band = slopes[:, None] * self.band_log_rg[None, :] + intercepts[:, None]
+        self.band_low, self.band_high = np.quantile(band, [alpha, 1 - alpha], axis=0)
+
+    def _draw_resample_indices(self, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draw run indices of all bootstrap resamples.
+
+        Args:
+            rng (np.random.Generator): Random number generator.
+
+        Returns:
+            np.ndarray: Run indices, shape (BOOTSTRAP_RESAMPLES, number of runs).
+        """
+        runs = len(self.log_n)
+        order = np.argsort(self.atoms_numbers, kind="stable")
+        _, starts, counts = np.unique(np.asarray(self.atoms_numbers)[order], return_index=True, return_counts=True)
+        if counts.max() <= 1:
+            return rng.integers(0, runs, size=(config.BOOTSTRAP_RESAMPLES, runs))
+        group_start = np.repeat(starts, counts)
+        group_count = np.repeat(counts, counts)
+        offsets = np.floor(rng.random((config.BOOTSTRAP_RESAMPLES, runs)) * group_count).astype(np.int64)
+        return order[group_start + offsets]
+
+    def _report(self) -> None:
+        """
+        Print the fractal dimension and its confidence interval.
+        """
+        low, high = self.fractal_dimension_ci
+        print(f"Fractal dimension Df = {self.fractal_dimension} "
+              f"({config.BOOTSTRAP_CONFIDENCE:.0%} CI {low} - {high}, {len(self.log_n)} runs)")
+
     def _plot(self) -> None:
         """
         Plot the data.
         """
+        low, high = self.fractal_dimension_ci
+        plt.fill_between(self.band_log_rg, self.band_low, self.band_high, color="#3288bd", alpha=0.2, linewidth=0)
         plt.scatter(self.log_rg, self.log_n, color="#3288bd")
-        plt.plot(self.log_rg, self.p(self.log_rg), linestyle="dotted")
-        plt.title(f"Závislost logaritmu počtu atomů na logaritmu gyračního poloměru\nFraktální dimenze Df = {self.fractal_dimension}")
+        plt.plot(self.band_log_rg, self.p(self.band_log_rg), linestyle="dotted")
+        plt.title(f"Závislost logaritmu počtu atomů na logaritmu gyračního poloměru\nFraktální dimenze Df = {self.fractal_dimension}"
+                  f" ({config.BOOTSTRAP_CONFIDENCE:.0%} IS {low} – {high})")
         plt.xlabel("log Rg")
         plt.ylabel("log N")
         plt.show(block=True)
+
+    def _watch(self, interval: float) -> None:
+        """
+        Refresh the chart with newly stored runs until its window is closed.
+
+        Args:
+            interval (float): Seconds between two refreshes.
+        """
+        regression = RunningRegression()
+        last_id = 0
+        plt.ion()
+        figure, axes = plt.subplots()
+        fit_line, = axes.plot([], [], linestyle="dotted")
+        axes.set_xlabel("log Rg")
+        axes.set_ylabel("log N")
+        axes.set_title("Závislost logaritmu počtu atomů na logaritmu gyračního poloměru\nČekání na výsledky")
+        while plt.fignum_exists(figure.number):
+            with session_scope():
+                rows = injector.get(SimulationRunService).get_gyrations_after(
+                    self.layout, last_id, self.engine, self.electrode_type, self.params, self.precision)
+            if len(rows) > 0:
+                last_id = rows[-1][0]
+                log_n = np.log10([atoms for _, atoms, _ in rows])
+                log_rg = np.log10([gyration for _, _, gyration in rows])
+                regression.add(log_rg, log_n)
+                axes.scatter(log_rg, log_n, color="#3288bd")
+                slope, intercept = regression.fit()
+                if np.isfinite(slope):
+                    ends = np.array([regression.x_min, regression.x_max])
+                    fit_line.set_data(ends, slope * ends + intercept)
+                axes.autoscale_view()
+                axes.set_title("Závislost logaritmu počtu atomů na logaritmu gyračního poloměru\n"
+                               f"Fraktální dimenze Df = {np.round(slope, 4)} ({regression.count} běhů)")
+                figure.canvas.draw_idle()
+            plt.pause(interval)
+        plt.ioff()
@@ -2,15 +2,28 @@
 Configuration of the app.
 """
 
+import os
+
 from layout.layout import Layout
+from engine_type import EngineType
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from precision_type import PrecisionType
+from update_order_type import UpdateOrderType
 
 # ARGUMENTS
 LAYOUT_DEFAULT = Layout.RANDOM
 ATOMS_DEFAULT = [10, 100]
+REPLICATES_DEFAULT = 1
+ENGINE_DEFAULT = EngineType.REFERENCE
+WORKERS_DEFAULT = 1
+THREADS_DEFAULT = os.cpu_count() or 1
 SIM_DEFAULT = True
 VISUALIZATION_DEFAULT = True
 PLOT_DEFAULT = True
 CLEAN_DB_DEFAULT = True
+PROGRESS_DEFAULT = False
+ELECTRODE_DEFAULT = ElectrodeGeometryType.POINT
+PRECISION_DEFAULT = PrecisionType.FLOAT64
 
 #COLORS
 ATOM_EDGE_COLOR = (0.5, 0.5, 0.5, 0.5)
@@ -31,6 +44,73 @@ ATOM_COLORS = {
 #SIMULATION
 STEP = 0.25
 DIREC_PROB = 0.1
+END_PHASE_THRESHOLD = 32 # number of free ions below which the end phase starts
+END_PHASE_STEPS = 256 # steps of a straggler per turn in the end phase
+NEIGHBOUR_LIST_MOVES = 8 # moves for which the candidate electrodes of a free ion stay valid
+NEIGHBOUR_LIST_CHECK = False # debug: compare every restricted nearest search with the full scan
+UPDATE_ORDER_DEFAULT = UpdateOrderType.SEQUENTIAL
+
+# ELECTRODE
+ELECTRODE_WIRE_RADIUS = 2.0
+ELECTRODE_SPHERE_RADIUS = 3.0
+
+# LAYOUT
+LAYOUT_SPACING = 1.0 # minimum distance of free ions in the poisson_disk and shell layouts in atom diameters
+LAYOUT_SHELL_THICKNESS = 0.25 # thickness of the shell layouts relative to their outer radius or half-edge
+LAYOUT_MAX_FILL = 0.2 # highest volume fraction of ions before a poisson_disk or shell region is enlarged
 
 # DISPLAY
 ATOM_RADIUS = 0.7
+WATCH_INTERVAL = 2.0 # seconds between two refreshes of the chart in watch mode
+
+# THREADED ENGINE
+THREADED_BLOCK_SIZE = 1 << 20 # maximum number of ion-electrode distances held in memory by one chunk
+
+# WALKER ENGINE
+WALKER_LAUNCH_MARGIN = 2 # distance of the launch sphere outside the bounding radius of the dendrimer in atom diameters
+WALKER_KILL_FACTOR = 3.0 # radius of the kill sphere relative to the launch radius
+
+# OUT-OF-CORE STORAGE
+STORAGE_CHUNK_SIZE = 1 << 20 # electrodes per memory-mapped chunk
+STORAGE_CELL_SIZE = 4 # edge of a nearest-neighbour cell in atom diameters
+
+# TRAJECTORIES
+TRAJECTORY_CHUNK_FRAMES = 256 # frames between two exact keyframes of a particle
+TRAJECTORY_STEP_TOLERANCE = 0.05 # relative deviation from the step length still stored as a quantized direction
+
+# TELEMETRY
+PROGRESS_INTERVAL = 5.0 # minimal time between two progress events in seconds
+PROGRESS_RATE_SMOOTHING = 0.3 # weight of the latest attachment rate in the ETA estimate
+
+# SWEEP
+SCHEDULER_DEFAULT_EXPONENT = 2.5 # runtime growth with N when there are not enough timed runs
+SCHEDULER_DEFAULT_SCALE = 4e-5 # runtime of a one-atom simulation in seconds when there are no timed runs
+SWEEP_STALE_CLAIM_AGE = 24 * 3600 # seconds after which a claimed item is returned to the queue on merge
+
+# ENGINE CALIBRATION
+CALIBRATION_FILE = os.path.join(os.path.expanduser("~"), ".dla_engine_calibration.json") # cache of the engine timings of this machine
+CALIBRATION_ENGINES = [EngineType.REFERENCE, EngineType.THREADED, EngineType.OUT_OF_CORE] # engines chosen from by the auto engine, if they honour the simulation parameters
+CALIBRATION_ATOMS = [16, 32, 64, 128, 256] # numbers of atoms the engines are timed at
+CALIBRATION_REPEATS = 3 # runs of every timing, the fastest one is kept
+CALIBRATION_DROP_FACTOR = 4.0 # engines slower than this multiple of the fastest one are not timed at larger N
+CALIBRATION_MAX_ATOMS = 1 << 24 # largest number of atoms covered by the crossover points
+CALIBRATION_SEED = 0
+
+# QUERY SERVICE
+QUERY_HOST = "127.0.0.1"
+QUERY_CACHE_TTL = 2.0 # seconds during which cached results are served without checking the latest run id
+
+# ANALYSIS
+ANALYSIS_DEFAULT = False
+ANALYSIS_SCALES = 12 # number of scales in box-counting and mass-radius fits
+ANALYSIS_PAIR_RANGE = 10 # pair-correlation range in particle diameters
+ANALYSIS_PAIR_BINS = 50
+ANALYSIS_PAIR_CHUNK = 2_000_000 # maximum number of pair distances held in memory
+
+# STATISTICS
+BOOTSTRAP_RESAMPLES = 5000
+BOOTSTRAP_CONFIDENCE = 0.95
+
+# VALIDATION
+VALIDATION_PERMUTATIONS = 10000
+VALIDATION_SIGNIFICANCE = 0.01 # family-wise significance level over all tested N
@@ -1,5 +1,7 @@
 from DI_container import injector
+from database.db_connect import session_scope
 from database.services.gyration_ratio_service import GyrationRatioService
+from database.services.simulation_run_service import SimulationRunService
 
 class DbCleaner():
     """
@@ -9,14 +11,17 @@ class DbCleaner():
         """Initialize cleaner and optionally clean database.
         
         Args:
-            enable_clean (bool): If True, removes all entries from gyration ratio table.
+            enable_clean (bool): If True, removes all entries from gyration ratio and simulation run tables.
         """
         self._gyratio_ratio_service = injector.get(GyrationRatioService)
+        self._simulation_run_service = injector.get(SimulationRunService)
         if enable_clean:
-            self._clean_db()
+            with session_scope():
+                self._clean_db()
 
     def _clean_db(self) -> None:
         """
-        Clean the database by removing all entries from the gyration ratio table.
+        Clean the database by removing all entries from the gyration ratio and simulation run tables.
         """
-        self._gyratio_ratio_service.delete_all_data()
\ No newline at end of file
+        self._gyratio_ratio_service.delete_all_data()
+        self._simulation_run_service.delete_all_data()
\ No newline at end of file
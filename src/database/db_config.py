@@ -9,4 +9,13 @@ DB_CONFIG = {
     "database_master": os.getenv("DB_MASTER_NAME", "master"),
     "uid": os.getenv("DB_USER", "sa"),
     "pwd": os.getenv("DB_PASS", ""),
+    "url": os.getenv("DB_URL"),
+}
+
+DB_POOL = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "5")),
+    "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
 }
@@ -1,10 +1,17 @@
-import pyodbc
+import os
+from contextlib import contextmanager
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import sessionmaker, scoped_session
 
-from database.db_config import DB_CONFIG
+from database.db_config import DB_CONFIG, DB_POOL
 
 def ensure_database_exists():
+    if DB_CONFIG["url"] is not None:
+        return
+    import pyodbc
     conn = pyodbc.connect(
         f"DRIVER={DB_CONFIG['driver']};"
         f"SERVER={DB_CONFIG['server']};"
@@ -31,15 +38,74 @@ def get_session():
     finally:
         session.close()
 
+@contextmanager
+def session_scope():
+    """
+    Unit of work of the current thread.
+
+    Repositories share one session per thread through ScopedSession. The
+    outermost scope of a thread rolls back on an error and closes the session
+    at its end, so its connection returns to the pool; nested scopes reuse it.
+
+    Yields:
+        Session: Session of the current thread.
+    """
+    outermost = not ScopedSession.registry.has()
+    session = ScopedSession()
+    try:
+        yield session
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        if outermost:
+            ScopedSession.remove()
+
+def _reset_after_fork():
+    """
+    Drop pooled connections and sessions inherited from the parent process.
+
+    The parent keeps using its connections, so they are only forgotten, not closed.
+    """
+    engine.dispose(close=False)
+    ScopedSession.registry.clear()
+
 def get_connection_string():
+    if DB_CONFIG["url"] is not None:
+        return DB_CONFIG["url"]
     connection_string = (
     f"mssql+pyodbc://@{DB_CONFIG['server']}/"
     f"{DB_CONFIG['database']}?driver=ODBC+Driver+17+for+SQL+Server&TrustServerCertificate=yes"    
     )
     return connection_string
 
+def _pool_options(connection_string: str) -> dict:
+    """
+    Pool options of DB_POOL accepted by the pool of the database dialect.
+
+    Only a QueuePool takes the size, overflow and timeout options; other pools
+    (e.g. of an in-memory SQLite database) get the recycling and ping options alone.
+
+    Args:
+        connection_string (str): Database URL.
+
+    Returns:
+        dict: Keyword arguments of create_engine.
+    """
+    url = make_url(connection_string)
+    if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        return DB_POOL
+    return {key: DB_POOL[key] for key in ("pool_recycle", "pool_pre_ping")}
+
 # engine
-engine = create_engine(get_connection_string(), echo=False)
+engine = create_engine(get_connection_string(), echo=False, **_pool_options(get_connection_string()))
 
 # session factory
 SessionFactory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+# thread-local sessions of the repositories
+ScopedSession = scoped_session(SessionFactory)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
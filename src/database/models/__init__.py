@@ -1,3 +1,4 @@
 from .gyration_ratio import GyrationRatio
+from .simulation_run import SimulationRun
 
-__all__ = ["GyrationRatio"]
\ No newline at end of file
+__all__ = ["GyrationRatio", "SimulationRun"]
\ No newline at end of file
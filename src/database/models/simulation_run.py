@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, Float, String, Text
+
+from database.models.base import Base
+
+class SimulationRun(Base):
+    __tablename__ = 'simulation_run'
+    id = Column(Integer, primary_key = True)
+    atoms = Column(Integer, nullable = False)
+    layout = Column(String(16), nullable = False)
+    gyration_radius = Column(Float, nullable = False)
+    max_generation = Column(Integer, nullable = True)
+    leaf_count = Column(Integer, nullable = True)
+    branch_point_count = Column(Integer, nullable = True)
+    longest_path = Column(Integer, nullable = True)
+    mean_subtree_size = Column(Float, nullable = True)
+    generation_histogram = Column(Text, nullable = True)
+    engine = Column(String(16), nullable = True)
+    duration = Column(Float, nullable = True)
+    step = Column(Float, nullable = True)
+    direc_prob = Column(Float, nullable = True)
+    atom_radius = Column(Float, nullable = True)
+    electrode = Column(String(16), nullable = True)
+    precision = Column(String(8), nullable = True)
+    update_order = Column(String(16), nullable = True)
+    end_phase_threshold = Column(Integer, nullable = True)
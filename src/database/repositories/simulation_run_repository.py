@@ -0,0 +1,168 @@
+from sqlalchemy import and_, func, or_, true
+from sqlalchemy.orm import Session
+
+from database.models.simulation_run import SimulationRun
+
+class SimulationRunRepository():
+    """
+    Data access layer for per-run simulation records.
+    """
+    def __init__(self, session: Session) -> None:
+        """Initialize repository with database session.
+        
+        Args:
+            session (Session): SQLAlchemy session for database operations.
+        """
+        self._session = session
+
+    def get_all(self) -> list[SimulationRun]:
+        """Retrieve all simulation run records.
+        
+        Returns:
+            list[SimulationRun]: All records from the database.
+        """
+        return self._session.query(SimulationRun).all()
+
+    def get_by_layout(self, layout: str, engines: list[str] | None = None, include_unknown: bool = True,
+                      columns: dict[str, tuple] | None = None) -> list[SimulationRun]:
+        """Retrieve simulation run records of a single layout.
+        
+        Args:
+            layout (str): Layout value to search for.
+            engines (list[str] | None): Engine values to search for, None for all engines.
+            include_unknown (bool): Whether records without an engine are included when engines are given.
+            columns (dict[str, tuple] | None): (value, whether records without a value are included) to search
+                for in each named column, None for any values.
+        
+        Returns:
+            list[SimulationRun]: Records of the layout ordered by ID.
+        """
+        return (
+            self._session.query(SimulationRun)
+            .filter(SimulationRun.layout == layout, self._engine_filter(engines, include_unknown),
+                    self._column_filter(columns))
+            .order_by(SimulationRun.id)
+            .all()
+        )
+
+    def get_gyrations_after(self, layout: str, last_id: int, engines: list[str] | None = None,
+                            include_unknown: bool = True, columns: dict[str, tuple] | None = None) -> list[tuple[int, int, float]]:
+        """Retrieve the gyration radii of the runs of a layout stored after a given record.
+        
+        Args:
+            layout (str): Layout value to search for.
+            last_id (int): ID of the last record already read.
+            engines (list[str] | None): Engine values to search for, None for all engines.
+            include_unknown (bool): Whether records without an engine are included when engines are given.
+            columns (dict[str, tuple] | None): (value, whether records without a value are included) to search
+                for in each named column, None for any values.
+        
+        Returns:
+            list[tuple[int, int, float]]: ID, number of atoms and gyration radius of every newer run, ordered by ID.
+        """
+        return (
+            self._session.query(SimulationRun.id, SimulationRun.atoms, SimulationRun.gyration_radius)
+            .filter(SimulationRun.layout == layout, SimulationRun.id > last_id,
+                    self._engine_filter(engines, include_unknown), self._column_filter(columns))
+            .order_by(SimulationRun.id)
+            .all()
+        )
+
+    def get_timings(self, layout: str, engine: str) -> list[tuple[int, float]]:
+        """Retrieve run durations of a single layout and engine.
+        
+        Args:
+            layout (str): Layout value to search for.
+            engine (str): Engine value to search for.
+        
+        Returns:
+            list[tuple[int, float]]: Number of atoms and duration of every timed run.
+        """
+        return (
+            self._session.query(SimulationRun.atoms, SimulationRun.duration)
+            .filter(SimulationRun.layout == layout,
+                    SimulationRun.engine == engine,
+                    SimulationRun.duration.isnot(None))
+            .all()
+        )
+
+    def get_latest_id(self) -> int | None:
+        """Retrieve the ID of the newest simulation run record.
+        
+        Returns:
+            int | None: Highest record ID, None for an empty table.
+        """
+        return self._session.query(func.max(SimulationRun.id)).scalar()
+
+    def count(self) -> int:
+        """Count all simulation run records.
+        
+        Returns:
+            int: Number of records.
+        """
+        return self._session.query(func.count(SimulationRun.id)).scalar()
+
+    def get_counts(self) -> list[tuple[str, str | None, int]]:
+        """Count simulation run records of every layout and engine.
+        
+        Returns:
+            list[tuple[str, str | None, int]]: Layout value, engine value and number of records.
+        """
+        return (
+            self._session.query(SimulationRun.layout, SimulationRun.engine, func.count(SimulationRun.id))
+            .group_by(SimulationRun.layout, SimulationRun.engine)
+            .all()
+        )
+
+    def add(self, simulation_run: SimulationRun) -> SimulationRun:
+        """Add a new simulation run record to the database.
+        
+        Args:
+            simulation_run (SimulationRun): Record to add.
+        
+        Returns:
+            SimulationRun: Added record with ID assigned.
+        """
+        self._session.add(simulation_run)
+        self._session.commit()
+        self._session.refresh(simulation_run)
+        return simulation_run
+
+    @staticmethod
+    def _engine_filter(engines: list[str] | None, include_unknown: bool):
+        """Build the filter of records by engine.
+        
+        Args:
+            engines (list[str] | None): Engine values to search for, None for all engines.
+            include_unknown (bool): Whether records without an engine pass the filter.
+        
+        Returns:
+            ColumnElement: SQL condition on the engine column.
+        """
+        if engines is None:
+            return true()
+        if include_unknown:
+            return or_(SimulationRun.engine.in_(engines), SimulationRun.engine.is_(None))
+        return SimulationRun.engine.in_(engines)
+
+    @staticmethod
+    def _column_filter(columns: dict[str, tuple] | None):
+        """Build the filter of records by the values of several columns.
+        
+        Args:
+            columns (dict[str, tuple] | None): (value, whether records without a value pass the filter)
+                of each named column, None for any values.
+        
+        Returns:
+            ColumnElement: SQL condition on the columns.
+        """
+        conditions = []
+        for name, (value, include_unknown) in (columns or {}).items():
+            column = getattr(SimulationRun, name)
+            conditions.append(or_(column == value, column.is_(None)) if include_unknown else column == value)
+        return and_(true(), *conditions)
+
+    def delete_all(self) -> None:
+        """Delete all simulation run records from the database."""
+        self._session.query(SimulationRun).delete()
+        self._session.commit()
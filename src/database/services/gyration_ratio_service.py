@@ -14,8 +14,10 @@ class GyrationRatioService():
         """
         self._gyration_ratio_repo = gyration_ratio_repository
 
-    def add_or_update_gyration_ratio(self, atoms: int, cube_gr: float | None, sphere_gr: float | None, random_gr: float | None) -> GyrationRatio:
+    def add_or_update_gyration_ratio(self, atoms: int, cube_gr: float | None, sphere_gr: float | None, random_gr: float | None) -> GyrationRatio | None:
         """Add or update a gyration ratio record.
+
+        Layouts without a column (all radii None) leave the table untouched.
         
         Args:
             atoms (int): Number of atoms.
@@ -24,8 +26,10 @@ class GyrationRatioService():
             random_gr (float | None): Radius of gyration for random layout.
         
         Returns:
-            GyrationRatio: Added or updated record.
+            GyrationRatio | None: Added or updated record, the existing record (or None) if no radius is given.
         """
+        if cube_gr is None and sphere_gr is None and random_gr is None:
+            return self._gyration_ratio_repo.get_by_atoms(atoms)
         gyration_ratio = GyrationRatio(
             atoms = atoms,
             cube_gr = cube_gr,
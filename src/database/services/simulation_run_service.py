@@ -0,0 +1,197 @@
+from database.repositories.simulation_run_repository import SimulationRunRepository
+from database.models.simulation_run import SimulationRun
+from layout.layout import Layout
+from engine_type import EngineType
+from simulation_params import SimulationParams
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from precision_type import PrecisionType
+
+class SimulationRunService():
+    """
+    Business logic layer for per-run simulation results.
+    """
+    def __init__(self, simulation_run_repository: SimulationRunRepository) -> None:
+        """Initialize service with repository.
+        
+        Args:
+            simulation_run_repository (SimulationRunRepository): Data access layer.
+        """
+        self._simulation_run_repo = simulation_run_repository
+
+    def add_simulation_run(self, atoms: int, layout: Layout, gyration_radius: float, max_generation: int,
+                           leaf_count: int, branch_point_count: int, longest_path: int,
+                           mean_subtree_size: float, generation_histogram: list[int],
+                           engine: EngineType, duration: float | None, params: SimulationParams,
+                           electrode_type: ElectrodeGeometryType = ElectrodeGeometryType.POINT,
+                           precision: PrecisionType = PrecisionType.FLOAT64) -> SimulationRun:
+        """Add a record of a single finished simulation.
+        
+        Args:
+            atoms (int): Number of atoms.
+            layout (Layout): Starting layout of the simulation.
+            gyration_radius (float): Radius of gyration of the dendrimer.
+            max_generation (int): Highest electrode generation.
+            leaf_count (int): Number of electrodes without children.
+            branch_point_count (int): Number of electrodes with more than one child.
+            longest_path (int): Number of bonds on the longest path in the dendrimer.
+            mean_subtree_size (float): Mean subtree size over all electrodes.
+            generation_histogram (list[int]): Number of electrodes in each generation.
+            engine (EngineType): Calculation engine of the run.
+            duration (float | None): Wall-clock duration of the calculation in seconds.
+            params (SimulationParams): Physical parameters of the run.
+            electrode_type (ElectrodeGeometryType): Shape of the electrode the dendrimer grew on.
+            precision (PrecisionType): Floating-point precision of particle positions.
+        
+        Returns:
+            SimulationRun: Added record.
+        """
+        simulation_run = SimulationRun(
+            atoms = atoms,
+            layout = layout.value,
+            gyration_radius = gyration_radius,
+            max_generation = max_generation,
+            leaf_count = leaf_count,
+            branch_point_count = branch_point_count,
+            longest_path = longest_path,
+            mean_subtree_size = mean_subtree_size,
+            generation_histogram = ",".join(str(count) for count in generation_histogram),
+            engine = engine.value,
+            duration = duration,
+            step = params.step,
+            direc_prob = params.direc_prob,
+            atom_radius = params.atom_radius,
+            update_order = params.update_order.value,
+            end_phase_threshold = params.end_phase_threshold,
+            electrode = electrode_type.value,
+            precision = precision.value,
+        )
+        return self._simulation_run_repo.add(simulation_run)
+
+    def get_simulation_runs_with_layout(self, layout: Layout, engine: EngineType | None = None,
+                                        electrode_type: ElectrodeGeometryType | None = ElectrodeGeometryType.POINT,
+                                        params: SimulationParams | None = None,
+                                        precision: PrecisionType | None = None) -> list[SimulationRun]:
+        """Retrieve all simulation runs of a specific layout.
+        
+        Args:
+            layout (Layout): Type of layout to filter by.
+            engine (EngineType | None): Only runs of engines simulating the same model as this engine, None for all runs.
+            electrode_type (ElectrodeGeometryType | None): Only runs grown on this electrode, None for all runs.
+            params (SimulationParams | None): Only runs with these parameters, None for all runs.
+            precision (PrecisionType | None): Only runs with this precision, None for all runs.
+        
+        Returns:
+            list[SimulationRun]: Records of the layout.
+        """
+        return self._simulation_run_repo.get_by_layout(layout.value, *self._model_filter(engine),
+                                                       self._run_filter(electrode_type, params, precision))
+
+    def get_gyrations_after(self, layout: Layout, last_id: int, engine: EngineType | None = None,
+                            electrode_type: ElectrodeGeometryType | None = ElectrodeGeometryType.POINT,
+                            params: SimulationParams | None = None,
+                            precision: PrecisionType | None = None) -> list[tuple[int, int, float]]:
+        """Retrieve the gyration radii of the runs of a layout stored after a given run.
+        
+        Args:
+            layout (Layout): Type of layout to filter by.
+            last_id (int): ID of the last run already read, 0 to read all runs.
+            engine (EngineType | None): Only runs of engines simulating the same model as this engine, None for all runs.
+            electrode_type (ElectrodeGeometryType | None): Only runs grown on this electrode, None for all runs.
+            params (SimulationParams | None): Only runs with these parameters, None for all runs.
+            precision (PrecisionType | None): Only runs with this precision, None for all runs.
+        
+        Returns:
+            list[tuple[int, int, float]]: ID, number of atoms and gyration radius of every newer run, ordered by ID.
+        """
+        return [(run_id, atoms, gyration_radius) for run_id, atoms, gyration_radius
+                in self._simulation_run_repo.get_gyrations_after(layout.value, last_id, *self._model_filter(engine),
+                                                                 self._run_filter(electrode_type, params, precision))]
+
+    def get_run_timings(self, layout: Layout, engine: EngineType) -> list[tuple[int, float]]:
+        """Retrieve run durations for fitting a runtime model.
+        
+        Args:
+            layout (Layout): Type of layout to filter by.
+            engine (EngineType): Calculation engine to filter by.
+        
+        Returns:
+            list[tuple[int, float]]: Number of atoms and duration of every timed run.
+        """
+        return [(atoms, duration) for atoms, duration in self._simulation_run_repo.get_timings(layout.value, engine.value)]
+
+    def get_latest_run_id(self) -> int | None:
+        """Retrieve the ID of the newest simulation run.
+        
+        Returns:
+            int | None: Highest run ID, None if no run is stored.
+        """
+        return self._simulation_run_repo.get_latest_id()
+
+    def get_run_count(self) -> int:
+        """Count all stored simulation runs.
+        
+        Returns:
+            int: Number of runs.
+        """
+        return self._simulation_run_repo.count()
+
+    def get_run_counts(self) -> dict[str, dict[str, int]]:
+        """Count stored runs of every layout and engine.
+        
+        Returns:
+            dict[str, dict[str, int]]: Number of runs by layout value and engine value.
+        """
+        counts = {}
+        for layout, engine, count in self._simulation_run_repo.get_counts():
+            engine = engine if engine is not None else EngineType.REFERENCE.value
+            counts.setdefault(layout, {})
+            counts[layout][engine] = counts[layout].get(engine, 0) + count
+        return counts
+
+    @staticmethod
+    def _model_filter(engine: EngineType | None) -> tuple[list[str] | None, bool]:
+        """Engine values of the model of an engine.
+        
+        Runs without an engine were stored by the reference engine.
+        
+        Args:
+            engine (EngineType | None): Engine of the model, None for all runs.
+        
+        Returns:
+            tuple[list[str] | None, bool]: Engine values and whether runs without an engine belong to the model.
+        """
+        if engine is None:
+            return None, True
+        return [x.value for x in engine.model_engines()], engine.model == EngineType.REFERENCE.model
+
+    @staticmethod
+    def _run_filter(electrode_type: ElectrodeGeometryType | None, params: SimulationParams | None = None,
+                    precision: PrecisionType | None = None) -> dict[str, tuple]:
+        """Column values of the runs of an electrode, parameters and precision.
+        
+        Runs stored before a column existed were simulated with its default:
+        runs without a value match only the point electrode, the default
+        parameters and float64.
+        
+        Args:
+            electrode_type (ElectrodeGeometryType | None): Electrode of the runs, None for all runs.
+            params (SimulationParams | None): Parameters of the runs, None for all runs.
+            precision (PrecisionType | None): Precision of the runs, None for all runs.
+        
+        Returns:
+            dict[str, tuple]: Value of each filtered column and whether runs without a value match it.
+        """
+        columns = {}
+        if electrode_type is not None:
+            columns["electrode"] = (electrode_type.value, electrode_type == ElectrodeGeometryType.POINT)
+        if params is not None:
+            defaults = SimulationParams().to_dict()
+            for name, value in params.to_dict().items():
+                columns[name] = (value, value == defaults[name])
+        if precision is not None:
+            columns["precision"] = (precision.value, precision == PrecisionType.FLOAT64)
+        return columns
+
+    def delete_all_data(self) -> None:
+        """Delete all entries from the simulation run table."""
+        self._simulation_run_repo.delete_all()
\ No newline at end of file
@@ -0,0 +1,34 @@
+from enum import Enum
+
+class EngineType(Enum):
+    """
+    Calculation engines available for the simulation.
+    """
+    REFERENCE = "reference"
+    THREADED = "threaded"
+    OUT_OF_CORE = "out_of_core"
+    WALKER = "walker"
+    LATTICE = "lattice"
+    AUTO = "auto" # fastest of the calibrated engines for the layout and number of atoms
+
+    @property
+    def model(self) -> str:
+        """
+        Aggregation model simulated by the engine.
+
+        The walker and lattice engines simulate models of their own, all other
+        engines the off-lattice model of the reference engine. Results of
+        different models must not be pooled.
+        """
+        if self in (EngineType.WALKER, EngineType.LATTICE):
+            return self.value
+        return EngineType.REFERENCE.value
+
+    def model_engines(self) -> list["EngineType"]:
+        """
+        Engines whose results are stored for the model of this engine.
+
+        Returns:
+            list[EngineType]: Engines of the same model, without the auto engine.
+        """
+        return [engine for engine in EngineType if engine != EngineType.AUTO and engine.model == self.model]
@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+import numpy as np
+
+from geometry.surface_anchor import SurfaceAnchor
+
+
+class ElectrodeGeometry(ABC):
+    """
+    Electrode with an analytic surface.
+
+    Distance and direction to the surface are computed in O(1) for any
+    position, so an extended electrode costs the same as a single seed particle.
+    """
+    @abstractmethod
+    def surface_distance(self, position: np.ndarray) -> float:
+        """
+        Calculate the distance from a position to the electrode surface.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            float: Non-negative distance to the nearest surface point.
+        """
+
+    @abstractmethod
+    def surface_normal(self, position: np.ndarray) -> np.ndarray:
+        """
+        Calculate the unit vector from the nearest surface point towards a position.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            np.ndarray: Unit vector pointing from the surface to the position.
+        """
+
+    @abstractmethod
+    def surface_distances(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Calculate the distances from many positions to the electrode surface at once.
+
+        Args:
+            positions (np.ndarray): 3D positions, shape (N, 3).
+
+        Returns:
+            np.ndarray: Non-negative distance of every position to the surface.
+        """
+
+    @abstractmethod
+    def surface_normals(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Calculate the unit vectors from the surface towards many positions at once.
+
+        Args:
+            positions (np.ndarray): 3D positions, shape (N, 3).
+
+        Returns:
+            np.ndarray: Unit vector of every position, shape (N, 3).
+        """
+
+    def anchor(self, position: np.ndarray, atom_radius: float) -> SurfaceAnchor:
+        """
+        Create the virtual particle one atom radius below the surface point nearest to a position.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+            atom_radius (float): Radius of a single atom.
+
+        Returns:
+            SurfaceAnchor: Virtual parent electrode of an ion at the position.
+        """
+        normal = self.surface_normal(position)
+        return SurfaceAnchor(position - normal * (self.surface_distance(position) + atom_radius))
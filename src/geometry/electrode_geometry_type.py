@@ -0,0 +1,10 @@
+from enum import Enum
+
+class ElectrodeGeometryType(Enum):
+    """
+    Shapes of the electrode the dendrimer grows on.
+    """
+    POINT = "point"
+    PLANE = "plane"
+    WIRE = "wire"
+    SPHERE = "sphere"
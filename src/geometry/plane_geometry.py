@@ -0,0 +1,58 @@
+import numpy as np
+
+from geometry.electrode_geometry import ElectrodeGeometry
+
+
+class PlaneGeometry(ElectrodeGeometry):
+    """
+    Flat electrode in the plane z = 0, open to ions from both sides.
+    """
+    def surface_distance(self, position: np.ndarray) -> float:
+        """
+        Calculate the distance from a position to the plane.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            float: Distance to the plane.
+        """
+        return abs(float(position[2]))
+
+    def surface_normal(self, position: np.ndarray) -> np.ndarray:
+        """
+        Calculate the unit vector from the plane towards a position.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            np.ndarray: Plane normal on the side of the position.
+        """
+        return np.array([0.0, 0.0, -1.0 if position[2] < 0 else 1.0])
+
+    def surface_distances(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Calculate the distances from many positions to the plane.
+
+        Args:
+            positions (np.ndarray): 3D positions, shape (N, 3).
+
+        Returns:
+            np.ndarray: Distance of every position to the plane.
+        """
+        return np.abs(positions[:, 2])
+
+    def surface_normals(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Calculate the plane normals on the side of many positions.
+
+        Args:
+            positions (np.ndarray): 3D positions, shape (N, 3).
+
+        Returns:
+            np.ndarray: Plane normal of every position, shape (N, 3).
+        """
+        normals = np.zeros((len(positions), 3))
+        normals[:, 2] = np.where(positions[:, 2] < 0, -1.0, 1.0)
+        return normals
@@ -0,0 +1,77 @@
+import numpy as np
+
+from geometry.electrode_geometry import ElectrodeGeometry
+
+
+class SphereGeometry(ElectrodeGeometry):
+    """
+    Spherical electrode centered at the origin.
+
+    Attributes:
+        radius (float): Radius of the sphere.
+    """
+    def __init__(self, radius: float) -> None:
+        """
+        Initialize a SphereGeometry instance.
+
+        Args:
+            radius (float): Radius of the sphere.
+        """
+        self.radius = radius
+
+    def surface_distance(self, position: np.ndarray) -> float:
+        """
+        Calculate the distance from a position to the sphere surface.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            float: Distance to the sphere surface.
+        """
+        return abs(float(np.linalg.norm(position)) - self.radius)
+
+    def surface_normal(self, position: np.ndarray) -> np.ndarray:
+        """
+        Calculate the radial unit vector from the sphere surface towards a position.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            np.ndarray: Radial unit vector.
+        """
+        r = float(np.linalg.norm(position))
+        if r == 0:
+            return np.array([-1.0, 0.0, 0.0])
+        sign = 1.0 if r >= self.radius else -1.0
+        return np.asarray(position, dtype=np.float64) / r * sign
+
+    def surface_distances(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Calculate the distances from many positions to the sphere surface.
+
+        Args:
+            positions (np.ndarray): 3D positions, shape (N, 3).
+
+        Returns:
+            np.ndarray: Distance of every position to the sphere surface.
+        """
+        return np.abs(np.linalg.norm(positions, axis=1) - self.radius)
+
+    def surface_normals(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Calculate the radial unit vectors from the sphere surface towards many positions.
+
+        Args:
+            positions (np.ndarray): 3D positions, shape (N, 3).
+
+        Returns:
+            np.ndarray: Radial unit vector of every position, shape (N, 3).
+        """
+        r = np.linalg.norm(positions, axis=1)
+        sign = np.where(r >= self.radius, 1.0, -1.0)
+        safe_r = np.where(r == 0, 1.0, r)
+        normals = positions / safe_r[:, None] * sign[:, None]
+        normals[r == 0] = [-1.0, 0.0, 0.0]
+        return normals
@@ -0,0 +1,25 @@
+import numpy as np
+
+
+class SurfaceAnchor():
+    """
+    Virtual electrode particle standing in for the nearest point of an analytic electrode surface.
+
+    The anchor lies one atom radius below the surface, so ion-anchor distances
+    and bonding behave exactly as for a particle electrode.
+
+    Attributes:
+        position (np.ndarray): 3D position of the virtual particle.
+        index (int): Parent index recorded for ions bound to the surface (-1, no particle parent).
+        generation (int): Generation of the surface (-1, so bound ions start with generation 0).
+    """
+    def __init__(self, position: np.ndarray) -> None:
+        """
+        Initialize a SurfaceAnchor instance.
+
+        Args:
+            position (np.ndarray): 3D position of the virtual particle.
+        """
+        self.position = position
+        self.index = -1
+        self.generation = -1
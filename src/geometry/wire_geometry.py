@@ -0,0 +1,78 @@
+import numpy as np
+
+from geometry.electrode_geometry import ElectrodeGeometry
+
+
+class WireGeometry(ElectrodeGeometry):
+    """
+    Cylindrical wire electrode along the z axis.
+
+    Attributes:
+        radius (float): Radius of the wire.
+    """
+    def __init__(self, radius: float) -> None:
+        """
+        Initialize a WireGeometry instance.
+
+        Args:
+            radius (float): Radius of the wire.
+        """
+        self.radius = radius
+
+    def surface_distance(self, position: np.ndarray) -> float:
+        """
+        Calculate the distance from a position to the wire surface.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            float: Distance to the wire surface.
+        """
+        return abs(float(np.hypot(position[0], position[1])) - self.radius)
+
+    def surface_normal(self, position: np.ndarray) -> np.ndarray:
+        """
+        Calculate the radial unit vector from the wire surface towards a position.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            np.ndarray: Unit vector perpendicular to the wire axis.
+        """
+        rho = float(np.hypot(position[0], position[1]))
+        if rho == 0:
+            return np.array([-1.0, 0.0, 0.0])
+        sign = 1.0 if rho >= self.radius else -1.0
+        return np.array([position[0] / rho * sign, position[1] / rho * sign, 0.0])
+
+    def surface_distances(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Calculate the distances from many positions to the wire surface.
+
+        Args:
+            positions (np.ndarray): 3D positions, shape (N, 3).
+
+        Returns:
+            np.ndarray: Distance of every position to the wire surface.
+        """
+        return np.abs(np.hypot(positions[:, 0], positions[:, 1]) - self.radius)
+
+    def surface_normals(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Calculate the radial unit vectors from the wire surface towards many positions.
+
+        Args:
+            positions (np.ndarray): 3D positions, shape (N, 3).
+
+        Returns:
+            np.ndarray: Unit vector of every position perpendicular to the wire axis, shape (N, 3).
+        """
+        rho = np.hypot(positions[:, 0], positions[:, 1])
+        sign = np.where(rho >= self.radius, 1.0, -1.0)
+        safe_rho = np.where(rho == 0, 1.0, rho)
+        normals = np.zeros((len(positions), 3))
+        normals[:, 0] = np.where(rho == 0, -1.0, positions[:, 0] / safe_rho * sign)
+        normals[:, 1] = np.where(rho == 0, 0.0, positions[:, 1] / safe_rho * sign)
+        return normals
@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import config
+from threaded_calculation import ThreadedCalculation
+from storage.occupancy_grid import OccupancyGrid
+from geometry.surface_anchor import SurfaceAnchor
+
+class LatticeCalculation (ThreadedCalculation):
+    """
+    On-lattice calculation with the dendrimer kept in a bit-packed occupancy grid.
+
+    Ions hop between the sites of a cubic lattice whose spacing is one atom
+    diameter, so neighbouring sites are exactly at the bonding distance of
+    two particles. Starting positions are rounded to the nearest site. An ion
+    binds as soon as one of its six neighbouring sites is occupied, which is a
+    lookup in the OccupancyGrid instead of a distance check against the
+    electrodes; it binds to an electrode surface when its site is within one
+    lattice spacing of the surface, and stays on its site. Otherwise, with probability direc_prob an
+    ion hops along the axis closest to the direction of its nearest electrode,
+    and in any other case to a random one of its six neighbours. The nearest
+    electrode is found by the chunked kernel of the threaded engine on the
+    same thread pool. Hops onto occupied sites are rejected. All free ions of
+    a sweep move at once and see the dendrimer as it was at the start of the
+    sweep; ions that bind are attached in ascending ion order afterwards, and
+    an ion whose site was taken by an earlier ion of the sweep stays free.
+
+    Only the site an ion binds at is recorded in its position history, not
+    the whole walk.
+
+    Attributes:
+        spacing (float): Distance of neighbouring lattice sites.
+        grid (OccupancyGrid): Occupied sites of the dendrimer.
+    """
+    HOPS = np.array([[1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0], [0, 0, 1], [0, 0, -1]], dtype=np.int64)
+
+    def __init__(self, simulation, reporter=None, threads: int = config.THREADS_DEFAULT) -> None:
+        """
+        Initialize the LatticeCalculation helper.
+
+        Args:
+            simulation (Simulation): Parent simulation instance.
+            reporter (ProgressReporter | None): Receiver of progress events, None to run silently.
+            threads (int): Number of threads of the nearest-electrode search.
+        """
+        super().__init__(simulation, reporter, threads)
+        self.spacing = 2 * self.params.atom_radius
+        self.grid = OccupancyGrid()
+        for electrode in self.electrodes:
+            self.grid.add(tuple(self._site_of(electrode.position)), electrode.index)
+        self._sites = np.array([self._site_of(ion.position) for ion in self.ions], dtype=np.int64).reshape(-1, 3)
+
+    def calculate_sim(self) -> None:
+        """
+        Perform all simulation sweeps until all free ions become electrodes.
+
+        Progress is passed to the reporter once per sweep.
+        """
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            while len(self.ions) != 0:
+                self.ion_steps += len(self.ions)
+                self._sweep(executor)
+                if self.reporter is not None:
+                    self.reporter.update(len(self.ions), self.ion_steps, self.cluster_gyration())
+        if self.reporter is not None:
+            self.reporter.finish(self.ion_steps, self.cluster_gyration())
+
+    def _sweep(self, executor: ThreadPoolExecutor) -> None:
+        """
+        Move every free ion by one hop or bind it to the dendrimer.
+
+        Args:
+            executor (ThreadPoolExecutor): Thread pool of the nearest-electrode search.
+        """
+        sites = self._sites
+        positions = (sites * self.spacing).astype(self.dtype)
+        parent_hops = np.full(len(sites), -1, dtype=np.int64)
+        for hop in range(len(self.HOPS) - 1, -1, -1):
+            parent_hops[self.grid.contains(sites + self.HOPS[hop])] = hop
+        binding = parent_hops >= 0
+        if self.geometry is not None:
+            binding |= self.geometry.surface_distances(positions) + self.params.atom_radius <= self.spacing
+        binding &= ~self.grid.contains(sites)
+        hops = np.random.randint(0, len(self.HOPS), len(sites))
+        biased = (np.random.random(len(sites)) < self.params.direc_prob) & ~binding
+        hops[biased] = self._preferred_hops(positions[biased], executor)
+        new_sites = np.where(binding[:, None], sites, sites + self.HOPS[hops])
+        blocked = self.grid.contains(new_sites)
+        new_sites[blocked] = sites[blocked]
+        attached = np.zeros(len(sites), dtype=bool)
+        for i in np.flatnonzero(binding):
+            if self.grid.contains(sites[i:i + 1])[0]:
+                continue
+            self._bind(i, parent_hops[i], positions[i])
+            attached[i] = True
+        self.ions[:] = [ion for i, ion in enumerate(self.ions) if not attached[i]]
+        self._sites = new_sites[~attached]
+
+    def _bind(self, i: int, parent_hop: int, position: np.ndarray) -> None:
+        """
+        Bind a free ion to the occupied neighbouring site or to the electrode surface.
+
+        Args:
+            i (int): Position of the ion in the ion list.
+            parent_hop (int): Hop from the ion to its parent site, -1 for the electrode surface.
+            position (np.ndarray): Position of the site of the ion.
+        """
+        ion = self.ions[i]
+        site = self._sites[i]
+        ion.update_position(position)
+        if parent_hop >= 0:
+            parent = self.electrodes[self.grid.index_at(tuple(site + self.HOPS[parent_hop]))]
+        else:
+            parent = SurfaceAnchor(position - self.geometry.surface_normal(position) * self.spacing)
+        ion.electrode_dist = float(np.linalg.norm(position - parent.position))
+        self._attach(ion, parent)
+        self.grid.add(tuple(site), ion.index)
+
+    def _preferred_hops(self, positions: np.ndarray, executor: ThreadPoolExecutor) -> np.ndarray:
+        """
+        Hop along the axis closest to the direction of the nearest electrode of every position.
+
+        Args:
+            positions (np.ndarray): Ion positions, shape (n, 3).
+            executor (ThreadPoolExecutor): Thread pool of the nearest-electrode search.
+
+        Returns:
+            np.ndarray: Index into HOPS of every position, shape (n,).
+        """
+        if len(positions) == 0:
+            return np.zeros(0, dtype=np.int64)
+        electrodes = self._electrode_positions[:len(self.electrodes)]
+        bounds = self._chunk_bounds(len(positions), len(electrodes))
+        chunks = list(executor.map(
+            lambda bound: self._nearest_electrodes(positions[bound[0]:bound[1]], electrodes),
+            zip(bounds[:-1], bounds[1:])))
+        nearest = np.concatenate([chunk[0] for chunk in chunks])
+        distances = np.concatenate([chunk[1] for chunk in chunks])
+        pref_direc = np.zeros_like(positions)
+        has_electrode = nearest >= 0
+        pref_direc[has_electrode] = electrodes[nearest[has_electrode]] - positions[has_electrode]
+        if self.geometry is not None:
+            surface_dist = self.geometry.surface_distances(positions) + self.params.atom_radius
+            on_surface = surface_dist < distances
+            pref_direc[on_surface] = -self.geometry.surface_normals(positions[on_surface])
+        axes = np.argmax(np.abs(pref_direc), axis=1)
+        return 2 * axes + (pref_direc[np.arange(len(positions)), axes] < 0)
+
+    def _site_of(self, position: np.ndarray) -> np.ndarray:
+        """
+        Nearest lattice site of a position.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            np.ndarray: Integer site coordinates.
+        """
+        return np.rint(np.asarray(position, dtype=np.float64) / self.spacing).astype(np.int64)
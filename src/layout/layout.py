@@ -7,3 +7,6 @@ class Layout(Enum):
     CUBE = "cube"
     SPHERE = "sphere"
     RANDOM = "random"
+    POISSON_DISK = "poisson_disk"
+    SPHERE_SHELL = "sphere_shell"
+    CUBE_SHELL = "cube_shell"
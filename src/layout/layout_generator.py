@@ -2,27 +2,38 @@ import numpy as np
 
 import config
 from layout.layout import Layout
+from layout.poisson_disk_sampler import PoissonDiskSampler
+from simulation_params import SimulationParams
 
 class LayoutGenerator ():
     """
     Generate a list of 3D vectors representing starting positions for atoms.
     """
 
-    def __init__(self, layout: str, atoms_num: int):
+    def __init__(self, layout: str, atoms_num: int, params: SimulationParams | None = None):
         """
         Initialize LayoutGenerator.
 
         Args:
-            layout (str): Type of starting layout ("cube", "sphere", or "random").
+            layout (str): Type of starting layout ("cube", "sphere", "random", "poisson_disk",
+                "sphere_shell" or "cube_shell").
             atoms_num (int): Number of atoms in the system.
+            params (SimulationParams | None): Physical parameters of the simulation, defaults if None.
         """
         self.atoms_num = atoms_num
+        self.params = params if params is not None else SimulationParams()
         if layout == Layout.CUBE:
             self.start_postions = self._gen_cube_layout()
         elif layout == Layout.SPHERE:
             self.start_postions = self._gen_sphere_layout()
         elif layout == Layout.RANDOM:
             self.start_postions = self._gen_random_layout()
+        elif layout == Layout.POISSON_DISK:
+            self.start_postions = self._gen_poisson_disk_layout()
+        elif layout == Layout.SPHERE_SHELL:
+            self.start_postions = self._gen_sphere_shell_layout()
+        elif layout == Layout.CUBE_SHELL:
+            self.start_postions = self._gen_cube_shell_layout()
 
     def get_start_pos(self) -> list:
         """
@@ -85,6 +96,82 @@ class LayoutGenerator ():
             x = np.random.randint(-max_radius, max_radius + 1)
             y = np.random.randint(-max_radius, max_radius + 1)
             z = np.random.randint(-max_radius, max_radius + 1)
-            coord_list[i] = np.array([x, y, z])
+            coord_list[i] = np.array([x, y, z], dtype=np.float64)
         return coord_list
-    
\ No newline at end of file
+
+    def _gen_poisson_disk_layout(self) -> list:
+        """
+        Generate a layout of ions in a cube with a minimum distance between ions.
+
+        The cube has the size of the random layout and is enlarged if it cannot hold
+        the ions at LAYOUT_MAX_FILL. A ball around the seed is kept free, so no ion
+        starts bonded.
+
+        Returns:
+            list[np.ndarray]: List of 3D positions for each free ion at simulation start.
+        """
+        spacing = self._spacing
+        clearance = self.params.bond_distance + spacing
+        clearance_volume = 4 / 3 * np.pi * clearance ** 3
+        half_edge = max(np.ceil(np.power(self.atoms_num, 0.5)),
+                        np.cbrt(self._required_volume + clearance_volume) / 2)
+
+        def draw_candidates(count: int) -> np.ndarray:
+            candidates = np.random.uniform(-half_edge, half_edge, (count, 3))
+            return candidates[np.sum(candidates ** 2, axis=1) >= clearance ** 2]
+
+        return list(PoissonDiskSampler(spacing).sample(self.atoms_num, draw_candidates, half_edge))
+
+    def _gen_sphere_shell_layout(self) -> list:
+        """
+        Generate a layout of ions in a thick spherical shell with a minimum distance between ions.
+
+        The outer radius is that of the sphere layout, enlarged if the shell cannot
+        hold the ions at LAYOUT_MAX_FILL.
+
+        Returns:
+            list[np.ndarray]: List of 3D positions for each free ion at simulation start.
+        """
+        inner_part = (1 - config.LAYOUT_SHELL_THICKNESS) ** 3
+        outer_radius = max(np.power(self.atoms_num, 0.5) * 2,
+                           np.cbrt(self._required_volume / (4 / 3 * np.pi * (1 - inner_part))))
+        inner_radius = outer_radius * (1 - config.LAYOUT_SHELL_THICKNESS)
+
+        def draw_candidates(count: int) -> np.ndarray:
+            radii = np.cbrt(np.random.uniform(inner_radius ** 3, outer_radius ** 3, count))
+            directions = np.random.normal(size=(count, 3))
+            directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+            return directions * radii[:, None]
+
+        return list(PoissonDiskSampler(self._spacing).sample(self.atoms_num, draw_candidates, outer_radius))
+
+    def _gen_cube_shell_layout(self) -> list:
+        """
+        Generate a layout of ions in a thick cubic shell with a minimum distance between ions.
+
+        The outer half-edge is that of the cube layout, enlarged if the shell cannot
+        hold the ions at LAYOUT_MAX_FILL.
+
+        Returns:
+            list[np.ndarray]: List of 3D positions for each free ion at simulation start.
+        """
+        inner_part = (1 - config.LAYOUT_SHELL_THICKNESS) ** 3
+        outer_half_edge = max(np.power(self.atoms_num, 0.56),
+                              np.cbrt(self._required_volume / (8 * (1 - inner_part))))
+        inner_half_edge = outer_half_edge * (1 - config.LAYOUT_SHELL_THICKNESS)
+
+        def draw_candidates(count: int) -> np.ndarray:
+            candidates = np.random.uniform(-outer_half_edge, outer_half_edge, (int(count / (1 - inner_part)) + 1, 3))
+            return candidates[np.max(np.abs(candidates), axis=1) >= inner_half_edge]
+
+        return list(PoissonDiskSampler(self._spacing).sample(self.atoms_num, draw_candidates, outer_half_edge))
+
+    @property
+    def _spacing(self) -> float:
+        """Minimum distance of free ions in the poisson_disk and shell layouts."""
+        return config.LAYOUT_SPACING * 2 * self.params.atom_radius
+
+    @property
+    def _required_volume(self) -> float:
+        """Volume holding all ions, as spheres of the minimum distance in diameter, at LAYOUT_MAX_FILL."""
+        return self.atoms_num * np.pi / 6 * self._spacing ** 3 / config.LAYOUT_MAX_FILL
@@ -0,0 +1,115 @@
+import numpy as np
+
+
+class PoissonDiskSampler ():
+    """
+    Grid-accelerated dart throwing of points with a minimum spacing.
+
+    Candidates are drawn in batches uniformly in a region and accepted when no
+    accepted point and no earlier candidate of the same batch lies closer than
+    the spacing. The cells of the background grid are spacing / sqrt(3) wide,
+    so a cell holds at most one point and a candidate is compared with the
+    points of a fixed set of neighbouring cells only. The grid is sparse: the
+    keys of the occupied cells are kept sorted, so its size depends on the
+    number of points, not on the volume of the region. A batch costs
+    O(b log n) and is sized by the acceptance rate of the previous one, so as
+    long as the region is far from being filled, a few batches place all
+    points and sampling stays near O(n).
+
+    Attributes:
+        spacing (float): Minimum distance of two points.
+    """
+    def __init__(self, spacing: float) -> None:
+        """
+        Initialize the sampler.
+
+        Args:
+            spacing (float): Minimum distance of two points.
+        """
+        self.spacing = spacing
+        self._cell_size = spacing / np.sqrt(3)
+        span = np.arange(-2, 3)
+        offsets = np.stack(np.meshgrid(span, span, span, indexing="ij"), axis=-1).reshape(-1, 3)
+        gaps = np.maximum(np.abs(offsets) - 1, 0)
+        self._offsets = offsets[np.sum(gaps ** 2, axis=1) * self._cell_size ** 2 < spacing ** 2]
+
+    def sample(self, count: int, draw_candidates, extent: float) -> np.ndarray:
+        """
+        Place points in a region.
+
+        Args:
+            count (int): Number of points.
+            draw_candidates (Callable[[int], np.ndarray]): Draws up to the given number of uniformly
+                distributed points of the region, shape (n, 3).
+            extent (float): Largest absolute coordinate of a point of the region.
+
+        Returns:
+            np.ndarray: Points, shape (count, 3).
+        """
+        self._grid_size = 2 * (int(extent / self._cell_size) + 3) + 1
+        self._offset_shifts = (self._offsets[:, 0] * self._grid_size + self._offsets[:, 1]) * self._grid_size + self._offsets[:, 2]
+        points = np.zeros((0, 3))
+        keys = np.zeros(0, dtype=np.int64)
+        acceptance = 1.0
+        while len(points) < count:
+            missing = count - len(points)
+            candidates = draw_candidates(min(int(1.25 * missing / acceptance) + 64, 16 * count + 64))
+            drawn = len(candidates)
+            candidate_keys, rank = np.unique(self._keys(candidates), return_index=True)
+            candidates = candidates[rank]
+            key_order = np.argsort(keys)
+            free = ~self._conflicts(candidates, candidate_keys, keys[key_order], points[key_order])
+            free[free] = ~self._conflicts(candidates[free], candidate_keys[free], candidate_keys[free], candidates[free], rank[free])
+            rank = rank[free]
+            if len(rank) > missing:
+                rank_limit = np.partition(rank, missing - 1)[missing - 1]
+                free[free] = rank <= rank_limit
+                rank = rank[rank <= rank_limit]
+            acceptance = max(len(rank) / max(drawn, 1), 1e-3)
+            draw_order = np.argsort(rank)
+            points = np.concatenate([points, candidates[free][draw_order]])
+            keys = np.concatenate([keys, candidate_keys[free][draw_order]])
+        return points
+
+    def _keys(self, points: np.ndarray) -> np.ndarray:
+        """
+        Encode the grid cells of points into single keys.
+
+        Args:
+            points (np.ndarray): Points, shape (n, 3).
+
+        Returns:
+            np.ndarray: Cell keys in ascending order of the x, y and z cell coordinates, shape (n,).
+        """
+        shifted = np.floor(points / self._cell_size).astype(np.int64) + self._grid_size // 2
+        return (shifted[:, 0] * self._grid_size + shifted[:, 1]) * self._grid_size + shifted[:, 2]
+
+    def _conflicts(self, candidates: np.ndarray, candidate_keys: np.ndarray, sorted_keys: np.ndarray,
+                   sorted_points: np.ndarray, sorted_rank: np.ndarray | None = None) -> np.ndarray:
+        """
+        Find candidates closer than the spacing to a point of a set.
+
+        Args:
+            candidates (np.ndarray): Candidate points, shape (n, 3).
+            candidate_keys (np.ndarray): Cell keys of the candidates, sorted for fast lookups.
+            sorted_keys (np.ndarray): Sorted cell keys of the set, one point per cell.
+            sorted_points (np.ndarray): Points of the set in the order of the keys.
+            sorted_rank (np.ndarray | None): Draw order of the points if the set is the candidates
+                themselves; only points drawn earlier count then.
+
+        Returns:
+            np.ndarray: Whether each candidate is in conflict.
+        """
+        conflicts = np.zeros(len(candidates), dtype=bool)
+        if len(sorted_keys) == 0:
+            return conflicts
+        for shift in self._offset_shifts:
+            neighbour_keys = candidate_keys + shift
+            found = np.minimum(np.searchsorted(sorted_keys, neighbour_keys), len(sorted_keys) - 1)
+            hit = sorted_keys[found] == neighbour_keys
+            if sorted_rank is not None:
+                hit &= sorted_rank[found] < sorted_rank
+            hit = np.flatnonzero(hit)
+            close = np.sum((sorted_points[found[hit]] - candidates[hit]) ** 2, axis=1) < self.spacing ** 2
+            conflicts[hit[close]] = True
+        return conflicts
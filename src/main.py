@@ -3,53 +3,356 @@ Application for simulating diffusion-controlled aggregation. It simulates the fo
 """
 
 import argparse
+import os
+import numpy as np
 
 from simulation import Simulation
+from walker_calculation import WalkerCalculation
 from visualizer import Visualizer
 from chart_creator import ChartCreator
+from analysis.fractal_analysis import FractalAnalysis
+from analysis.stream_fractal_analysis import StreamFractalAnalysis
+from analysis.ensemble_aggregator import EnsembleAggregator
 from config import *
 from layout.layout import Layout
+from engine_type import EngineType
+from simulation_params import SimulationParams
+from precision_type import PrecisionType
+from update_order_type import UpdateOrderType
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from DI_container import injector
+from database.db_connect import session_scope
+from database.services.simulation_run_service import SimulationRunService
 from database.db_runner import DbRunner
 from database.db_cleaner import DbCleaner
+from sweep.work_queue import WorkQueue
+from sweep.sweep_worker import SweepWorker
+from sweep.sweep_merger import SweepMerger
+from query.results_cache import ResultsCache
+from query.results_server import ResultsServer
+from sweep.runtime_model import RuntimeModel
+from sweep.sweep_scheduler import SweepScheduler
+from telemetry.progress_reporter import ProgressReporter
+from storage.trajectory_writer import TrajectoryWriter
+from validation.precision_validation import PrecisionValidation
+from validation.engine_validation import EngineValidation
 
 def main():
     parser = argparse.ArgumentParser(description = "Difuzně řízená agregace")
-    parser.add_argument("--layout", type=Layout, choices = list(Layout), default = LAYOUT_DEFAULT, help = "Typ počátečního rozdělení molekul (cube, sphere, random)")
+    parser.add_argument("--layout", type=Layout, choices = list(Layout), default = LAYOUT_DEFAULT, help = "Typ počátečního rozdělení molekul (cube, sphere, random, poisson_disk, sphere_shell, cube_shell)")
     parser.add_argument("--atoms", nargs='+', type=int, default = ATOMS_DEFAULT, help = "Počet atomů v simulaci")
+    parser.add_argument("--replicates", type=int, default = REPLICATES_DEFAULT, help = "Počet opakování simulace pro každý počet atomů (s --budget nejvyšší počet)")
+    parser.add_argument("--engine", type=EngineType, choices = list(EngineType), default = ENGINE_DEFAULT, help = "Výpočetní jádro simulace (auto vybere nejrychlejší jádro podle kalibrace tohoto počítače)")
+    parser.add_argument("--threads", type=int, default = THREADS_DEFAULT, help = "Počet vláken jader threaded a lattice")
+    parser.add_argument("--storage", metavar="DIR", help = "Složka pro dendrimery jádra out_of_core (jinak dočasná složka)")
+    parser.add_argument("--trajectory", metavar="DIR", help = "Uloží komprimované trajektorie všech částic do složky DIR")
+    parser.add_argument("--budget", type=float, default = None, help = "Časový limit celé série simulací v sekundách")
+    parser.add_argument("--workers", type=int, default = WORKERS_DEFAULT, help = "Počet paralelních workerů pro plánování série s --budget")
     parser.add_argument("--visualize", action="store_true", default=VISUALIZATION_DEFAULT, help = "Zobrazí vizualizaci počátečního a koncového stavu")
     parser.add_argument("--plot", action="store_true", default=PLOT_DEFAULT, help = "Zobrazí graf závislosti počtu atomů na gyračním poloměru")
     parser.add_argument("--sim", action="store_true", default=SIM_DEFAULT, help = "Spustí simulaci")
     parser.add_argument("--clean_db", action="store_true", default=CLEAN_DB_DEFAULT, help = "Vyčistí databázi před spuštěním simulace")
+    parser.add_argument("--analyze", action="store_true", default=ANALYSIS_DEFAULT, help = "Vypočítá fraktální dimenzi každého výsledného dendrimeru")
+    parser.add_argument("--step", type=float, default = STEP, help = "Délka jednoho kroku iontu")
+    parser.add_argument("--direc_prob", type=float, default = DIREC_PROB, help = "Váha směru k nejbližší elektrodě v kroku iontu")
+    parser.add_argument("--atom_radius", type=float, default = ATOM_RADIUS, help = "Poloměr atomu")
+    parser.add_argument("--update_order", type=UpdateOrderType, choices = list(UpdateOrderType), default = UPDATE_ORDER_DEFAULT, help = "Pořadí posunu iontů v kroku simulace (sequential, random, synchronous)")
+    parser.add_argument("--end_phase", type=int, default = END_PHASE_THRESHOLD, help = "Počet volných iontů, pod kterým zbylé ionty dělají dávky kroků (0 vypne)")
+    parser.add_argument("--electrode", type=ElectrodeGeometryType, choices = list(ElectrodeGeometryType), default = ELECTRODE_DEFAULT, help = "Tvar elektrody (point, plane, wire, sphere)")
+    parser.add_argument("--precision", type=PrecisionType, choices = list(PrecisionType), default = PRECISION_DEFAULT, help = "Přesnost poloh částic (float64, float32)")
+    parser.add_argument("--validate_precision", action="store_true", default=False, help = "Ověří, že float32 nemění gyrační poloměr, a skončí")
+    parser.add_argument("--validate_engine", nargs="*", type=Layout, choices = list(Layout), metavar="LAYOUT", help = "Porovná jádro --engine s referenčním jádrem pro zadaná rozdělení (bez hodnot --layout) a skončí")
+    parser.add_argument("--calibrate", action="store_true", default=False, help = "Znovu změří rychlost jader pro --engine auto na tomto počítači, vypíše jejich přechody a skončí")
+    parser.add_argument("--progress", action="store_true", default=PROGRESS_DEFAULT, help = "Průběžně vypisuje stav běžící simulace na stderr")
+    parser.add_argument("--progress_file", metavar="PATH", help = "Připisuje průběžný stav simulace do souboru JSON lines")
+    parser.add_argument("--enqueue", metavar="DIR", help = "Zapíše simulace do sdílené fronty ve složce DIR a skončí")
+    parser.add_argument("--worker", metavar="DIR", help = "Zpracovává simulace ze sdílené fronty ve složce DIR")
+    parser.add_argument("--merge", metavar="DIR", help = "Uloží výsledky ze sdílené fronty ve složce DIR do databáze")
+    parser.add_argument("--watch", type=float, nargs="?", const=WATCH_INTERVAL, metavar="SECONDS", help = "Průběžně doplňuje graf o nově uložené simulace rozdělení --layout každých SECONDS sekund, dokud se okno nezavře")
+    parser.add_argument("--serve", type=int, metavar="PORT", help = "Spustí lokální HTTP službu s dotazy na uložené výsledky")
     args = parser.parse_args()
+    if args.engine == EngineType.WALKER and args.electrode not in WalkerCalculation.ELECTRODES:
+        parser.error(f"engine walker nepodporuje elektrodu {args.electrode.value}, "
+                     f"pouze {', '.join(x.value for x in WalkerCalculation.ELECTRODES)}")
+    reporter = _create_reporter(args.progress, args.progress_file)
+    params = SimulationParams(args.step, args.direc_prob, args.atom_radius, args.end_phase, args.update_order)
+    if args.validate_precision:
+        _validate_precision(args.layout, args.engine, params, args.electrode, args.atoms, args.replicates, args.threads)
+        return
+    if args.validate_engine is not None:
+        _validate_engine(args.validate_engine or [args.layout], args.engine, params, args.electrode, args.atoms,
+                         args.replicates, args.threads)
+        return
+    if args.calibrate:
+        _calibrate(args.layout, params, args.threads)
+        return
+    if args.worker:
+        _run_worker(WorkQueue(args.worker), reporter, args.threads)
+        return
+    if args.enqueue:
+        if args.budget is not None:
+            DbRunner()
+        jobs = _plan_sweep(args.layout, args.engine, args.atoms, args.replicates, args.budget, args.workers)
+        _enqueue_sweep(WorkQueue(args.enqueue), args.layout, args.engine, params, args.electrode, args.precision, jobs)
+        return
     DbRunner()
+    if args.serve is not None:
+        ResultsServer(injector.get(ResultsCache), args.serve).serve_forever()
+        return
+    if args.watch is not None:
+        ChartCreator(args.layout, args.watch, args.engine, args.electrode,
+                     Simulation.effective_params(args.engine, params), args.precision)
+        return
+    if args.merge:
+        _merge_results(WorkQueue(args.merge))
+        _plot_chart(args.plot, args.layout, args.engine, args.electrode, params, args.precision)
+        return
     DbCleaner(args.clean_db)
-    _start_sim(args.layout, args.atoms, args.visualize, args.sim)
-    _plot_chart(args.plot, args.layout)
+    if args.sim:
+        jobs = _plan_sweep(args.layout, args.engine, args.atoms, args.replicates, args.budget, 1)
+        _start_sim(args.layout, args.engine, params, args.electrode, args.precision, jobs, args.visualize, args.analyze,
+                   reporter, args.threads, args.storage, args.trajectory)
+    _plot_chart(args.plot, args.layout, args.engine, args.electrode, params, args.precision)
 
-def _start_sim(layout: str, atom_numbers: list[int], visualize: bool, simulation: bool) -> None:
+def _create_reporter(progress: bool, progress_file: str | None) -> ProgressReporter | None:
     """
-    Start simulation and visualization.
+    Create the progress reporter of running simulations.
+
+    Args:
+        progress (bool): Whether progress reporting is enabled.
+        progress_file (str | None): Path of the JSON-lines progress file; enables reporting when set.
+
+    Returns:
+        ProgressReporter | None: Reporter, None when reporting is disabled.
+    """
+    if not progress and progress_file is None:
+        return None
+    return ProgressReporter(PROGRESS_INTERVAL, progress_file)
+
+
+def _plan_sweep(layout: Layout, engine: EngineType, atom_numbers: list[int], replicates: int,
+                budget: float | None, workers: int) -> list[int]:
+    """
+    Plan the simulations of a sweep.
 
-    Runs the simulation for each requested atom count. Optionally visualizes the
-    initial and final states and the system's gyration radius.
+    Without a budget, every atom count is simulated the requested number of
+    times in the given order. With a budget, a runtime model fitted to past
+    runs of the layout and engine decides how many replicates of each atom
+    count fit into it, and the jobs are ordered longest first.
 
     Args:
-        layout (str): Starting layout of free ions ("cube", "sphere" or "random").
+        layout (Layout): Starting layout of free ions.
+        engine (EngineType): Calculation engine of the simulations.
         atom_numbers (list[int]): List of atom counts for the simulation.
+        replicates (int): Number of simulations for each atom count (maximum with a budget).
+        budget (float | None): Wall-clock budget of the sweep in seconds.
+        workers (int): Number of parallel workers sharing the budget.
+
+    Returns:
+        list[int]: Atom count of every simulation in the order of execution.
+    """
+    if budget is None:
+        return [atom_number for atom_number in atom_numbers for _ in range(replicates)]
+    with session_scope():
+        timings = injector.get(SimulationRunService).get_run_timings(layout, engine)
+    scheduler = SweepScheduler(RuntimeModel(timings), workers, budget)
+    jobs = scheduler.plan(atom_numbers, replicates)
+    planned = ", ".join(f"N = {atoms}: {count}" for atoms, count in scheduler.replicates.items())
+    print(f"Planned replicates ({len(timings)} timed runs): {planned}")
+    print(f"Predicted duration {scheduler.makespan:.1f} s of {budget:.1f} s on {workers} worker(s)")
+    return jobs
+
+
+def _start_sim(layout: Layout, engine: EngineType, params: SimulationParams, electrode_type: ElectrodeGeometryType,
+               precision: PrecisionType, jobs: list[int], visualize: bool, analyze: bool, reporter: ProgressReporter | None, threads: int,
+               storage: str | None, trajectory: str | None = None) -> None:
+    """
+    Start simulation and visualization.
+
+    Runs one simulation for each planned job. Every finished run is folded
+    into running ensemble statistics and released, unless it is the first run
+    of its atom count and kept for the visualization of the initial and final states.
+
+    Args:
+        layout (Layout): Starting layout of free ions.
+        engine (EngineType): Calculation engine of the simulations.
+        params (SimulationParams): Physical parameters of the simulations.
+        electrode_type (ElectrodeGeometryType): Shape of the electrode the dendrimers grow on.
+        precision (PrecisionType): Floating-point precision of particle positions.
+        jobs (list[int]): Atom count of every simulation.
         visualize (bool): Whether to visualize the initial and final state.
-        simulation (bool): Whether to run the simulation process.
+        analyze (bool): Whether to print the fractal analysis of each final dendrimer.
+        reporter (ProgressReporter | None): Receiver of progress events, None to run silently.
+        threads (int): Number of threads of the threaded engine.
+        storage (str | None): Directory of the out-of-core dendrimers with one subdirectory per run, temporary if None.
+        trajectory (str | None): Directory of the particle trajectories with one subdirectory per run, None to not record them.
     """
-    if not simulation:
-        return
-    visualizer = Visualizer(atom_numbers)
-    for atom_number in atom_numbers:
-        sim = Simulation(layout, atom_number)
-        visualizer.set_simulation_data(sim.get_atoms())
+    visualizer = Visualizer(sorted(set(jobs)))
+    aggregator = EnsembleAggregator()
+    visualized = set()
+    for run, atom_number in enumerate(jobs):
+        storage_dir = os.path.join(storage, f"run_{run:05d}_n{atom_number}") if storage is not None else None
+        sim = Simulation(layout, atom_number, engine, params, electrode_type, precision, reporter=reporter, threads=threads,
+                         storage_dir=storage_dir)
+        aggregator.add_run(layout, atom_number, sim.get_radius_of_gyration(), sim.topology.generation_histogram)
+        if visualize and sim.store is None and atom_number not in visualized:
+            visualizer.set_simulation_data(sim.get_atoms())
+            visualized.add(atom_number)
+        if analyze:
+            _print_analysis(sim)
+        if trajectory is not None:
+            _write_trajectory(sim, os.path.join(trajectory, f"run_{run:05d}_n{atom_number}"))
+        sim.release_storage()
+        del sim
+    if reporter is not None:
+        reporter.close()
+    aggregator.report()
     if visualize:
         visualizer.visualize_simulation()
 
 
-def _plot_chart(plot: bool, layout: Layout) -> None:
+def _write_trajectory(sim: Simulation, directory: str) -> None:
+    """
+    Write the compressed trajectories of all particles of a simulation.
+
+    Particle i of the trajectory is electrode i of the dendrimer. The out-of-core
+    engine keeps no particle histories, so nothing is written for it.
+
+    Args:
+        sim (Simulation): Finished simulation.
+        directory (str): Directory of the trajectory files.
+    """
+    if sim.store is not None:
+        print(f"Trajectories are not recorded by the {sim.engine.value} engine")
+        return
+    TrajectoryWriter(directory, sim.params.step).write([atom.positions_list for atom in sim.get_atoms()])
+
+
+def _enqueue_sweep(queue: WorkQueue, layout: Layout, engine: EngineType, params: SimulationParams,
+                   electrode_type: ElectrodeGeometryType, precision: PrecisionType, jobs: list[int]) -> None:
+    """
+    Write one work item per simulation of the sweep into the shared queue.
+
+    Workers claim the items in the order of the job list.
+
+    Args:
+        queue (WorkQueue): Shared work queue.
+        layout (Layout): Starting layout of free ions.
+        engine (EngineType): Calculation engine of the simulations.
+        params (SimulationParams): Physical parameters of the simulations.
+        electrode_type (ElectrodeGeometryType): Shape of the electrode the dendrimers grow on.
+        precision (PrecisionType): Floating-point precision of particle positions.
+        jobs (list[int]): Atom count of every simulation.
+    """
+    seeds = np.random.SeedSequence().generate_state(len(jobs))
+    items = [
+        {"layout": layout.value, "engine": engine.value, "atoms": atom_number, "seed": int(seed),
+         "params": params.to_dict(), "electrode": electrode_type.value, "precision": precision.value}
+        for atom_number, seed in zip(jobs, seeds)
+    ]
+    queue.enqueue(items)
+    print(f"{len(items)} simulations written to {queue.directory}")
+
+
+def _run_worker(queue: WorkQueue, reporter: ProgressReporter | None, threads: int) -> None:
+    """
+    Process simulations from the shared queue until it is empty.
+
+    Args:
+        queue (WorkQueue): Shared work queue.
+        reporter (ProgressReporter | None): Receiver of progress events, None to run silently.
+        threads (int): Number of threads of the threaded engine.
+    """
+    worker = SweepWorker(queue, reporter, threads)
+    processed = worker.run()
+    if reporter is not None:
+        reporter.close()
+    print(f"Worker {worker.worker_id} finished {processed} simulations")
+
+
+def _merge_results(queue: WorkQueue) -> None:
+    """
+    Store finished simulations from the shared queue in the database.
+
+    Args:
+        queue (WorkQueue): Shared work queue.
+    """
+    released = queue.release_stale(SWEEP_STALE_CLAIM_AGE)
+    merged = SweepMerger(queue).merge()
+    print(f"{merged} results merged into the database, {released} stale claims returned to the queue")
+
+
+def _validate_precision(layout: Layout, engine: EngineType, params: SimulationParams, electrode_type: ElectrodeGeometryType,
+                        atom_numbers: list[int], replicates: int, threads: int) -> None:
+    """
+    Compare the gyration radius of float64 and float32 simulations and print the verdict.
+
+    Args:
+        layout (Layout): Starting layout of free ions.
+        engine (EngineType): Calculation engine of the simulations.
+        params (SimulationParams): Physical parameters of the simulations.
+        electrode_type (ElectrodeGeometryType): Shape of the electrode the dendrimers grow on.
+        atom_numbers (list[int]): List of atom counts to validate.
+        replicates (int): Number of seeds for each atom count.
+        threads (int): Number of threads of the threaded and lattice engines.
+    """
+    validation = PrecisionValidation(layout, engine, params, electrode_type, threads)
+    validation.run(atom_numbers, replicates)
+    validation.report()
+
+
+def _validate_engine(layouts: list[Layout], engine: EngineType, params: SimulationParams,
+                     electrode_type: ElectrodeGeometryType, atom_numbers: list[int], replicates: int, threads: int) -> None:
+    """
+    Compare the dendrimers of an engine with those of the reference engine and print the verdict and speedup.
+
+    Args:
+        layouts (list[Layout]): Starting layouts to validate.
+        engine (EngineType): Calculation engine under validation.
+        params (SimulationParams): Physical parameters of the simulations.
+        electrode_type (ElectrodeGeometryType): Shape of the electrode the dendrimers grow on.
+        atom_numbers (list[int]): List of atom counts to validate.
+        replicates (int): Number of seeds for each layout and atom count.
+        threads (int): Number of threads of the threaded engine.
+    """
+    validation = EngineValidation(engine, params, electrode_type, threads=threads)
+    validation.run(layouts, atom_numbers, replicates)
+    validation.report()
+
+
+def _calibrate(layout: Layout, params: SimulationParams, threads: int) -> None:
+    """
+    Measure the engines on a layout again and print from which number of atoms each of them is the fastest.
+
+    Args:
+        layout (Layout): Starting layout of free ions.
+        params (SimulationParams): Physical parameters of the simulations; only engines honouring them are measured.
+        threads (int): Number of threads of the threaded engine.
+    """
+    for atoms, engine in Simulation.calibration(params, threads).crossovers(layout, refresh=True):
+        print(f"{layout.value}: {engine.value} from N = {atoms}")
+
+
+def _print_analysis(sim: Simulation) -> None:
+    """
+    Print the fractal analysis of a single final dendrimer.
+
+    Args:
+        sim (Simulation): Finished simulation.
+    """
+    seed_position = sim.electrode.position if sim.electrode is not None else None
+    if sim.store is not None:
+        analysis = StreamFractalAnalysis(sim.store, seed_position, sim.params.atom_radius)
+    else:
+        analysis = FractalAnalysis(sim.get_electrode_positions(), seed_position, sim.params.atom_radius)
+    box_dim = analysis.box_counting_dimension()[0]
+    mass_dim = analysis.mass_radius_dimension()[0]
+    print(f"N = {sim.atoms_num}: box-counting Df = {box_dim:.4f}, mass-radius Df = {mass_dim:.4f}")
+
+
+def _plot_chart(plot: bool, layout: Layout, engine: EngineType = EngineType.REFERENCE,
+                electrode_type: ElectrodeGeometryType = ElectrodeGeometryType.POINT, params: SimulationParams | None = None,
+                precision: PrecisionType = PrecisionType.FLOAT64) -> None:
     """
     Plot the results chart.
 
@@ -59,9 +362,15 @@ def _plot_chart(plot: bool, layout: Layout) -> None:
     Args:
         plot (bool): Whether plotting the chart is enabled.
         layout (Layout): Type of layout used in the simulation.
+        engine (EngineType): Engine of the simulation; only runs of its aggregation model are plotted.
+        electrode_type (ElectrodeGeometryType): Electrode of the simulation; only runs grown on it are plotted.
+        params (SimulationParams | None): Requested parameters of the simulation, defaults if None; only runs
+            with the parameters the engine simulates are plotted.
+        precision (PrecisionType): Precision of the simulation; only runs with it are plotted.
     """
     if plot:
-        ChartCreator(layout)
+        params = Simulation.effective_params(engine, params if params is not None else SimulationParams())
+        ChartCreator(layout, engine=engine, electrode_type=electrode_type, params=params, precision=precision)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,162 @@
+import numpy as np
+
+import config
+from calculation import Calculation
+from storage.cell_index import CellIndex
+from update_order_type import UpdateOrderType
+
+class OutOfCoreCalculation (Calculation):
+    """
+    Calculation for dendrimers larger than the memory.
+
+    Free ions are rows of a position array instead of Ion objects, and bound
+    ions are appended to the ClusterStore of the simulation, whose memory-mapped
+    chunks hold positions, generations and parents. The nearest electrode of
+    an ion is found through a CellIndex, so a step costs O(1) for ions near
+    the dendrimer instead of O(number of electrodes). The update orders of the
+    reference engine are supported; the end phase is not needed, because
+    steps do not get more expensive as the dendrimer grows.
+
+    Attributes:
+        store (ClusterStore): Storage of the electrodes.
+        index (CellIndex): Nearest-neighbour index over the stored electrodes.
+        positions (np.ndarray): Positions of free ions; the first free_count rows are in use.
+        free_count (int): Number of free ions.
+    """
+    def __init__(self, simulation, reporter=None) -> None:
+        """
+        Initialize the OutOfCoreCalculation helper.
+
+        Args:
+            simulation (Simulation): Parent simulation instance with a store and free ion positions.
+            reporter (ProgressReporter | None): Receiver of progress events, None to run silently.
+        """
+        super().__init__(simulation, reporter)
+        self.store = simulation.store
+        self.index = CellIndex(self.store, config.STORAGE_CELL_SIZE * 2 * self.params.atom_radius)
+        self.positions = simulation.ion_positions
+        self.free_count = len(self.positions)
+        self._distances = np.linalg.norm(np.asarray(self.positions, dtype=np.float64), axis=1)
+        for index in range(len(self.store)):
+            position = self.store.position(index)
+            self.index.add(index, position)
+            self._add_to_cluster_sums(position)
+
+    def calculate_sim(self) -> None:
+        """
+        Perform all simulation sweeps until all free ions are bound.
+
+        Progress is passed to the reporter once per sweep.
+        """
+        while self.free_count != 0:
+            self.ion_steps += self.free_count
+            if self.params.update_order == UpdateOrderType.RANDOM:
+                permutation = np.random.permutation(self.free_count)
+                self.positions[:self.free_count] = self.positions[permutation]
+                self._distances[:self.free_count] = self._distances[permutation]
+            self._sweep(self.params.update_order == UpdateOrderType.SYNCHRONOUS)
+            if self.reporter is not None:
+                self.reporter.update(self.free_count, self.ion_steps, self.cluster_gyration())
+        if self.reporter is not None:
+            self.reporter.finish(self.ion_steps, self.cluster_gyration())
+
+    def _sweep(self, synchronous: bool) -> None:
+        """
+        Advance every free ion once.
+
+        As in the reference engine, an ion bonds when its distance to the
+        dendrimer before its last step was within the bonding distance.
+
+        Args:
+            synchronous (bool): Whether ions bind only after the sweep, so all
+                of them see the dendrimer as it was at the start of the sweep.
+        """
+        bonding = []
+        i = 0
+        while i < self.free_count:
+            position = self.positions[i]
+            distance, parent, pref_direc = self._nearest(position)
+            if self._distances[i] <= self.params.bond_distance:
+                if synchronous:
+                    bonding.append((i, parent))
+                else:
+                    self._bind(position, parent)
+                    self._remove_at(i)
+                    continue
+            else:
+                self._distances[i] = distance
+                self.positions[i] = position + self._biased_step(pref_direc)
+            i += 1
+        for i, parent in bonding:
+            self._bind(self.positions[i], parent)
+        for i, _ in reversed(bonding):
+            self._remove_at(i)
+
+    def _nearest(self, position: np.ndarray) -> tuple:
+        """
+        Find the nearest electrode or electrode surface of a free ion.
+
+        Args:
+            position (np.ndarray): Position of the ion.
+
+        Returns:
+            tuple: (float, int | np.ndarray, np.ndarray) - distance, index of the nearest
+                electrode (or surface anchor position) and direction towards it.
+        """
+        distance, parent = self.index.nearest(position)
+        if self.geometry is not None:
+            surface_dist = self.geometry.surface_distance(position) + self.params.atom_radius
+            if surface_dist < distance:
+                anchor = self.geometry.anchor(position, self.params.atom_radius).position
+                return surface_dist, anchor, anchor - position
+        return distance, parent, self.store.position(parent) - position
+
+    def _biased_step(self, pref_direc: np.ndarray) -> np.ndarray:
+        """
+        Calculate one biased step of a free ion.
+
+        Args:
+            pref_direc (np.ndarray): Direction towards the nearest electrode.
+
+        Returns:
+            np.ndarray: Displacement of the ion.
+        """
+        probability = self.params.direc_prob
+        norm_pref_direc = pref_direc / np.linalg.norm(pref_direc)
+        rand_direc = np.random.randn(3)
+        norm_rand_direc = rand_direc / np.linalg.norm(rand_direc)
+        biased_vec = (1 - probability) * norm_rand_direc + probability * norm_pref_direc
+        return biased_vec / np.linalg.norm(biased_vec) * self.params.step
+
+    def _bind(self, position: np.ndarray, parent) -> None:
+        """
+        Append a bonding ion to the store at two atom radii from its parent.
+
+        Args:
+            position (np.ndarray): Position of the ion.
+            parent (int | np.ndarray): Index of the parent electrode, or the anchor position on the electrode surface.
+        """
+        if isinstance(parent, np.ndarray):
+            parent_position, parent_index, generation = parent, -1, 0
+        else:
+            parent_position, parent_index = self.store.position(parent), parent
+            generation = self.store.generation(parent) + 1
+        direction = position - parent_position
+        distance = np.linalg.norm(direction)
+        if distance != 0:
+            position = parent_position + direction / distance * 2 * self.params.atom_radius
+        position = np.asarray(position, dtype=self.dtype)
+        index = self.store.append(position, generation, parent_index)
+        self.index.add(index, position)
+        self._add_to_cluster_sums(position)
+
+    def _remove_at(self, i: int) -> None:
+        """
+        Remove a free ion by moving the last free ion into its row.
+
+        Args:
+            i (int): Row of the removed ion.
+        """
+        self.free_count -= 1
+        self.positions[i] = self.positions[self.free_count]
+        self._distances[i] = self._distances[self.free_count]
@@ -0,0 +1,15 @@
+from enum import Enum
+
+import numpy as np
+
+class PrecisionType(Enum):
+    """
+    Floating-point precision of particle positions and distance computations.
+    """
+    FLOAT64 = "float64"
+    FLOAT32 = "float32"
+
+    @property
+    def dtype(self) -> np.dtype:
+        """NumPy dtype of particle positions."""
+        return np.dtype(self.value)
@@ -0,0 +1,253 @@
+import threading
+import time
+
+import numpy as np
+
+import config
+from layout.layout import Layout
+from engine_type import EngineType
+from simulation_params import SimulationParams
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from precision_type import PrecisionType
+from database.db_connect import session_scope
+from database.services.gyration_ratio_service import GyrationRatioService
+from database.services.simulation_run_service import SimulationRunService
+
+
+class ResultsCache ():
+    """
+    Read-through in-memory cache of the stored simulation results.
+
+    Gyration radii of a layout are loaded from the database on the first
+    query and every derived answer is memoized. Answers are kept per
+    aggregation model (EngineType.model), electrode, simulation parameters and
+    precision, so runs of the walker and lattice engines are never pooled with
+    the off-lattice runs, nor runs with different physics. The cache is tied to the
+    newest simulation run id and the number of runs: at most once per
+    QUERY_CACHE_TTL seconds both are read, and only a change (a stored run, or a
+    deleted run of any age) drops the cached results. Repeated queries in between do not touch the database at all.
+    The cache can be shared by several threads.
+
+    Attributes:
+        ttl (float): Seconds during which cached results are served without a check.
+        latest_run_id (int | None): Newest simulation run id the cached results belong to.
+        run_count (int | None): Number of simulation runs the cached results belong to.
+    """
+    LEGACY_LAYOUTS = (Layout.CUBE, Layout.SPHERE, Layout.RANDOM) # layouts with a column in the per-N gyration ratio
+
+    def __init__(self, gyration_ratio_service: GyrationRatioService, simulation_run_service: SimulationRunService,
+                 ttl: float = config.QUERY_CACHE_TTL) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            gyration_ratio_service (GyrationRatioService): Service of the per-N gyration ratio records.
+            simulation_run_service (SimulationRunService): Service of the per-run records.
+            ttl (float): Seconds during which cached results are served without a check.
+        """
+        self._gyratio_ratio_service = gyration_ratio_service
+        self._simulation_run_service = simulation_run_service
+        self.ttl = ttl
+        self.latest_run_id = None
+        self.run_count = None
+        self._checked_at = None
+        self._answers = {}
+        self._lock = threading.RLock()
+
+    def samples(self, layout: Layout, engine: EngineType = EngineType.REFERENCE,
+                electrode_type: ElectrodeGeometryType = ElectrodeGeometryType.POINT,
+                params: SimulationParams | None = None, precision: PrecisionType = PrecisionType.FLOAT64) -> tuple:
+        """
+        Gyration radius of every stored run of a layout, aggregation model, electrode, parameters and precision.
+
+        Databases without per-run records fall back to one gyration radius per
+        number of atoms, which exists only for the off-lattice model, the point
+        electrode, the default parameters, float64 and the cube, sphere and
+        random layouts.
+
+        Args:
+            layout (Layout): Starting layout of the runs.
+            engine (EngineType): Engine whose aggregation model the runs belong to.
+            electrode_type (ElectrodeGeometryType): Electrode the runs grew on.
+            params (SimulationParams | None): Parameters of the runs, defaults if None.
+            precision (PrecisionType): Precision of the runs.
+
+        Returns:
+            tuple: (list[int], list[float]) - number of atoms and gyration radius of every run.
+        """
+        params = params if params is not None else SimulationParams()
+        return self._cached(("samples", layout, engine.model, electrode_type, params, precision),
+                            lambda: self._load_samples(layout, engine, electrode_type, params, precision))
+
+    def gyration_table(self, layout: Layout, engine: EngineType = EngineType.REFERENCE,
+                       electrode_type: ElectrodeGeometryType = ElectrodeGeometryType.POINT,
+                       params: SimulationParams | None = None, precision: PrecisionType = PrecisionType.FLOAT64) -> list[dict]:
+        """
+        Mean gyration radius for every number of atoms of a layout, aggregation model, electrode, parameters and precision.
+
+        Args:
+            layout (Layout): Starting layout of the runs.
+            engine (EngineType): Engine whose aggregation model the runs belong to.
+            electrode_type (ElectrodeGeometryType): Electrode the runs grew on.
+            params (SimulationParams | None): Parameters of the runs, defaults if None.
+            precision (PrecisionType): Precision of the runs.
+
+        Returns:
+            list[dict]: Number of atoms, number of runs, mean and standard deviation of Rg, ordered by atoms.
+        """
+        params = params if params is not None else SimulationParams()
+        return self._cached(("gyration", layout, engine.model, electrode_type, params, precision),
+                            lambda: self._gyration_table(*self.samples(layout, engine, electrode_type, params, precision)))
+
+    def fractal_dimension(self, layout: Layout, engine: EngineType = EngineType.REFERENCE,
+                          electrode_type: ElectrodeGeometryType = ElectrodeGeometryType.POINT,
+                          params: SimulationParams | None = None, precision: PrecisionType = PrecisionType.FLOAT64) -> dict:
+        """
+        Fractal dimension fitted from log N against log Rg of all runs of a layout, aggregation model, electrode,
+        parameters and precision.
+
+        Args:
+            layout (Layout): Starting layout of the runs.
+            engine (EngineType): Engine whose aggregation model the runs belong to.
+            electrode_type (ElectrodeGeometryType): Electrode the runs grew on.
+            params (SimulationParams | None): Parameters of the runs, defaults if None.
+            precision (PrecisionType): Precision of the runs.
+
+        Returns:
+            dict: Fractal dimension (None for fewer than two distinct numbers of atoms) and number of runs.
+        """
+        params = params if params is not None else SimulationParams()
+        return self._cached(("dimension", layout, engine.model, electrode_type, params, precision),
+                            lambda: self._fractal_dimension(*self.samples(layout, engine, electrode_type, params, precision)))
+
+    def run_counts(self) -> dict[str, dict[str, int]]:
+        """
+        Number of stored runs of every layout and engine.
+
+        Returns:
+            dict[str, dict[str, int]]: Number of runs by layout value and engine value.
+        """
+        return self._cached(("runs",), self._load_run_counts)
+
+    def _cached(self, key: tuple, compute):
+        """
+        Return a memoized answer, computing it if the cache does not hold it.
+
+        Args:
+            key (tuple): Key of the answer.
+            compute (Callable): Function computing the answer.
+
+        Returns:
+            Any: Cached or freshly computed answer.
+        """
+        with self._lock:
+            self._check_latest_run()
+            if key not in self._answers:
+                self._answers[key] = compute()
+            return self._answers[key]
+
+    def _check_latest_run(self) -> None:
+        """
+        Drop all cached answers if a run was stored or deleted since they were computed.
+
+        The database is asked at most once per ttl seconds.
+        """
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.ttl:
+            return
+        with session_scope():
+            latest_run_id = self._simulation_run_service.get_latest_run_id()
+            run_count = self._simulation_run_service.get_run_count()
+        self._checked_at = now
+        if latest_run_id != self.latest_run_id or run_count != self.run_count:
+            self.latest_run_id = latest_run_id
+            self.run_count = run_count
+            self._answers.clear()
+
+    def _load_samples(self, layout: Layout, engine: EngineType, electrode_type: ElectrodeGeometryType,
+                      params: SimulationParams, precision: PrecisionType) -> tuple:
+        """
+        Load the gyration radius of every run of a layout, aggregation model, electrode, parameters and precision
+        from the database.
+
+        Args:
+            layout (Layout): Starting layout of the runs.
+            engine (EngineType): Engine whose aggregation model the runs belong to.
+            electrode_type (ElectrodeGeometryType): Electrode the runs grew on.
+            params (SimulationParams): Parameters of the runs.
+            precision (PrecisionType): Precision of the runs.
+
+        Returns:
+            tuple: (list[int], list[float]) - number of atoms and gyration radius of every run.
+        """
+        with session_scope():
+            simulation_runs = self._simulation_run_service.get_simulation_runs_with_layout(layout, engine, electrode_type,
+                                                                                           params, precision)
+            legacy = (engine.model == EngineType.REFERENCE.model and electrode_type == ElectrodeGeometryType.POINT
+                      and params == SimulationParams() and precision == PrecisionType.FLOAT64 and layout in self.LEGACY_LAYOUTS)
+            if len(simulation_runs) > 0 or not legacy:
+                return [x.atoms for x in simulation_runs], [x.gyration_radius for x in simulation_runs]
+            simulation_data = self._gyratio_ratio_service.get_all_gyration_ratios_with_layout(layout)
+            gyrations = [
+                (
+                    x.cube_gr if layout == Layout.CUBE
+                    else x.sphere_gr if layout == Layout.SPHERE
+                    else x.random_gr
+                )
+                for x in simulation_data
+            ]
+            return [x.atoms for x in simulation_data], gyrations
+
+    def _load_run_counts(self) -> dict[str, dict[str, int]]:
+        """
+        Load the number of runs of every layout and engine from the database.
+
+        Returns:
+            dict[str, dict[str, int]]: Number of runs by layout value and engine value.
+        """
+        with session_scope():
+            return self._simulation_run_service.get_run_counts()
+
+    @staticmethod
+    def _gyration_table(atoms_numbers: list[int], gyrations: list[float]) -> list[dict]:
+        """
+        Group gyration radii by the number of atoms.
+
+        Args:
+            atoms_numbers (list[int]): Number of atoms of every run.
+            gyrations (list[float]): Gyration radius of every run.
+
+        Returns:
+            list[dict]: Number of atoms, number of runs, mean and standard deviation of Rg, ordered by atoms.
+        """
+        if len(atoms_numbers) == 0:
+            return []
+        atoms_numbers = np.asarray(atoms_numbers)
+        gyrations = np.asarray(gyrations, dtype=np.float64)
+        table = []
+        for atoms in np.unique(atoms_numbers):
+            group = gyrations[atoms_numbers == atoms]
+            table.append({
+                "atoms": int(atoms),
+                "runs": len(group),
+                "gyration_radius": float(group.mean()),
+                "gyration_radius_std": float(group.std(ddof=1)) if len(group) > 1 else None,
+            })
+        return table
+
+    @staticmethod
+    def _fractal_dimension(atoms_numbers: list[int], gyrations: list[float]) -> dict:
+        """
+        Fit the fractal dimension as the slope of log N against log Rg.
+
+        Args:
+            atoms_numbers (list[int]): Number of atoms of every run.
+            gyrations (list[float]): Gyration radius of every run.
+
+        Returns:
+            dict: Fractal dimension (None for fewer than two distinct numbers of atoms) and number of runs.
+        """
+        if len(set(atoms_numbers)) < 2:
+            return {"fractal_dimension": None, "runs": len(atoms_numbers)}
+        coeffs = np.polyfit(np.log10(gyrations), np.log10(atoms_numbers), 1)
+        return {"fractal_dimension": round(float(coeffs[0]), 4), "runs": len(atoms_numbers)}
@@ -0,0 +1,149 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import config
+from layout.layout import Layout
+from engine_type import EngineType
+from simulation_params import SimulationParams
+from update_order_type import UpdateOrderType
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from precision_type import PrecisionType
+from query.results_cache import ResultsCache
+
+
+class ResultsServer ():
+    """
+    Local HTTP service answering queries over the stored results as JSON.
+
+    Routes:
+        GET /layouts/<layout>/gyration: mean Rg for every number of atoms.
+        GET /layouts/<layout>/dimension: fitted fractal dimension.
+        GET /runs: number of runs of every layout and engine.
+
+    The layout routes answer for the off-lattice model on the point
+    electrode with the default parameters and float64; ?engine=walker or
+    ?engine=lattice selects the runs of the model of that engine instead,
+    and ?electrode, ?step, ?direc_prob, ?atom_radius, ?update_order,
+    ?end_phase and ?precision select the runs with those values.
+
+    Every request is answered by a ResultsCache, so repeated queries do not
+    touch the database. Requests are served on separate threads.
+
+    Attributes:
+        cache (ResultsCache): Cache answering the queries.
+        address (tuple): Host and port the service listens on.
+    """
+    def __init__(self, cache: ResultsCache, port: int, host: str = config.QUERY_HOST) -> None:
+        """
+        Bind the service to a local port.
+
+        Args:
+            cache (ResultsCache): Cache answering the queries.
+            port (int): Port to listen on, 0 for any free port.
+            host (str): Host address to listen on.
+        """
+        self.cache = cache
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self.address = self._server.server_address
+
+    def serve_forever(self) -> None:
+        """
+        Answer queries until the service is shut down.
+        """
+        print(f"Serving results on http://{self.address[0]}:{self.address[1]}/")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def shutdown(self) -> None:
+        """
+        Stop serve_forever from another thread.
+        """
+        self._server.shutdown()
+
+    def answer(self, path: str, query: str = "") -> tuple:
+        """
+        Answer a single query.
+
+        Args:
+            path (str): Path of the request, without the query string.
+            query (str): Query string of the request.
+
+        Returns:
+            tuple: (int, object) - HTTP status and JSON-serializable body.
+        """
+        parts = [part for part in path.split("/") if part]
+        if parts == ["runs"]:
+            return 200, self.cache.run_counts()
+        if len(parts) == 3 and parts[0] == "layouts" and parts[2] in ("gyration", "dimension"):
+            try:
+                layout = Layout(parts[1])
+            except ValueError:
+                return 404, {"error": f"Unknown layout '{parts[1]}'"}
+            try:
+                runs = self._runs_of(query)
+            except ValueError as error:
+                return 400, {"error": f"Invalid query '{query}': {error}"}
+            if parts[2] == "gyration":
+                return 200, self.cache.gyration_table(layout, *runs)
+            return 200, self.cache.fractal_dimension(layout, *runs)
+        return 404, {"error": f"Unknown path '{path}'"}
+
+    @staticmethod
+    def _runs_of(query: str) -> tuple:
+        """
+        Engine, electrode, parameters and precision of the runs selected by a query string.
+
+        Args:
+            query (str): Query string of the request.
+
+        Returns:
+            tuple: (EngineType, ElectrodeGeometryType, SimulationParams, PrecisionType) - selected runs,
+                defaults for missing values.
+
+        Raises:
+            ValueError: If a value is not valid.
+        """
+        values = {name: items[0] for name, items in parse_qs(query).items()}
+        defaults = SimulationParams()
+        params = SimulationParams(
+            step = float(values.get("step", defaults.step)),
+            direc_prob = float(values.get("direc_prob", defaults.direc_prob)),
+            atom_radius = float(values.get("atom_radius", defaults.atom_radius)),
+            end_phase_threshold = int(values.get("end_phase", defaults.end_phase_threshold)),
+            update_order = UpdateOrderType(values.get("update_order", defaults.update_order.value)),
+        )
+        return (
+            EngineType(values.get("engine", EngineType.REFERENCE.value)),
+            ElectrodeGeometryType(values.get("electrode", ElectrodeGeometryType.POINT.value)),
+            params,
+            PrecisionType(values.get("precision", PrecisionType.FLOAT64.value)),
+        )
+
+    def _handler_class(self) -> type:
+        """
+        Create the request handler class bound to this service.
+
+        Returns:
+            type: Subclass of BaseHTTPRequestHandler.
+        """
+        service = self
+
+        class Handler (BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                path, _, query = self.path.partition("?")
+                status, body = service.answer(path, query)
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
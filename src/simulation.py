@@ -1,12 +1,37 @@
+import shutil
+import tempfile
+import time
+from dataclasses import replace
+
 import numpy as np
 
+import config
 from DI_container import injector
+from database.db_connect import session_scope
 from layout.layout import Layout
 from layout.layout_generator import LayoutGenerator
 from calculation import Calculation
+from threaded_calculation import ThreadedCalculation
+from out_of_core_calculation import OutOfCoreCalculation
+from walker_calculation import WalkerCalculation
+from lattice_calculation import LatticeCalculation
+from storage.cluster_store import ClusterStore
+from engine_type import EngineType
+from sweep.engine_calibration import EngineCalibration
+from precision_type import PrecisionType
+from simulation_params import SimulationParams
+from update_order_type import UpdateOrderType
+from telemetry.progress_reporter import ProgressReporter
 from atoms.electrode import Electrode
 from atoms.ion import Ion
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from geometry.electrode_geometry import ElectrodeGeometry
+from geometry.plane_geometry import PlaneGeometry
+from geometry.wire_geometry import WireGeometry
+from geometry.sphere_geometry import SphereGeometry
+from analysis.dendrimer_topology import DendrimerTopology
 from database.services.gyration_ratio_service import GyrationRatioService
+from database.services.simulation_run_service import SimulationRunService
 
 
 class Simulation ():
@@ -16,28 +41,100 @@ class Simulation ():
     Attributes:
         layout (str): Starting layout of free ions in space.
         atoms_num (int): Number of atoms in the simulation.
+        engine (EngineType): Calculation engine of the simulation; the auto engine is replaced by the chosen one.
+        params (SimulationParams): Physical parameters of the simulation.
+        electrode_type (ElectrodeGeometryType): Shape of the electrode the dendrimer grows on.
+        precision (PrecisionType): Floating-point precision of particle positions.
+        threads (int): Number of threads of the threaded and lattice engines.
+        store (ClusterStore | None): Memory-mapped electrode storage of the out-of-core engine, None otherwise.
+        ion_positions (np.ndarray | None): Free ion positions of the out-of-core engine, None otherwise.
+        geometry (ElectrodeGeometry | None): Analytic electrode surface, None for a single seed electrode.
+        electrode (Electrode | None): Seed electrode at the origin, None for an analytic electrode surface.
+        duration (float): Wall-clock duration of the calculation in seconds.
         ions (list): List of ion objects in the simulation.
         electrodes (list): List of electrode objects in the simulation.
+        parent_indices (list[int]): Parent index of every electrode (-1 for the seed electrode
+            and for electrodes bound directly to an analytic electrode surface).
+        topology (DendrimerTopology): Tree statistics of the resulting dendrimer. Subtree sizes and the
+            longest path need the whole tree, so with a ClusterStore all parent indices are loaded into memory.
         _radius_of_gyration (float): Gyration radius of the resulting dendrimer.
     """
-    def __init__(self, layout: str, atoms_num: int) -> None:
+    def __init__(self, layout: str, atoms_num: int, engine: EngineType = EngineType.REFERENCE,
+                 params: SimulationParams | None = None, electrode_type: ElectrodeGeometryType = ElectrodeGeometryType.POINT,
+                 precision: PrecisionType = PrecisionType.FLOAT64, save_to_db: bool = True, reporter: ProgressReporter | None = None,
+                 threads: int = config.THREADS_DEFAULT, storage_dir: str | None = None) -> None:
         """
         Initialize the Simulation object.
 
         Args:
             layout (str): Starting layout of free ions ("cube", "sphere" or "random").
             atoms_num (int): Number of atoms in the simulation.
+            engine (EngineType): Calculation engine of the simulation, the auto engine chooses the fastest
+                calibrated engine for the layout and number of atoms.
+            params (SimulationParams | None): Physical parameters of the simulation, defaults if None.
+            electrode_type (ElectrodeGeometryType): Shape of the electrode the dendrimer grows on.
+            precision (PrecisionType): Floating-point precision of particle positions.
+            save_to_db (bool): Whether to store the result in the database.
+            reporter (ProgressReporter | None): Receiver of progress events, None to run silently.
+            threads (int): Number of threads of the threaded and lattice engines.
+            storage_dir (str | None): Directory of the out-of-core electrode storage, a new temporary directory if None.
         """
-        self._gyratio_ratio_service = injector.get(GyrationRatioService)
         self.layout = layout
         self.atoms_num = atoms_num
+        self.threads = threads
+        self.engine = engine
+        self.params = params if params is not None else SimulationParams()
+        if self.engine == EngineType.AUTO:
+            self.engine = self.calibration(self.params, threads).select(layout, atoms_num)
+        self.params = self.effective_params(self.engine, self.params)
+        if self.engine == EngineType.WALKER and electrode_type not in WalkerCalculation.ELECTRODES:
+            raise ValueError(f"The walker engine does not support the {electrode_type.value} electrode, "
+                             f"only {', '.join(x.value for x in WalkerCalculation.ELECTRODES)}")
+        self.electrode_type = electrode_type
+        self.precision = precision
+        self._reporter = reporter
         self.ions = []
         self.electrodes = []
+        self.parent_indices = []
+        self.ion_positions = None
+        self.store = None
+        self._temporary_storage = self.engine == EngineType.OUT_OF_CORE and storage_dir is None
+        if self.engine == EngineType.OUT_OF_CORE:
+            self.store = ClusterStore(storage_dir or tempfile.mkdtemp(prefix="dla_store_"), self.precision.dtype)
         self._generate_ion_layout()
-        self.electrode = self._generate_elecrode()
+        self.geometry = self._generate_geometry()
+        self.electrode = self._generate_elecrode() if self.geometry is None else None
         self._calculate_simulation()
         self._radius_of_gyration = self._calc_gyration()
-        self._save_to_db()
+        self.topology = DendrimerTopology(self.store.parents() if self.store is not None else np.array(self.parent_indices))
+        if save_to_db:
+            self._save_to_db()
+
+    def release_storage(self) -> None:
+        """
+        Delete the out-of-core storage if it was created in a temporary directory.
+        """
+        if self._temporary_storage:
+            shutil.rmtree(self.store.directory, ignore_errors=True)
+            self._temporary_storage = False
+
+    @classmethod
+    def calibration(cls, params: SimulationParams, threads: int = config.THREADS_DEFAULT) -> EngineCalibration:
+        """
+        Engine calibration of this machine, timing simulations with the given parameters.
+
+        Args:
+            params (SimulationParams): Physical parameters of the simulations.
+            threads (int): Number of threads of the threaded engine.
+
+        Returns:
+            EngineCalibration: Calibration choosing the engine of the auto engine.
+        """
+        def benchmark(layout: Layout, atoms_num: int, engine: EngineType) -> float:
+            sim = cls(layout, atoms_num, engine, params, save_to_db=False, threads=threads)
+            sim.release_storage()
+            return sim.duration
+        return EngineCalibration(benchmark, params, threads)
 
     def get_atoms(self) -> list:
         """
@@ -45,14 +142,55 @@ class Simulation ():
         """
         return self.ions + self.electrodes
 
+    def get_radius_of_gyration(self) -> float:
+        """
+        Return the radius of gyration of the resulting dendrimer.
+        """
+        return float(self._radius_of_gyration)
+
+    def get_electrode_positions(self) -> np.ndarray:
+        """
+        Return positions of all electrodes of the dendrimer.
+
+        Returns:
+            np.ndarray: Electrode positions, shape (N, 3).
+        """
+        if self.store is not None:
+            return self.store.positions()
+        return np.array([electrode.position for electrode in self.electrodes], dtype=np.float64)
+
+    @staticmethod
+    def effective_params(engine: EngineType, params: SimulationParams) -> SimulationParams:
+        """
+        Parameters an engine actually simulates, which are stored with the run.
+
+        The threaded engine always advances ions synchronously and the
+        out-of-core engine has no end phase.
+
+        Args:
+            engine (EngineType): Calculation engine of the simulation.
+            params (SimulationParams): Requested parameters.
+
+        Returns:
+            SimulationParams: Parameters of the engine.
+        """
+        if engine == EngineType.THREADED:
+            return replace(params, update_order=UpdateOrderType.SYNCHRONOUS)
+        if engine == EngineType.OUT_OF_CORE:
+            return replace(params, end_phase_threshold=0)
+        return params
+
     def _generate_ion_layout(self) -> None:
         """
         Generate the initial layout of free ions using the layout generator.
         """
-        layout_gen = LayoutGenerator(self.layout, self.atoms_num)
+        layout_gen = LayoutGenerator(self.layout, self.atoms_num, self.params)
         coords = layout_gen.get_start_pos()
+        if self.store is not None:
+            self.ion_positions = np.array(coords, dtype=self.precision.dtype).reshape(-1, 3)
+            return
         for i in range(self.atoms_num):
-            ion = Ion(coords[i])
+            ion = Ion(np.asarray(coords[i], dtype=self.precision.dtype), self.params.atom_radius)
             self.ions.append(ion)
 
     def _generate_elecrode(self) -> Electrode:
@@ -62,25 +200,67 @@ class Simulation ():
         Returns:
             Electrode: Electrode placed at origin position (0, 0, 0).
         """
-        electrode = Electrode(np.array([0, 0, 0]))
+        electrode = Electrode(np.zeros(3, dtype=self.precision.dtype), self.params.atom_radius)
         electrode.parent_electrode = electrode
+        if self.store is not None:
+            self.store.append(electrode.position, 0, -1)
+            return electrode
         self.electrodes.append(electrode)
+        self.parent_indices.append(-1)
         return electrode
 
+    def _generate_geometry(self) -> ElectrodeGeometry | None:
+        """
+        Create the analytic electrode surface.
+
+        Returns:
+            ElectrodeGeometry | None: Electrode surface, None for a single seed electrode.
+        """
+        if self.electrode_type == ElectrodeGeometryType.PLANE:
+            return PlaneGeometry()
+        if self.electrode_type == ElectrodeGeometryType.WIRE:
+            return WireGeometry(config.ELECTRODE_WIRE_RADIUS)
+        if self.electrode_type == ElectrodeGeometryType.SPHERE:
+            return SphereGeometry(config.ELECTRODE_SPHERE_RADIUS)
+        return None
+
     def _calculate_simulation(self) -> None:
         """
-        Run the simulation calculation using the Calculation class.
+        Run the simulation calculation using the calculation class of the engine and measure its duration.
         """
-        calc = Calculation(self)
+        start = time.perf_counter()
+        if self._reporter is not None:
+            self._reporter.start(self.layout, self.atoms_num)
+        if self.engine == EngineType.THREADED:
+            calc = ThreadedCalculation(self, self._reporter, self.threads)
+        elif self.engine == EngineType.OUT_OF_CORE:
+            calc = OutOfCoreCalculation(self, self._reporter)
+        elif self.engine == EngineType.WALKER:
+            calc = WalkerCalculation(self, self._reporter)
+        elif self.engine == EngineType.LATTICE:
+            calc = LatticeCalculation(self, self._reporter, self.threads)
+        else:
+            calc = Calculation(self, self._reporter)
         calc.calculate_sim()
+        if self.store is not None:
+            self.store.flush()
+        self.duration = time.perf_counter() - start
 
     def _calc_gyration(self) -> float:
         """
         Calculate the radius of gyration of the dendrimer.
 
+        With out-of-core storage, the same quantity is streamed from the
+        first and second moments of the stored chunks.
+
         Returns:
             float: The radius of gyration.
         """
+        if self.store is not None:
+            count, pos_sum, sq_sum = self.store.moments()
+            com = pos_sum / self.atoms_num
+            r_pow2_sum = sq_sum - 2 * np.dot(com, pos_sum) + count * np.dot(com, com)
+            return np.sqrt(max(r_pow2_sum, 0.0) / self.atoms_num)
         atoms = self.electrodes + self.ions
         com = self._center_of_mass(atoms)
         r_pow2_sum = 0
@@ -106,11 +286,38 @@ class Simulation ():
 
     def _save_to_db(self) -> None:
         """
-        Save the number of atoms (N) and radius of gyration (Rg) to the database.
+        Save the number of atoms (N) and radius of gyration (Rg) to the database,
+        together with a per-run record of the dendrimer topology.
+
+        Both records are written in one unit of work whose session is closed
+        afterwards, so a long sweep does not keep a connection per run. The
+        per-N gyration ratio holds off-lattice runs grown on a point electrode
+        only, so runs of the walker and lattice engines and runs on an analytic
+        electrode surface are stored as per-run records alone.
         """
-        self._gyratio_ratio_service.add_or_update_gyration_ratio(
-            atoms = self.atoms_num,
-            cube_gr = self._radius_of_gyration if self.layout == Layout.CUBE else None,
-            sphere_gr = self._radius_of_gyration if self.layout == Layout.SPHERE else None,
-            random_gr = self._radius_of_gyration if self.layout == Layout.RANDOM else None,
-        )
+        with session_scope():
+            gyratio_ratio_service = injector.get(GyrationRatioService)
+            simulation_run_service = injector.get(SimulationRunService)
+            if self.engine.model == EngineType.REFERENCE.model and self.electrode_type == ElectrodeGeometryType.POINT:
+                gyratio_ratio_service.add_or_update_gyration_ratio(
+                    atoms = self.atoms_num,
+                    cube_gr = self._radius_of_gyration if self.layout == Layout.CUBE else None,
+                    sphere_gr = self._radius_of_gyration if self.layout == Layout.SPHERE else None,
+                    random_gr = self._radius_of_gyration if self.layout == Layout.RANDOM else None,
+                )
+            simulation_run_service.add_simulation_run(
+                atoms = self.atoms_num,
+                layout = self.layout,
+                gyration_radius = float(self._radius_of_gyration),
+                max_generation = self.topology.max_generation,
+                leaf_count = self.topology.leaf_count,
+                branch_point_count = self.topology.branch_point_count,
+                longest_path = self.topology.longest_path,
+                mean_subtree_size = self.topology.mean_subtree_size,
+                generation_histogram = self.topology.generation_histogram.tolist(),
+                engine = self.engine,
+                duration = self.duration,
+                params = self.params,
+                electrode_type = self.electrode_type,
+                precision = self.precision,
+            )
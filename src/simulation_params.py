@@ -0,0 +1,62 @@
+from dataclasses import dataclass, asdict
+
+import config
+from update_order_type import UpdateOrderType
+
+
+@dataclass(frozen=True)
+class SimulationParams():
+    """
+    Immutable physical and algorithmic parameters of a single simulation.
+
+    Every simulation carries its own parameters instead of reading the module
+    globals in config, so simulations with different parameters can run one
+    after another (or side by side) in a single process.
+
+    Attributes:
+        step (float): Length of a single ion step.
+        direc_prob (float): Weight of the direction towards the nearest electrode in a step.
+        atom_radius (float): Radius of a single atom.
+        end_phase_threshold (int): Number of free ions below which the remaining ions take
+            END_PHASE_STEPS steps per turn (0 disables the end phase).
+        update_order (UpdateOrderType): Order in which free ions are advanced within a sweep.
+    """
+    step: float = config.STEP
+    direc_prob: float = config.DIREC_PROB
+    atom_radius: float = config.ATOM_RADIUS
+    end_phase_threshold: int = config.END_PHASE_THRESHOLD
+    update_order: UpdateOrderType = config.UPDATE_ORDER_DEFAULT
+
+    @property
+    def bond_distance(self) -> float:
+        """Largest ion-electrode distance at which an ion binds to the dendrimer."""
+        return self.atom_radius * 2 + self.step / 2
+
+    def to_dict(self) -> dict:
+        """
+        Convert the parameters to a JSON-serializable dictionary.
+
+        Returns:
+            dict: Parameter values, enums replaced by their values.
+        """
+        values = asdict(self)
+        values["update_order"] = self.update_order.value
+        return values
+
+    @classmethod
+    def from_dict(cls, values: dict) -> "SimulationParams":
+        """
+        Create parameters from a dictionary written by to_dict.
+
+        Missing values take their defaults.
+
+        Args:
+            values (dict): Parameter values.
+
+        Returns:
+            SimulationParams: Parameters of the dictionary.
+        """
+        values = dict(values)
+        if "update_order" in values:
+            values["update_order"] = UpdateOrderType(values["update_order"])
+        return cls(**values)
@@ -0,0 +1,202 @@
+from array import array
+
+import numpy as np
+
+
+class CellIndex ():
+    """
+    Nearest-neighbour index over electrodes kept in a ClusterStore.
+
+    Space is divided into cubic cells. In memory, every occupied cell keeps
+    only its integer coordinates and a compact array of the indices of its
+    electrodes (8 bytes per electrode); positions are read from the store
+    when a query needs them.
+
+    Above the cells, a pyramid of coarser levels summarizes them: a cell of
+    level k + 1 covers 2 x 2 x 2 cells of level k and keeps the ids of its
+    occupied children. A level is added on top whenever the top level holds
+    more than TOP_CELLS cells, so the pyramid stays logarithmic in the extent
+    of the dendrimer.
+
+    Attributes:
+        cell_size (float): Edge length of a cell.
+    """
+    TOP_CELLS = 64 # most occupied cells of the top level before a coarser level is added
+    SCAN_CELLS = 4096 # most occupied cells searched by a single scan instead of a descent
+
+    def __init__(self, store, cell_size: float) -> None:
+        """
+        Initialize an empty index.
+
+        Args:
+            store (ClusterStore): Store with the electrode positions.
+            cell_size (float): Edge length of a cell.
+        """
+        self._store = store
+        self.cell_size = cell_size
+        self._cell_ids = [{}]
+        self._children = [[]]
+        self._coords = [np.zeros((64, 3), dtype=np.int64)]
+
+    def __len__(self) -> int:
+        """Number of occupied cells."""
+        return len(self._children[0])
+
+    def add(self, index: int, position: np.ndarray) -> None:
+        """
+        Add a stored electrode to the index.
+
+        Args:
+            index (int): Index of the electrode in the store.
+            position (np.ndarray): Position of the electrode.
+        """
+        key = self._cell_of(position)
+        child = index
+        for level in range(len(self._children)):
+            cell_id = self._cell_ids[level].get(key)
+            created = cell_id is None
+            if created:
+                cell_id = self._new_cell(level, key)
+            self._children[level][cell_id].append(child)
+            if not created:
+                return
+            child = cell_id
+            key = tuple(c >> 1 for c in key)
+        if len(self._children[-1]) > self.TOP_CELLS:
+            self._add_level()
+
+    def nearest(self, position: np.ndarray) -> tuple:
+        """
+        Find the electrode nearest to a position.
+
+        While there are at most 27 occupied cells, all of them are searched
+        directly. Otherwise, the 27 cells around the position are searched
+        first. If they hold an electrode closer than one cell edge, no other
+        cell can hold a closer one. Otherwise, every occupied cell whose
+        nearest possible point is closer than the best distance found so far
+        is searched. Up to SCAN_CELLS cells, they are found by a scan of all
+        cells; beyond, by a descent through the pyramid from the top level,
+        keeping at every level only the cells that can hold an electrode
+        closer than the farthest point of the nearest kept cell. The cost of
+        a query far from the dendrimer thus grows with the number of levels,
+        not with the number of cells.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            tuple: (float, int) - distance to the nearest electrode and its index
+                (inf and -1 for an empty index).
+        """
+        cells = len(self._children[0])
+        if cells == 0:
+            return np.inf, -1
+        if cells <= 27:
+            return self._search(range(cells), position)
+        cell = self._cell_of(position)
+        neighbours = [self._cell_ids[0].get((cell[0] + dx, cell[1] + dy, cell[2] + dz))
+                      for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+        distance, index = self._search([cell_id for cell_id in neighbours if cell_id is not None], position)
+        if distance <= self.cell_size:
+            return distance, index
+        position = np.asarray(position, dtype=np.float64)
+        if cells <= self.SCAN_CELLS:
+            return self._search(self._prune(0, np.arange(cells), position, distance), position)
+        top = len(self._children) - 1
+        candidates = np.arange(len(self._children[top]))
+        for level in range(top, 0, -1):
+            kept = self._prune(level, candidates, position, distance)
+            candidates = np.concatenate([np.frombuffer(self._children[level][cell_id], dtype=np.int64) for cell_id in kept])
+        return self._search(self._prune(0, candidates, position, distance), position)
+
+    def _prune(self, level: int, cell_ids: np.ndarray, position: np.ndarray, distance: float) -> np.ndarray:
+        """
+        Keep the cells of a level that can hold the nearest electrode.
+
+        Every cell is occupied, so the nearest electrode is not farther than
+        the farthest point of any of them.
+
+        Args:
+            level (int): Level of the cells in the pyramid.
+            cell_ids (np.ndarray): Ids of the occupied cells at the level.
+            position (np.ndarray): 3D position [x, y, z].
+            distance (float): Distance to the nearest electrode found so far.
+
+        Returns:
+            np.ndarray: Ids of the kept cells.
+        """
+        edge = self.cell_size * (1 << level)
+        low = self._coords[level][cell_ids] * edge - position
+        high = low + edge
+        nearest_point = np.maximum(np.maximum(low, -high), 0)
+        farthest_point = np.maximum(np.abs(low), np.abs(high))
+        lower = np.sqrt(np.sum(nearest_point ** 2, axis=1))
+        upper = np.sqrt(np.sum(farthest_point ** 2, axis=1))
+        return cell_ids[lower <= min(distance, float(upper.min()))]
+
+    def _new_cell(self, level: int, key: tuple) -> int:
+        """
+        Create an empty occupied cell of a level.
+
+        Args:
+            level (int): Level of the cell in the pyramid.
+            key (tuple): Integer coordinates of the cell at its level.
+
+        Returns:
+            int: Id of the cell.
+        """
+        cell_id = len(self._children[level])
+        self._cell_ids[level][key] = cell_id
+        self._children[level].append(array("q"))
+        if cell_id == len(self._coords[level]):
+            self._coords[level] = np.concatenate([self._coords[level], np.zeros_like(self._coords[level])])
+        self._coords[level][cell_id] = key
+        return cell_id
+
+    def _add_level(self) -> None:
+        """
+        Add a coarser level on top of the pyramid, grouping the cells of the current top level.
+        """
+        top = len(self._children) - 1
+        self._cell_ids.append({})
+        self._children.append([])
+        self._coords.append(np.zeros((64, 3), dtype=np.int64))
+        for key, cell_id in self._cell_ids[top].items():
+            parent_key = tuple(c >> 1 for c in key)
+            parent_id = self._cell_ids[top + 1].get(parent_key)
+            if parent_id is None:
+                parent_id = self._new_cell(top + 1, parent_key)
+            self._children[top + 1][parent_id].append(cell_id)
+        if len(self._children[-1]) > self.TOP_CELLS:
+            self._add_level()
+
+    def _search(self, cell_ids, position: np.ndarray) -> tuple:
+        """
+        Find the nearest electrode among the electrodes of the given cells.
+
+        Args:
+            cell_ids (Iterable[int]): Ids of the searched cells.
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            tuple: (float, int) - distance to the nearest electrode and its index (inf and -1 if none).
+        """
+        members = [np.frombuffer(self._children[0][cell_id], dtype=np.int64) for cell_id in cell_ids]
+        if len(members) == 0:
+            return np.inf, -1
+        indices = np.concatenate(members)
+        distances = np.sqrt(np.sum((self._store.positions_at(indices) - position) ** 2, axis=1))
+        nearest = np.argmin(distances)
+        return float(distances[nearest]), int(indices[nearest])
+
+    def _cell_of(self, position: np.ndarray) -> tuple:
+        """
+        Integer coordinates of the cell containing a position.
+
+        Args:
+            position (np.ndarray): 3D position [x, y, z].
+
+        Returns:
+            tuple: Cell coordinates (i, j, k).
+        """
+        return tuple(int(c) for c in np.floor(np.asarray(position, dtype=np.float64) / self.cell_size))
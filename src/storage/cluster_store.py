@@ -0,0 +1,219 @@
+import json
+import os
+
+import numpy as np
+
+import config
+
+
+class ClusterStore ():
+    """
+    Out-of-core storage of the electrodes of a dendrimer.
+
+    Positions, generations and parent indices are appended to memory-mapped
+    .npy files of a fixed number of electrodes per chunk, so the size of the
+    dendrimer is limited by the disk instead of the memory. Only the chunk
+    being filled is written to; the operating system pages the rest in and out.
+
+    Attributes:
+        directory (str): Directory of the chunk files.
+        dtype (np.dtype): Floating-point type of the stored positions.
+        chunk_size (int): Number of electrodes in one chunk.
+        count (int): Number of stored electrodes.
+    """
+    def __init__(self, directory: str, dtype: np.dtype = np.dtype(np.float64),
+                 chunk_size: int = config.STORAGE_CHUNK_SIZE) -> None:
+        """
+        Create an empty store.
+
+        Args:
+            directory (str): Directory of the chunk files, created if missing.
+            dtype (np.dtype): Floating-point type of the stored positions.
+            chunk_size (int): Number of electrodes in one chunk.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.dtype = np.dtype(dtype)
+        self.chunk_size = chunk_size
+        self.count = 0
+        self._chunks = []
+
+    @classmethod
+    def open(cls, directory: str) -> "ClusterStore":
+        """
+        Open a store written by a finished simulation for reading.
+
+        Args:
+            directory (str): Directory of the chunk files.
+
+        Returns:
+            ClusterStore: Store with all flushed electrodes.
+        """
+        with open(os.path.join(directory, "store.json"), encoding="utf-8") as file:
+            meta = json.load(file)
+        store = cls.__new__(cls)
+        store.directory = directory
+        store.dtype = np.dtype(meta["dtype"])
+        store.chunk_size = meta["chunk_size"]
+        store.count = meta["count"]
+        store._chunks = [
+            tuple(np.load(store._chunk_path(name, i), mmap_mode="r") for name in ("positions", "generations", "parents"))
+            for i in range(-(-store.count // store.chunk_size))
+        ]
+        return store
+
+    def __len__(self) -> int:
+        """Number of stored electrodes."""
+        return self.count
+
+    def append(self, position: np.ndarray, generation: int, parent: int) -> int:
+        """
+        Append an electrode.
+
+        Args:
+            position (np.ndarray): Position of the electrode.
+            generation (int): Generation of the electrode.
+            parent (int): Index of the parent electrode (-1 for roots).
+
+        Returns:
+            int: Index of the new electrode.
+        """
+        chunk, offset = divmod(self.count, self.chunk_size)
+        if chunk == len(self._chunks):
+            self._chunks.append(self._create_chunk(chunk))
+        positions, generations, parents = self._chunks[chunk]
+        positions[offset] = position
+        generations[offset] = generation
+        parents[offset] = parent
+        self.count += 1
+        return self.count - 1
+
+    def position(self, index: int) -> np.ndarray:
+        """
+        Position of a single electrode.
+
+        Args:
+            index (int): Index of the electrode.
+
+        Returns:
+            np.ndarray: Position of the electrode.
+        """
+        chunk, offset = divmod(index, self.chunk_size)
+        return np.array(self._chunks[chunk][0][offset])
+
+    def generation(self, index: int) -> int:
+        """
+        Generation of a single electrode.
+
+        Args:
+            index (int): Index of the electrode.
+
+        Returns:
+            int: Generation of the electrode.
+        """
+        chunk, offset = divmod(index, self.chunk_size)
+        return int(self._chunks[chunk][1][offset])
+
+    def positions_at(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Positions of many electrodes, read chunk by chunk.
+
+        Args:
+            indices (np.ndarray): Indices of the electrodes.
+
+        Returns:
+            np.ndarray: Positions in the order of the indices, shape (len(indices), 3).
+        """
+        if len(self._chunks) == 1:
+            return self._chunks[0][0][indices]
+        result = np.empty((len(indices), 3), dtype=self.dtype)
+        chunk_ids = indices // self.chunk_size
+        for chunk in np.unique(chunk_ids):
+            selected = chunk_ids == chunk
+            result[selected] = self._chunks[chunk][0][indices[selected] - chunk * self.chunk_size]
+        return result
+
+    def iter_chunks(self):
+        """
+        Iterate over the filled parts of all chunks.
+
+        Yields:
+            tuple: (np.ndarray, np.ndarray, np.ndarray) - positions, generations and parents of a chunk.
+        """
+        for chunk, (positions, generations, parents) in enumerate(self._chunks):
+            filled = min(self.chunk_size, self.count - chunk * self.chunk_size)
+            yield positions[:filled], generations[:filled], parents[:filled]
+
+    def positions(self) -> np.ndarray:
+        """
+        Positions of all electrodes loaded into memory.
+
+        Returns:
+            np.ndarray: Positions in float64, shape (count, 3).
+        """
+        return np.concatenate([np.asarray(chunk[0], dtype=np.float64) for chunk in self.iter_chunks()] or [np.zeros((0, 3))])
+
+    def parents(self) -> np.ndarray:
+        """
+        Parent indices of all electrodes loaded into memory.
+
+        Returns:
+            np.ndarray: Parent index of every electrode (-1 for roots).
+        """
+        return np.concatenate([np.asarray(chunk[2]) for chunk in self.iter_chunks()] or [np.zeros(0, dtype=np.int64)])
+
+    def moments(self) -> tuple:
+        """
+        Stream the first and second moments of the positions in float64.
+
+        Returns:
+            tuple: (int, np.ndarray, float) - number of electrodes, sum of positions and sum of squared norms.
+        """
+        pos_sum = np.zeros(3)
+        sq_sum = 0.0
+        for positions, _, _ in self.iter_chunks():
+            positions = np.asarray(positions, dtype=np.float64)
+            pos_sum += positions.sum(axis=0)
+            sq_sum += float(np.einsum("ij,ij->", positions, positions))
+        return self.count, pos_sum, sq_sum
+
+    def flush(self) -> None:
+        """
+        Write all chunks and the store description to disk.
+        """
+        for chunk in self._chunks:
+            for array in chunk:
+                if isinstance(array, np.memmap) and array.mode != "r":
+                    array.flush()
+        meta = {"count": self.count, "chunk_size": self.chunk_size, "dtype": self.dtype.name}
+        with open(os.path.join(self.directory, "store.json"), "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+
+    def _create_chunk(self, chunk: int) -> tuple:
+        """
+        Create the memory-mapped files of a new chunk.
+
+        Args:
+            chunk (int): Number of the chunk.
+
+        Returns:
+            tuple: (np.memmap, np.memmap, np.memmap) - positions, generations and parents.
+        """
+        return (
+            np.lib.format.open_memmap(self._chunk_path("positions", chunk), mode="w+", dtype=self.dtype, shape=(self.chunk_size, 3)),
+            np.lib.format.open_memmap(self._chunk_path("generations", chunk), mode="w+", dtype=np.int32, shape=(self.chunk_size,)),
+            np.lib.format.open_memmap(self._chunk_path("parents", chunk), mode="w+", dtype=np.int64, shape=(self.chunk_size,)),
+        )
+
+    def _chunk_path(self, name: str, chunk: int) -> str:
+        """
+        Path of a chunk file.
+
+        Args:
+            name (str): Stored quantity (positions, generations or parents).
+            chunk (int): Number of the chunk.
+
+        Returns:
+            str: Path of the .npy file.
+        """
+        return os.path.join(self.directory, f"{name}_{chunk:05d}.npy")
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class DirectionCodec ():
+    """
+    Quantization of unit vectors into two int8 codes by octahedral mapping.
+
+    A unit vector is projected onto the octahedron |x| + |y| + |z| = 1, whose
+    lower half is folded over the upper one, and the resulting point of the
+    square [-1, 1]^2 is rounded to a grid of 255 x 255 values. The angular
+    error stays below one degree. The code (-128, -128) is never produced and
+    marks an escape.
+    """
+    SCALE = 127
+    ESCAPE = -128
+
+    @classmethod
+    def encode(cls, directions: np.ndarray) -> np.ndarray:
+        """
+        Quantize unit vectors.
+
+        Args:
+            directions (np.ndarray): Unit vectors, shape (n, 3).
+
+        Returns:
+            np.ndarray: Codes, shape (n, 2), dtype int8.
+        """
+        projected = directions / np.sum(np.abs(directions), axis=1, keepdims=True)
+        x, y = projected[:, 0], projected[:, 1]
+        lower = projected[:, 2] < 0
+        folded_x = np.where(lower, (1 - np.abs(y)) * cls._sign(x), x)
+        folded_y = np.where(lower, (1 - np.abs(x)) * cls._sign(y), y)
+        square = np.stack([folded_x, folded_y], axis=1)
+        return np.rint(np.clip(square, -1, 1) * cls.SCALE).astype(np.int8)
+
+    @classmethod
+    def decode(cls, codes: np.ndarray) -> np.ndarray:
+        """
+        Reconstruct unit vectors from their codes.
+
+        Args:
+            codes (np.ndarray): Codes, shape (n, 2).
+
+        Returns:
+            np.ndarray: Unit vectors, shape (n, 3).
+        """
+        square = codes.astype(np.float64) / cls.SCALE
+        x, y = square[:, 0], square[:, 1]
+        z = 1 - np.abs(x) - np.abs(y)
+        lower = z < 0
+        unfolded_x = np.where(lower, (1 - np.abs(y)) * cls._sign(x), x)
+        unfolded_y = np.where(lower, (1 - np.abs(x)) * cls._sign(y), y)
+        directions = np.stack([unfolded_x, unfolded_y, z], axis=1)
+        return directions / np.linalg.norm(directions, axis=1, keepdims=True)
+
+    @classmethod
+    def is_escape(cls, codes: np.ndarray) -> np.ndarray:
+        """
+        Find the escape codes.
+
+        Args:
+            codes (np.ndarray): Codes, shape (n, 2).
+
+        Returns:
+            np.ndarray: Whether each code is an escape, shape (n,).
+        """
+        return (codes[:, 0] == cls.ESCAPE) & (codes[:, 1] == cls.ESCAPE)
+
+    @staticmethod
+    def _sign(values: np.ndarray) -> np.ndarray:
+        """
+        Sign of values with +1 for zero, so folding never collapses a coordinate.
+
+        Args:
+            values (np.ndarray): Values.
+
+        Returns:
+            np.ndarray: +1 or -1 for every value.
+        """
+        return np.where(values >= 0, 1.0, -1.0)
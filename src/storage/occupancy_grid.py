@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class OccupancyGrid ():
+    """
+    Bit-packed occupancy of the sites of a cubic lattice.
+
+    The occupied sites are kept as one bit per site of a cube centered at the
+    origin, eight sites along z per byte, so a lookup of any number of sites
+    is a vectorized index operation. The cube doubles its edge whenever a
+    site outside of it is occupied; sites outside the cube are free. The
+    index of the electrode on every occupied site is kept in a dictionary,
+    which is read only when an ion binds.
+
+    Attributes:
+        edge (int): Number of sites along an edge of the cube, a multiple of 16.
+    """
+    def __init__(self, edge: int = 64) -> None:
+        """
+        Initialize an empty grid.
+
+        Args:
+            edge (int): Initial number of sites along an edge of the cube, a multiple of 16.
+        """
+        self.edge = edge
+        self._bits = np.zeros((edge, edge, edge // 8), dtype=np.uint8)
+        self._indices = {}
+
+    def __len__(self) -> int:
+        """Number of occupied sites."""
+        return len(self._indices)
+
+    def contains(self, sites: np.ndarray) -> np.ndarray:
+        """
+        Check whether sites are occupied.
+
+        Args:
+            sites (np.ndarray): Integer site coordinates, shape (n, 3).
+
+        Returns:
+            np.ndarray: Whether each site is occupied, shape (n,).
+        """
+        shifted = sites + self.edge // 2
+        inside = np.all((shifted >= 0) & (shifted < self.edge), axis=1)
+        occupied = np.zeros(len(sites), dtype=bool)
+        shifted = shifted[inside]
+        occupied[inside] = (self._bits[shifted[:, 0], shifted[:, 1], shifted[:, 2] >> 3] >> (shifted[:, 2] & 7)) & 1 == 1
+        return occupied
+
+    def add(self, site: tuple, index: int) -> None:
+        """
+        Occupy a site.
+
+        Args:
+            site (tuple): Integer site coordinates (i, j, k).
+            index (int): Index of the electrode on the site (-1 for a particle bound to an electrode surface).
+        """
+        while any(not -self.edge // 2 <= coordinate < self.edge // 2 for coordinate in site):
+            self._grow()
+        x, y, z = (coordinate + self.edge // 2 for coordinate in site)
+        self._bits[x, y, z >> 3] |= np.uint8(1 << (z & 7))
+        self._indices[tuple(site)] = index
+
+    def index_at(self, site: tuple) -> int:
+        """
+        Index of the electrode on an occupied site.
+
+        Args:
+            site (tuple): Integer site coordinates (i, j, k).
+
+        Returns:
+            int: Electrode index.
+        """
+        return self._indices[tuple(site)]
+
+    def _grow(self) -> None:
+        """
+        Double the edge of the cube, keeping it centered at the origin.
+        """
+        quarter = self.edge // 2
+        bits = np.zeros((2 * self.edge, 2 * self.edge, self.edge // 4), dtype=np.uint8)
+        bits[quarter:quarter + self.edge, quarter:quarter + self.edge, quarter // 8:(quarter + self.edge) // 8] = self._bits
+        self._bits = bits
+        self.edge *= 2
@@ -0,0 +1,144 @@
+import json
+import os
+
+import numpy as np
+
+from storage.direction_codec import DirectionCodec
+
+
+class TrajectoryReader ():
+    """
+    Lazy reader of trajectories written by TrajectoryWriter.
+
+    Chunk files are memory-mapped when first needed, and positions are
+    reconstructed only for the requested particle or frame: a particle reads
+    its own segment of every chunk it reaches, a frame decodes the single chunk
+    holding it. In the reference and threaded engines, frame k of a free ion
+    is its position after sweep k.
+
+    Attributes:
+        directory (str): Directory of the trajectory files.
+        step (float): Length of a single step.
+        chunk_frames (int): Number of frames in one chunk.
+        lengths (np.ndarray): Number of frames of every particle.
+    """
+    def __init__(self, directory: str) -> None:
+        """
+        Open written trajectories.
+
+        Args:
+            directory (str): Directory of the trajectory files.
+        """
+        with open(os.path.join(directory, "trajectory.json"), encoding="utf-8") as file:
+            meta = json.load(file)
+        self.directory = directory
+        self.step = meta["step"]
+        self.chunk_frames = meta["chunk_frames"]
+        self.lengths = np.load(os.path.join(directory, "lengths.npy"))
+        self._chunks = [None] * meta["chunks"]
+
+    def __len__(self) -> int:
+        """Number of particles."""
+        return len(self.lengths)
+
+    def trajectory(self, particle: int) -> np.ndarray:
+        """
+        Reconstruct all positions of one particle.
+
+        Args:
+            particle (int): Index of the particle.
+
+        Returns:
+            np.ndarray: Positions in frame order, shape (frames, 3).
+        """
+        segments = []
+        for chunk in range(-(-int(self.lengths[particle]) // self.chunk_frames)):
+            data = self._chunk(chunk)
+            row = int(np.searchsorted(data["particles"], particle))
+            segments.append(self._decode(data, row, row + 1))
+        return np.concatenate(segments) if segments else np.zeros((0, 3))
+
+    def frame(self, frame: int) -> tuple:
+        """
+        Reconstruct the positions of all particles that reach a frame.
+
+        Args:
+            frame (int): Index of the frame.
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray) - indices of the particles and their positions, shape (n, 3).
+        """
+        chunk, offset = divmod(frame, self.chunk_frames)
+        if chunk >= len(self._chunks):
+            return np.zeros(0, dtype=np.int64), np.zeros((0, 3))
+        data = self._chunk(chunk)
+        positions = self._decode(data, 0, len(data["particles"]))
+        reaching = self.lengths[data["particles"]] > frame
+        return np.asarray(data["particles"][reaching]), positions[data["frame_offsets"][:-1][reaching] + offset]
+
+    def position(self, particle: int, frame: int) -> np.ndarray:
+        """
+        Reconstruct the position of one particle in one frame.
+
+        Args:
+            particle (int): Index of the particle.
+            frame (int): Index of the frame, below the number of frames of the particle.
+
+        Returns:
+            np.ndarray: Position [x, y, z].
+        """
+        chunk, offset = divmod(frame, self.chunk_frames)
+        data = self._chunk(chunk)
+        row = int(np.searchsorted(data["particles"], particle))
+        return self._decode(data, row, row + 1)[offset]
+
+    def _chunk(self, chunk: int) -> dict:
+        """
+        Memory-map the files of a chunk on first use.
+
+        Args:
+            chunk (int): Number of the chunk.
+
+        Returns:
+            dict: Arrays of the chunk by name.
+        """
+        if self._chunks[chunk] is None:
+            names = ("particles", "keyframes", "frame_offsets", "escape_offsets", "codes", "escapes")
+            self._chunks[chunk] = {
+                name: np.load(os.path.join(self.directory, f"{name}_{chunk:05d}.npy"), mmap_mode="r") for name in names
+            }
+        return self._chunks[chunk]
+
+    def _decode(self, data: dict, first: int, last: int) -> np.ndarray:
+        """
+        Reconstruct the frames of consecutive particles of a chunk.
+
+        A frame is the last exact position (keyframe or escape) plus the sum of
+        the quantized steps since then.
+
+        Args:
+            data (dict): Arrays of the chunk.
+            first (int): First row of the decoded particles in the chunk.
+            last (int): Row after the last decoded particle.
+
+        Returns:
+            np.ndarray: Positions of the particles one after another, shape (frames, 3).
+        """
+        frame_offsets = np.asarray(data["frame_offsets"][first:last + 1])
+        total = int(frame_offsets[-1] - frame_offsets[0])
+        starts = frame_offsets[:-1] - frame_offsets[0]
+        codes = np.asarray(data["codes"][frame_offsets[0] - first:frame_offsets[-1] - last])
+        escapes = np.asarray(data["escapes"][data["escape_offsets"][first]:data["escape_offsets"][last]])
+        code_rows = np.flatnonzero(~np.isin(np.arange(total), starts))
+        escaped = DirectionCodec.is_escape(codes)
+        shifts = np.zeros((total, 3))
+        shifts[code_rows[~escaped]] = DirectionCodec.decode(codes[~escaped]) * self.step
+        exact = np.zeros((total, 3))
+        exact[starts] = data["keyframes"][first:last]
+        exact[code_rows[escaped]] = escapes
+        is_exact = np.zeros(total, dtype=bool)
+        is_exact[starts] = True
+        is_exact[code_rows[escaped]] = True
+        last_exact = np.maximum.accumulate(np.where(is_exact, np.arange(total), 0))
+        cumulative = np.cumsum(shifts, axis=0)
+        return exact[last_exact] + cumulative - cumulative[last_exact]
@@ -0,0 +1,141 @@
+import json
+import os
+
+import numpy as np
+
+import config
+from storage.direction_codec import DirectionCodec
+
+
+class TrajectoryWriter ():
+    """
+    Compact storage of particle trajectories whose moves are steps of a fixed length.
+
+    The frames of every particle are split into chunks of chunk_frames frames.
+    The first frame of a particle in a chunk is stored exactly (float64
+    keyframe); every further frame is stored as the direction of a step of the
+    given length, quantized by DirectionCodec into two bytes. Directions are
+    taken from the reconstructed instead of the true previous position, so
+    quantization errors do not add up along the trajectory. A displacement
+    whose length differs from the step by more than TRAJECTORY_STEP_TOLERANCE
+    (e.g. the final move onto the dendrimer, or a batch of end-phase steps)
+    is stored as an escape code followed by the exact position. A frame
+    costs about two bytes instead of 24 bytes of three float64 values.
+
+    Every chunk is a set of .npy files: the ids of its particles, their
+    keyframes, the offsets of their frames and escapes, the codes and the
+    escape positions. Together with the frame count of every particle, this
+    gives random access to any particle and any frame. Files are read by
+    TrajectoryReader.
+
+    Attributes:
+        directory (str): Directory of the trajectory files.
+        step (float): Length of a single step.
+        chunk_frames (int): Number of frames in one chunk.
+    """
+    GROUP_SIZE = 1024 # particles encoded at once, bounding the memory of a chunk
+
+    def __init__(self, directory: str, step: float, chunk_frames: int = config.TRAJECTORY_CHUNK_FRAMES) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            directory (str): Directory of the trajectory files, created if missing.
+            step (float): Length of a single step.
+            chunk_frames (int): Number of frames in one chunk.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.step = step
+        self.chunk_frames = chunk_frames
+
+    def write(self, trajectories: list) -> None:
+        """
+        Write the trajectories of all particles.
+
+        Args:
+            trajectories (list): Positions of every particle in frame order, e.g. the positions_list
+                of every atom; particle i is the i-th trajectory.
+        """
+        lengths = np.array([len(trajectory) for trajectory in trajectories], dtype=np.int64)
+        chunks = int(-(-lengths.max() // self.chunk_frames)) if len(lengths) > 0 else 0
+        for chunk in range(chunks):
+            self._write_chunk(chunk, trajectories, lengths)
+        np.save(os.path.join(self.directory, "lengths.npy"), lengths)
+        meta = {"particles": len(lengths), "chunks": chunks, "chunk_frames": self.chunk_frames, "step": self.step}
+        with open(os.path.join(self.directory, "trajectory.json"), "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+
+    def _write_chunk(self, chunk: int, trajectories: list, lengths: np.ndarray) -> None:
+        """
+        Encode and write the frames of one chunk of all particles that reach it.
+
+        Args:
+            chunk (int): Number of the chunk.
+            trajectories (list): Positions of every particle in frame order.
+            lengths (np.ndarray): Number of frames of every particle.
+        """
+        start = chunk * self.chunk_frames
+        particles = np.flatnonzero(lengths > start)
+        frames = np.minimum(lengths[particles] - start, self.chunk_frames)
+        keyframes, codes, escapes, escape_counts = [], [], [], []
+        for group in range(0, len(particles), self.GROUP_SIZE):
+            group_particles = particles[group:group + self.GROUP_SIZE]
+            group_frames = frames[group:group + self.GROUP_SIZE]
+            block = np.zeros((len(group_particles), self.chunk_frames, 3))
+            for row, (particle, count) in enumerate(zip(group_particles, group_frames)):
+                block[row, :count] = np.asarray(trajectories[particle][start:start + count], dtype=np.float64).reshape(-1, 3)
+            group_codes, group_escape = self._encode(block, group_frames)
+            in_chunk = np.arange(self.chunk_frames - 1) < (group_frames - 1)[:, None]
+            keyframes.append(block[:, 0])
+            codes.append(group_codes[in_chunk])
+            escapes.append(block[:, 1:][in_chunk & group_escape])
+            escape_counts.append(np.sum(in_chunk & group_escape, axis=1))
+        self._save(chunk, "particles", particles)
+        self._save(chunk, "keyframes", np.concatenate(keyframes))
+        self._save(chunk, "frame_offsets", np.concatenate([[0], np.cumsum(frames)]).astype(np.int64))
+        self._save(chunk, "escape_offsets", np.concatenate([[0], np.cumsum(np.concatenate(escape_counts))]).astype(np.int64))
+        self._save(chunk, "codes", np.concatenate(codes).reshape(-1, 2))
+        self._save(chunk, "escapes", np.concatenate(escapes).reshape(-1, 3))
+
+    def _encode(self, block: np.ndarray, frames: np.ndarray) -> tuple:
+        """
+        Quantize the moves of a group of particles frame by frame.
+
+        Args:
+            block (np.ndarray): Positions of the group in the chunk, shape (particles, chunk_frames, 3).
+            frames (np.ndarray): Number of frames of every particle in the chunk.
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray) - codes of frames 1 to chunk_frames - 1,
+                shape (particles, chunk_frames - 1, 2), and whether each of them is an escape.
+        """
+        reconstructed = block[:, 0].copy()
+        codes = np.zeros((len(block), self.chunk_frames - 1, 2), dtype=np.int8)
+        escape = np.zeros((len(block), self.chunk_frames - 1), dtype=bool)
+        for frame in range(1, self.chunk_frames):
+            moving = frame < frames
+            if not np.any(moving):
+                break
+            shift = block[:, frame] - reconstructed
+            length = np.linalg.norm(shift, axis=1)
+            stepped = moving & (np.abs(length - self.step) <= config.TRAJECTORY_STEP_TOLERANCE * self.step)
+            stepped_codes = DirectionCodec.encode(shift[stepped] / length[stepped, None])
+            codes[stepped, frame - 1] = stepped_codes
+            reconstructed[stepped] += DirectionCodec.decode(stepped_codes) * self.step
+            jumped = moving & ~stepped
+            codes[jumped, frame - 1] = DirectionCodec.ESCAPE
+            escape[jumped, frame - 1] = True
+            reconstructed[jumped] = block[jumped, frame]
+        return codes, escape
+
+    def _save(self, chunk: int, name: str, array: np.ndarray) -> None:
+        """
+        Write one array of a chunk.
+
+        Args:
+            chunk (int): Number of the chunk.
+            name (str): Stored quantity.
+            array (np.ndarray): Stored values.
+        """
+        np.save(os.path.join(self.directory, f"{name}_{chunk:05d}.npy"), array)
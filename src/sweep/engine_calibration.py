@@ -0,0 +1,247 @@
+import json
+import os
+import platform
+from typing import Callable
+
+import numpy as np
+
+import config
+from engine_type import EngineType
+from layout.layout import Layout
+from simulation_params import SimulationParams
+from update_order_type import UpdateOrderType
+from sweep.runtime_model import RuntimeModel
+
+
+class EngineCalibration ():
+    """
+    Choice of the fastest engine for a layout and number of atoms on this machine.
+
+    The off-lattice engines of CALIBRATION_ENGINES differ in their
+    nearest-electrode search: the reference engine scans per-ion neighbour
+    lists, the threaded engine runs a vectorized kernel on a thread pool and
+    the out-of-core engine looks up a cell index. Small systems are fastest
+    with the plain scan, large ones with the kernel or the index. The engines
+    do not support the same dynamics, though: the threaded engine always
+    advances ions synchronously and the out-of-core engine has no end phase.
+    Only the engines that honour the parameters of the simulation are
+    candidates, so the dynamics do not change with N within a sweep; with the
+    default sequential update order and end phase, this is the reference
+    engine alone. For every layout, parameters and set of candidates, each
+    candidate simulates CALIBRATION_ATOMS from the same seed,
+    and the fastest of CALIBRATION_REPEATS runs is kept. An engine slower than
+    CALIBRATION_DROP_FACTOR times the fastest one is not measured at larger N
+    and is never chosen there. Between the measured N, the timings of an
+    engine are interpolated in log-log space; beyond them, they follow a
+    RuntimeModel through the two largest N. The fastest engine for every N up
+    to CALIBRATION_MAX_ATOMS is stored as crossover points: the smallest N
+    from which an engine is the fastest.
+
+    Timings and crossovers are cached in a JSON file, one entry per layout,
+    parameters and candidates, which is measured the first time it is needed. The cache is discarded when
+    it was written on another machine or for another number of threads. The
+    global random state is restored after measuring, so a seeded sweep gets
+    the same dendrimers with and without calibration.
+
+    Attributes:
+        params (SimulationParams): Parameters of the calibrated simulations.
+        engines (list[EngineType]): Candidate engines honouring the parameters.
+        path (str): Path of the cache file.
+        threads (int): Number of threads of the threaded engine.
+    """
+    def __init__(self, benchmark: Callable[[Layout, int, EngineType], float], params: SimulationParams,
+                 threads: int = config.THREADS_DEFAULT, path: str = config.CALIBRATION_FILE) -> None:
+        """
+        Initialize the calibration.
+
+        Args:
+            benchmark (Callable[[Layout, int, EngineType], float]): Runs a simulation of a layout, number
+                of atoms and engine with the parameters and returns its calculation time in seconds.
+            params (SimulationParams): Parameters of the calibrated simulations.
+            threads (int): Number of threads of the threaded engine.
+            path (str): Path of the cache file.
+        """
+        self.benchmark = benchmark
+        self.params = params
+        self.engines = self.engines_for(params)
+        self.threads = threads
+        self.path = path
+
+    @staticmethod
+    def engines_for(params: SimulationParams) -> list[EngineType]:
+        """
+        Engines of CALIBRATION_ENGINES that simulate the dynamics the parameters ask for.
+
+        Args:
+            params (SimulationParams): Parameters of the simulation.
+
+        Returns:
+            list[EngineType]: Candidate engines, always including the reference engine.
+        """
+        engines = []
+        for engine in config.CALIBRATION_ENGINES:
+            if engine == EngineType.THREADED and params.update_order != UpdateOrderType.SYNCHRONOUS:
+                continue
+            if engine == EngineType.OUT_OF_CORE and params.end_phase_threshold > 0:
+                continue
+            engines.append(engine)
+        return engines
+
+    def select(self, layout: Layout, atoms: int) -> EngineType:
+        """
+        Fastest engine for a simulation, measuring the layout first if it is not cached.
+
+        Args:
+            layout (Layout): Starting layout of free ions.
+            atoms (int): Number of atoms in the simulation.
+
+        Returns:
+            EngineType: Fastest engine.
+        """
+        engine = self.engines[0]
+        for first_atoms, crossover_engine in self.crossovers(layout):
+            if atoms >= first_atoms:
+                engine = crossover_engine
+        return engine
+
+    def crossovers(self, layout: Layout, refresh: bool = False) -> list[tuple[int, EngineType]]:
+        """
+        Crossover points of a layout, measuring the layout first if it is not cached and there is more than one candidate.
+
+        Args:
+            layout (Layout): Starting layout of free ions.
+            refresh (bool): Whether to measure the layout again even if it is cached.
+
+        Returns:
+            list[tuple[int, EngineType]]: Smallest number of atoms from which each engine is the fastest, ascending.
+        """
+        if len(self.engines) == 1:
+            return [(1, self.engines[0])]
+        cache = self._load()
+        key = self._key(layout)
+        if refresh or key not in cache["entries"]:
+            cache["entries"][key] = self.calibrate(layout)
+            self._save(cache)
+        return [(atoms, EngineType(engine)) for atoms, engine in cache["entries"][key]["crossovers"]]
+
+    def calibrate(self, layout: Layout) -> dict:
+        """
+        Measure all candidate engines on a layout.
+
+        Args:
+            layout (Layout): Starting layout of free ions.
+
+        Returns:
+            dict: Timings [[atoms, seconds], ...] of every engine and the crossover points.
+        """
+        print(f"Calibrating engines for the {layout.value} layout")
+        state = np.random.get_state()
+        timings = {engine.value: [] for engine in self.engines}
+        measured = list(self.engines)
+        try:
+            for atoms in config.CALIBRATION_ATOMS:
+                durations = {engine: self._measure(layout, atoms, engine) for engine in measured}
+                fastest = min(durations.values())
+                for engine, duration in durations.items():
+                    timings[engine.value].append([atoms, duration])
+                measured = [engine for engine in measured if durations[engine] <= config.CALIBRATION_DROP_FACTOR * fastest]
+        finally:
+            np.random.set_state(state)
+        return {"timings": timings, "crossovers": self._crossovers(timings)}
+
+    def _measure(self, layout: Layout, atoms: int, engine: EngineType) -> float:
+        """
+        Shortest calculation time of repeated simulations from the same seed.
+
+        Args:
+            layout (Layout): Starting layout of free ions.
+            atoms (int): Number of atoms in the simulation.
+            engine (EngineType): Measured engine.
+
+        Returns:
+            float: Calculation time in seconds.
+        """
+        durations = []
+        for _ in range(config.CALIBRATION_REPEATS):
+            np.random.seed(config.CALIBRATION_SEED)
+            durations.append(self.benchmark(layout, atoms, engine))
+        return min(durations)
+
+    def _crossovers(self, timings: dict) -> list[list]:
+        """
+        Find the fastest engine for every N from the timings.
+
+        Args:
+            timings (dict): Timings [[atoms, seconds], ...] of every engine.
+
+        Returns:
+            list[list]: [atoms, engine] pairs of the smallest number of atoms from which each engine is the fastest.
+        """
+        engines = list(timings)
+        atoms = np.unique(np.rint(np.geomspace(1, config.CALIBRATION_MAX_ATOMS, 1000)).astype(np.int64))
+        predicted = np.full((len(engines), len(atoms)), np.inf)
+        for row, engine in enumerate(engines):
+            if len(timings[engine]) == 0:
+                continue
+            measured_atoms = np.array([n for n, _ in timings[engine]], dtype=np.float64)
+            durations = np.array([duration for _, duration in timings[engine]])
+            predicted[row] = np.exp(np.interp(np.log(atoms), np.log(measured_atoms), np.log(durations)))
+            beyond = atoms > measured_atoms[-1]
+            if measured_atoms[-1] < max(config.CALIBRATION_ATOMS):
+                predicted[row, beyond] = np.inf
+            else:
+                predicted[row, beyond] = RuntimeModel(timings[engine][-2:]).predict(atoms[beyond])
+        fastest = np.argmin(predicted, axis=0)
+        changes = np.flatnonzero(np.diff(fastest, prepend=-1))
+        return [[int(atoms[i]), engines[fastest[i]]] for i in changes]
+
+    def _load(self) -> dict:
+        """
+        Read the cache file, or start an empty cache if it is missing or belongs to another machine.
+
+        Returns:
+            dict: Cache with the machine description and the measured entries.
+        """
+        machine = self._machine()
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as file:
+                cache = json.load(file)
+            if cache.get("machine") == machine and "entries" in cache:
+                return cache
+        return {"machine": machine, "entries": {}}
+
+    def _save(self, cache: dict) -> None:
+        """
+        Write the cache file, replacing it at once so that concurrent readers never see a partial file.
+
+        Args:
+            cache (dict): Cache with the machine description and the measured entries.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(cache, file, indent=2)
+        os.replace(temporary, self.path)
+
+    def _key(self, layout: Layout) -> str:
+        """
+        Cache key of a layout with the parameters and candidates of this calibration.
+
+        Args:
+            layout (Layout): Starting layout of free ions.
+
+        Returns:
+            str: Key of the cache entry.
+        """
+        return json.dumps({"layout": layout.value, "params": self.params.to_dict(),
+                           "engines": [engine.value for engine in self.engines]}, sort_keys=True)
+
+    def _machine(self) -> dict:
+        """
+        Description of the machine the timings are valid for.
+
+        Returns:
+            dict: Host name, processor, number of cores and number of threads.
+        """
+        return {"host": platform.node(), "processor": platform.machine(), "cpus": os.cpu_count(), "threads": self.threads}
@@ -0,0 +1,46 @@
+import numpy as np
+
+import config
+
+
+class RuntimeModel():
+    """
+    Power-law model of simulation runtime, t = scale * N^exponent.
+
+    The model is fitted in log-log space to past run timings of a single
+    layout and engine. With timings for fewer than two distinct N, the
+    exponent falls back to SCHEDULER_DEFAULT_EXPONENT.
+
+    Attributes:
+        scale (float): Runtime of a simulation with one atom in seconds.
+        exponent (float): Growth exponent of the runtime with N.
+    """
+    def __init__(self, timings: list[tuple[int, float]]) -> None:
+        """
+        Fit the model to past run timings.
+
+        Args:
+            timings (list[tuple[int, float]]): Number of atoms and duration in seconds of past runs.
+        """
+        timings = [(atoms, duration) for atoms, duration in timings if atoms > 0 and duration > 0]
+        atoms = np.array([x[0] for x in timings], dtype=np.float64)
+        durations = np.array([x[1] for x in timings], dtype=np.float64)
+        self.exponent = config.SCHEDULER_DEFAULT_EXPONENT
+        self.scale = config.SCHEDULER_DEFAULT_SCALE
+        if len(np.unique(atoms)) >= 2:
+            self.exponent, log_scale = np.polyfit(np.log(atoms), np.log(durations), 1)
+            self.scale = np.exp(log_scale)
+        elif len(atoms) > 0:
+            self.scale = np.exp(np.mean(np.log(durations) - self.exponent * np.log(atoms)))
+
+    def predict(self, atoms: int | np.ndarray) -> float | np.ndarray:
+        """
+        Predict the runtime of a simulation.
+
+        Args:
+            atoms (int | np.ndarray): Number of atoms in the simulation.
+
+        Returns:
+            float | np.ndarray: Predicted runtime in seconds.
+        """
+        return self.scale * np.power(atoms, self.exponent)
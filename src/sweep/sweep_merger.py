@@ -0,0 +1,81 @@
+from DI_container import injector
+from database.db_connect import session_scope
+from layout.layout import Layout
+from engine_type import EngineType
+from simulation_params import SimulationParams
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from precision_type import PrecisionType
+from sweep.work_queue import WorkQueue
+from database.services.gyration_ratio_service import GyrationRatioService
+from database.services.simulation_run_service import SimulationRunService
+
+
+class SweepMerger():
+    """
+    Load finished work queue results into the database.
+    """
+    def __init__(self, queue: WorkQueue) -> None:
+        """
+        Initialize the merger.
+
+        Args:
+            queue (WorkQueue): Shared work queue.
+        """
+        self._queue = queue
+        self._gyratio_ratio_service = injector.get(GyrationRatioService)
+        self._simulation_run_service = injector.get(SimulationRunService)
+
+    def merge(self) -> int:
+        """
+        Store all results that were not merged yet.
+
+        Every result is written in its own unit of work and marked as merged
+        only after it was saved, so results of a failed merge are merged again
+        by the next one.
+
+        Returns:
+            int: Number of merged results.
+        """
+        results = self._queue.unmerged_results()
+        for name, result in results:
+            with session_scope():
+                self._save_result(result)
+            self._queue.mark_merged(name)
+        return len(results)
+
+    def _save_result(self, result: dict) -> None:
+        """
+        Save a single result through the gyration ratio and simulation run services.
+
+        The per-N gyration ratio holds off-lattice runs on a point electrode only.
+
+        Args:
+            result (dict): Result written by a sweep worker.
+        """
+        layout = Layout(result["layout"])
+        engine = EngineType(result.get("engine", EngineType.REFERENCE.value))
+        electrode_type = ElectrodeGeometryType(result.get("electrode", ElectrodeGeometryType.POINT.value))
+        gyration_radius = result["gyration_radius"]
+        if engine.model == EngineType.REFERENCE.model and electrode_type == ElectrodeGeometryType.POINT:
+            self._gyratio_ratio_service.add_or_update_gyration_ratio(
+                atoms = result["atoms"],
+                cube_gr = gyration_radius if layout == Layout.CUBE else None,
+                sphere_gr = gyration_radius if layout == Layout.SPHERE else None,
+                random_gr = gyration_radius if layout == Layout.RANDOM else None,
+            )
+        self._simulation_run_service.add_simulation_run(
+            atoms = result["atoms"],
+            layout = layout,
+            gyration_radius = gyration_radius,
+            max_generation = result["max_generation"],
+            leaf_count = result["leaf_count"],
+            branch_point_count = result["branch_point_count"],
+            longest_path = result["longest_path"],
+            mean_subtree_size = result["mean_subtree_size"],
+            generation_histogram = result["generation_histogram"],
+            engine = engine,
+            duration = result.get("duration"),
+            params = SimulationParams.from_dict(result.get("params", {})),
+            electrode_type = electrode_type,
+            precision = PrecisionType(result.get("precision", PrecisionType.FLOAT64.value)),
+        )
@@ -0,0 +1,134 @@
+import heapq
+
+import numpy as np
+
+from sweep.runtime_model import RuntimeModel
+
+
+class SweepScheduler():
+    """
+    Plan the simulations of a sweep from a runtime model.
+
+    Jobs are ordered longest first, so workers that pick jobs in order form a
+    longest-processing-time schedule and short jobs fill the gaps around the
+    long ones. With a wall-clock budget, the scheduler chooses how many
+    replicates of each N fit into it.
+
+    Attributes:
+        model (RuntimeModel): Runtime model of the layout and engine.
+        workers (int): Number of parallel workers.
+        budget (float | None): Wall-clock budget of the whole sweep in seconds.
+        makespan (float): Predicted wall-clock time of the last planned sweep.
+        replicates (dict): Planned number of replicates for each N.
+    """
+    def __init__(self, model: RuntimeModel, workers: int, budget: float | None = None) -> None:
+        """
+        Initialize the scheduler.
+
+        Args:
+            model (RuntimeModel): Runtime model of the layout and engine.
+            workers (int): Number of parallel workers.
+            budget (float | None): Wall-clock budget of the whole sweep in seconds, unlimited if None.
+        """
+        self.model = model
+        self.workers = max(workers, 1)
+        self.budget = budget
+        self.makespan = 0.0
+        self.replicates = {}
+
+    def plan(self, atom_numbers: list[int], max_replicates: int) -> list[int]:
+        """
+        Plan the jobs of a sweep.
+
+        Without a budget every N gets max_replicates runs. With a budget, the
+        largest uniform number of replicates that fits is chosen first, and
+        the remaining time is filled with extra replicates, cheapest N first.
+
+        Args:
+            atom_numbers (list[int]): Atom counts of the sweep.
+            max_replicates (int): Largest number of replicates for each N.
+
+        Returns:
+            list[int]: Atom count of every job, longest job first.
+        """
+        atom_numbers = sorted(set(atom_numbers))
+        if self.budget is None:
+            replicates = {atoms: max_replicates for atoms in atom_numbers}
+        else:
+            replicates = self._fit_replicates(atom_numbers, max_replicates)
+        jobs = self._jobs(replicates)
+        self.replicates = replicates
+        self.makespan = self.predict_makespan(jobs)
+        return jobs
+
+    def predict_makespan(self, jobs: list[int]) -> float:
+        """
+        Predict the wall-clock time of jobs processed longest first by the workers.
+
+        Args:
+            jobs (list[int]): Atom count of every job.
+
+        Returns:
+            float: Predicted time in seconds until the last job finishes.
+        """
+        loads = [0.0] * self.workers
+        for duration in sorted(self.model.predict(np.array(jobs, dtype=np.float64)), reverse=True):
+            heapq.heappush(loads, heapq.heappop(loads) + duration)
+        return max(loads)
+
+    def _fit_replicates(self, atom_numbers: list[int], max_replicates: int) -> dict:
+        """
+        Choose the number of replicates of each N that fits into the budget.
+
+        Args:
+            atom_numbers (list[int]): Sorted distinct atom counts of the sweep.
+            max_replicates (int): Largest number of replicates for each N.
+
+        Returns:
+            dict: Number of replicates for each N.
+        """
+        low, high = 0, max_replicates
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._fits({atoms: middle for atoms in atom_numbers}):
+                low = middle
+            else:
+                high = middle - 1
+        replicates = {atoms: low for atoms in atom_numbers}
+        added = True
+        while added:
+            added = False
+            for atoms in atom_numbers:
+                if replicates[atoms] >= max_replicates:
+                    continue
+                replicates[atoms] += 1
+                if self._fits(replicates):
+                    added = True
+                else:
+                    replicates[atoms] -= 1
+        return replicates
+
+    def _fits(self, replicates: dict) -> bool:
+        """
+        Check whether a number of replicates for each N fits into the budget.
+
+        Args:
+            replicates (dict): Number of replicates for each N.
+
+        Returns:
+            bool: True if the predicted makespan does not exceed the budget.
+        """
+        return self.predict_makespan(self._jobs(replicates)) <= self.budget
+
+    def _jobs(self, replicates: dict) -> list[int]:
+        """
+        Expand replicate counts into a job list ordered longest first.
+
+        Args:
+            replicates (dict): Number of replicates for each N.
+
+        Returns:
+            list[int]: Atom count of every job.
+        """
+        jobs = [atoms for atoms, count in replicates.items() for _ in range(count)]
+        return sorted(jobs, key=lambda atoms: self.model.predict(atoms), reverse=True)
@@ -0,0 +1,91 @@
+import os
+import socket
+
+import numpy as np
+
+import config
+
+from layout.layout import Layout
+from engine_type import EngineType
+from simulation_params import SimulationParams
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from precision_type import PrecisionType
+from simulation import Simulation
+from sweep.work_queue import WorkQueue
+from telemetry.progress_reporter import ProgressReporter
+
+
+class SweepWorker():
+    """
+    Worker that claims simulation items from a work queue until it is empty.
+
+    Results are written as files into the queue directory, so workers do not
+    need access to the database.
+    """
+    def __init__(self, queue: WorkQueue, reporter: ProgressReporter | None = None,
+                 threads: int = config.THREADS_DEFAULT) -> None:
+        """
+        Initialize the worker.
+
+        Args:
+            queue (WorkQueue): Shared work queue.
+            reporter (ProgressReporter | None): Receiver of progress events, None to run silently.
+            threads (int): Number of threads of the threaded engine.
+        """
+        self._queue = queue
+        self._reporter = reporter
+        self._threads = threads
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+
+    def run(self) -> int:
+        """
+        Process work items until no pending item is left.
+
+        Returns:
+            int: Number of processed items.
+        """
+        processed = 0
+        while True:
+            item = self._queue.claim(self.worker_id)
+            if item is None:
+                return processed
+            self._queue.complete(item, self._simulate(item))
+            processed += 1
+
+    def _simulate(self, item: dict) -> dict:
+        """
+        Run a single simulation described by a work item.
+
+        Args:
+            item (dict): Work item with layout, engine, atoms, seed, simulation parameters, electrode shape and precision.
+
+        Returns:
+            dict: Result with the gyration radius and the dendrimer topology, recording the engine and
+                parameters the simulation actually ran with (the auto engine resolved to a concrete one).
+        """
+        np.random.seed(item["seed"])
+        params = SimulationParams.from_dict(item.get("params", {}))
+        electrode_type = ElectrodeGeometryType(item.get("electrode", ElectrodeGeometryType.POINT.value))
+        precision = PrecisionType(item.get("precision", PrecisionType.FLOAT64.value))
+        sim = Simulation(Layout(item["layout"]), item["atoms"], EngineType(item["engine"]), params, electrode_type,
+                         precision, save_to_db=False, reporter=self._reporter, threads=self._threads)
+        topology = sim.topology
+        sim.release_storage()
+        return {
+            "layout": item["layout"],
+            "engine": sim.engine.value,
+            "atoms": item["atoms"],
+            "seed": item["seed"],
+            "worker": self.worker_id,
+            "duration": sim.duration,
+            "params": sim.params.to_dict(),
+            "electrode": electrode_type.value,
+            "precision": precision.value,
+            "gyration_radius": sim.get_radius_of_gyration(),
+            "max_generation": topology.max_generation,
+            "leaf_count": topology.leaf_count,
+            "branch_point_count": topology.branch_point_count,
+            "longest_path": topology.longest_path,
+            "mean_subtree_size": topology.mean_subtree_size,
+            "generation_histogram": topology.generation_histogram.tolist(),
+        }
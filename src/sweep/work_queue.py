@@ -0,0 +1,171 @@
+import json
+import os
+import time
+
+
+class WorkQueue():
+    """
+    Work queue of simulation items stored in a shared directory.
+
+    Items move between subdirectories by renaming, which is atomic on a
+    single file system, so any number of workers on any number of nodes can
+    claim items from the same directory without further locking. A claim is
+    touched when it is taken, so its modification time is the claim time.
+
+    Attributes:
+        directory (str): Root directory of the queue.
+    """
+    PENDING = "pending"
+    CLAIMED = "claimed"
+    RESULTS = "results"
+    MERGED = "merged"
+
+    def __init__(self, directory: str) -> None:
+        """
+        Initialize the queue and create its subdirectories.
+
+        Args:
+            directory (str): Root directory of the queue.
+        """
+        self.directory = directory
+        for subdir in (self.PENDING, self.CLAIMED, self.RESULTS, self.MERGED):
+            os.makedirs(self._path(subdir), exist_ok=True)
+
+    def enqueue(self, items: list[dict]) -> None:
+        """
+        Write work items into the pending directory.
+
+        Items are claimed in the order they are given.
+
+        Args:
+            items (list[dict]): JSON-serializable work items.
+        """
+        first = sum(len(os.listdir(self._path(subdir)))
+                    for subdir in (self.PENDING, self.CLAIMED, self.RESULTS, self.MERGED))
+        for i, item in enumerate(items):
+            name = f"{first + i:08d}.json"
+            self._write_json(self._path(self.PENDING, name), item)
+
+    def claim(self, worker_id: str) -> dict | None:
+        """
+        Atomically claim the first pending work item.
+
+        Args:
+            worker_id (str): Identifier of the claiming worker.
+
+        Returns:
+            dict | None: Claimed item with its queue name under "name", None if the queue is empty.
+        """
+        for name in sorted(os.listdir(self._path(self.PENDING))):
+            if not name.endswith(".json"):
+                continue
+            claimed_path = self._path(self.CLAIMED, f"{name[:-5]}.{worker_id}.json")
+            try:
+                os.rename(self._path(self.PENDING, name), claimed_path)
+            except FileNotFoundError:
+                continue
+            os.utime(claimed_path)
+            with open(claimed_path, encoding="utf-8") as file:
+                item = json.load(file)
+            item["name"] = name
+            item["claim"] = os.path.basename(claimed_path)
+            return item
+        return None
+
+    def complete(self, item: dict, result: dict) -> None:
+        """
+        Write the result of a claimed item and release its claim.
+
+        If the claim was released as stale in the meantime, the item returned
+        to the pending directory is withdrawn when it was not claimed again.
+
+        Args:
+            item (dict): Item returned by claim().
+            result (dict): JSON-serializable result of the item.
+        """
+        self._write_json(self._path(self.RESULTS, item["name"]), result)
+        try:
+            os.remove(self._path(self.CLAIMED, item["claim"]))
+        except FileNotFoundError:
+            try:
+                os.remove(self._path(self.PENDING, item["name"]))
+            except FileNotFoundError:
+                pass
+
+    def release_stale(self, max_age: float) -> int:
+        """
+        Return claims older than max_age seconds to the pending directory.
+
+        Used to recover items of workers that died before completing them.
+
+        Args:
+            max_age (float): Age of a claim in seconds after which it is considered lost.
+
+        Returns:
+            int: Number of released items.
+        """
+        released = 0
+        now = time.time()
+        for claim in os.listdir(self._path(self.CLAIMED)):
+            claimed_path = self._path(self.CLAIMED, claim)
+            try:
+                if now - os.path.getmtime(claimed_path) < max_age:
+                    continue
+                os.rename(claimed_path, self._path(self.PENDING, f"{claim.split('.')[0]}.json"))
+            except FileNotFoundError:
+                continue
+            released += 1
+        return released
+
+    def unmerged_results(self) -> list[tuple[str, dict]]:
+        """
+        Load all results that were not merged yet.
+
+        Results stay in the results directory until mark_merged() is called
+        for them, so a merge that fails is repeated by the next one.
+
+        Returns:
+            list[tuple[str, dict]]: Queue name and content of every result in item order.
+        """
+        results = []
+        for name in sorted(os.listdir(self._path(self.RESULTS))):
+            if not name.endswith(".json"):
+                continue
+            with open(self._path(self.RESULTS, name), encoding="utf-8") as file:
+                results.append((name, json.load(file)))
+        return results
+
+    def mark_merged(self, name: str) -> None:
+        """
+        Move a stored result to the merged directory.
+
+        Args:
+            name (str): Queue name of the result.
+        """
+        os.replace(self._path(self.RESULTS, name), self._path(self.MERGED, name))
+
+    def _path(self, *parts: str) -> str:
+        """
+        Build a path inside the queue directory.
+
+        Args:
+            *parts (str): Path components below the queue directory.
+
+        Returns:
+            str: Joined path.
+        """
+        return os.path.join(self.directory, *parts)
+
+    @staticmethod
+    def _write_json(path: str, data: dict) -> None:
+        """
+        Write a JSON file atomically through a temporary file in the same directory.
+
+        Args:
+            path (str): Destination path.
+            data (dict): JSON-serializable content.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, path)
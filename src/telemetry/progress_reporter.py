@@ -0,0 +1,127 @@
+import json
+import sys
+import time
+
+import config
+from layout.layout import Layout
+
+
+class ProgressReporter():
+    """
+    Rate-limited progress events of running simulations.
+
+    Events are written to stderr and, optionally, appended to a JSON-lines
+    file that external monitors can tail. The calculation calls update()
+    once per sweep; the call returns after a single clock read until the
+    reporting interval has elapsed.
+
+    Attributes:
+        interval (float): Minimal time between two events in seconds.
+        jsonl_path (str | None): Path of the JSON-lines file, None to report to stderr only.
+    """
+    def __init__(self, interval: float = config.PROGRESS_INTERVAL, jsonl_path: str | None = None) -> None:
+        """
+        Initialize the reporter.
+
+        Args:
+            interval (float): Minimal time between two events in seconds.
+            jsonl_path (str | None): Path of the JSON-lines file, None to report to stderr only.
+        """
+        self.interval = interval
+        self.jsonl_path = jsonl_path
+        self._file = open(jsonl_path, "a", encoding="utf-8") if jsonl_path else None
+        self._run = {}
+
+    def start(self, layout: Layout, atoms_num: int) -> None:
+        """
+        Start reporting a new simulation.
+
+        Args:
+            layout (Layout): Starting layout of the simulation.
+            atoms_num (int): Number of atoms in the simulation.
+        """
+        now = time.monotonic()
+        self._run = {"layout": layout.value, "atoms": atoms_num}
+        self._start_time = now
+        self._last_time = now
+        self._next_time = now + self.interval
+        self._last_attached = 0
+        self._last_ion_steps = 0
+        self._attach_rate = None
+
+    def update(self, free_ions: int, ion_steps: int, cluster_rg: float) -> None:
+        """
+        Report the progress if the reporting interval has elapsed.
+
+        Args:
+            free_ions (int): Number of free ions left.
+            ion_steps (int): Total number of ion steps so far.
+            cluster_rg (float): Current radius of gyration of the dendrimer.
+        """
+        now = time.monotonic()
+        if now < self._next_time:
+            return
+        self._next_time = now + self.interval
+        self._emit("progress", now, free_ions, ion_steps, cluster_rg)
+
+    def finish(self, ion_steps: int, cluster_rg: float) -> None:
+        """
+        Report the end of the current simulation.
+
+        Args:
+            ion_steps (int): Total number of ion steps of the simulation.
+            cluster_rg (float): Final radius of gyration of the dendrimer.
+        """
+        self._emit("finished", time.monotonic(), 0, ion_steps, cluster_rg)
+
+    def close(self) -> None:
+        """
+        Close the JSON-lines file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _emit(self, event: str, now: float, free_ions: int, ion_steps: int, cluster_rg: float) -> None:
+        """
+        Write a single progress event.
+
+        The attachment rate used for the ETA is smoothed exponentially over events.
+
+        Args:
+            event (str): Event type ("progress" or "finished").
+            now (float): Current monotonic time.
+            free_ions (int): Number of free ions left.
+            ion_steps (int): Total number of ion steps so far.
+            cluster_rg (float): Current radius of gyration of the dendrimer.
+        """
+        elapsed = max(now - self._last_time, 1e-9)
+        attached = self._run["atoms"] - free_ions
+        attach_rate = (attached - self._last_attached) / elapsed
+        step_rate = (ion_steps - self._last_ion_steps) / elapsed
+        if self._attach_rate is None:
+            self._attach_rate = attach_rate
+        else:
+            self._attach_rate += config.PROGRESS_RATE_SMOOTHING * (attach_rate - self._attach_rate)
+        eta = free_ions / self._attach_rate if self._attach_rate > 0 else None
+        self._last_time = now
+        self._last_attached = attached
+        self._last_ion_steps = ion_steps
+        record = {
+            "event": event,
+            "time": time.time(),
+            **self._run,
+            "elapsed": now - self._start_time,
+            "free_ions": free_ions,
+            "attachments_per_s": attach_rate,
+            "ion_steps_per_s": step_rate,
+            "cluster_rg": cluster_rg,
+            "eta": eta,
+        }
+        eta_text = f"{eta:.0f} s" if eta is not None else "?"
+        print(f"[{record['layout']}, N = {record['atoms']}] {event}: {free_ions} free ions, "
+              f"{attach_rate:.1f} attachments/s, {step_rate:.0f} ion steps/s, Rg = {cluster_rg:.3f}, ETA {eta_text}",
+              file=sys.stderr)
+        if self._file is not None:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
@@ -0,0 +1,162 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import config
+from calculation import Calculation
+
+class ThreadedCalculation (Calculation):
+    """
+    Calculation that advances all free ions of a sweep at once on a thread pool.
+
+    The free ions are split into chunks and the nearest-electrode search and
+    the step of every chunk are evaluated by NumPy kernels that release the
+    GIL, so the chunks run on several cores. All ions of a sweep see the
+    dendrimer as it was at the start of the sweep. Random directions are drawn
+    in the main thread and attachments are merged in ascending ion order
+    afterwards, so a result depends only on the random seed, not on the
+    number of threads. The engine therefore always uses the synchronous
+    update order, whatever update_order the parameters ask for.
+
+    Attributes:
+        threads (int): Number of threads of the pool.
+    """
+    def __init__(self, simulation, reporter=None, threads: int = config.THREADS_DEFAULT) -> None:
+        """
+        Initialize the ThreadedCalculation helper.
+
+        Args:
+            simulation (Simulation): Parent simulation instance.
+            reporter (ProgressReporter | None): Receiver of progress events, None to run silently.
+            threads (int): Number of threads of the pool.
+        """
+        super().__init__(simulation, reporter)
+        self.threads = max(1, threads)
+
+    def calculate_sim(self) -> None:
+        """
+        Perform all simulation sweeps until all free ions become electrodes.
+
+        Progress is passed to the reporter once per sweep. Once at most
+        end_phase_threshold ions are left, the end phase of the reference engine takes over.
+        """
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            while len(self.ions) != 0:
+                if len(self.ions) <= self.params.end_phase_threshold:
+                    self._end_phase_sweep()
+                else:
+                    self.ion_steps += len(self.ions)
+                    self._sweep(executor)
+                if self.reporter is not None:
+                    self.reporter.update(len(self.ions), self.ion_steps, self.cluster_gyration())
+        if self.reporter is not None:
+            self.reporter.finish(self.ion_steps, self.cluster_gyration())
+
+    def _sweep(self, executor: ThreadPoolExecutor) -> None:
+        """
+        Advance every free ion by one step or bind it to the dendrimer.
+
+        As in the reference engine, an ion bonds to its current nearest
+        electrode when its distance to the dendrimer before its last step was
+        within the bonding distance.
+
+        Args:
+            executor (ThreadPoolExecutor): Thread pool evaluating the chunks.
+        """
+        positions = np.array([ion.position for ion in self.ions], dtype=self.dtype)
+        random_directions = np.random.randn(len(positions), 3).astype(self.dtype, copy=False)
+        electrodes = self._electrode_positions[:len(self.electrodes)]
+        bounds = self._chunk_bounds(len(positions), len(electrodes))
+        chunks = list(executor.map(
+            lambda bound: self._advance_chunk(positions[bound[0]:bound[1]], random_directions[bound[0]:bound[1]], electrodes),
+            zip(bounds[:-1], bounds[1:])))
+        nearest = np.concatenate([chunk[0] for chunk in chunks])
+        distances = np.concatenate([chunk[1] for chunk in chunks])
+        new_positions = np.concatenate([chunk[2] for chunk in chunks])
+        attached = np.array([ion.electrode_dist for ion in self.ions]) <= self.params.bond_distance
+        remaining = []
+        for i, ion in enumerate(self.ions):
+            if attached[i]:
+                parent = (self.electrodes[nearest[i]] if nearest[i] >= 0
+                          else self.geometry.anchor(ion.position, self.params.atom_radius))
+                self._attach(ion, parent)
+                continue
+            ion.electrode_dist = float(distances[i])
+            ion.update_position(new_positions[i])
+            remaining.append(ion)
+        self.ions[:] = remaining
+
+    def _chunk_bounds(self, ions_num: int, electrodes_num: int) -> np.ndarray:
+        """
+        Split the free ions into chunks.
+
+        There is at least one chunk per thread, and no chunk holds more than
+        THREADED_BLOCK_SIZE ion-electrode distances.
+
+        Args:
+            ions_num (int): Number of free ions.
+            electrodes_num (int): Number of electrodes.
+
+        Returns:
+            np.ndarray: Chunk boundaries in the ion order, from 0 to ions_num.
+        """
+        chunks = max(self.threads, -(-ions_num * max(electrodes_num, 1) // config.THREADED_BLOCK_SIZE))
+        chunks = min(chunks, ions_num)
+        return np.linspace(0, ions_num, chunks + 1).astype(np.int64)
+
+    def _advance_chunk(self, positions: np.ndarray, random_directions: np.ndarray, electrodes: np.ndarray) -> tuple:
+        """
+        Find the nearest electrode of every ion in a chunk and compute its next position.
+
+        Runs on a pool thread and only reads shared state.
+
+        Args:
+            positions (np.ndarray): Ion positions, shape (n, 3).
+            random_directions (np.ndarray): Unnormalized random direction of every ion, shape (n, 3).
+            electrodes (np.ndarray): Electrode positions at the start of the sweep, shape (m, 3).
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray, np.ndarray) - nearest electrode index
+                (-1 for the electrode surface), distance to it and next position of every ion.
+        """
+        nearest, distances = self._nearest_electrodes(positions, electrodes)
+        pref_direc = np.zeros_like(positions)
+        has_electrode = nearest >= 0
+        pref_direc[has_electrode] = electrodes[nearest[has_electrode]] - positions[has_electrode]
+        if self.geometry is not None:
+            surface_dist = (self.geometry.surface_distances(positions) + self.params.atom_radius).astype(self.dtype, copy=False)
+            on_surface = surface_dist < distances
+            nearest[on_surface] = -1
+            distances[on_surface] = surface_dist[on_surface]
+            pref_direc[on_surface] = -self.geometry.surface_normals(positions[on_surface])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # an ion lying exactly on an electrode has no direction, but it binds in this sweep
+            norm_pref_direc = pref_direc / np.linalg.norm(pref_direc, axis=1, keepdims=True)
+        norm_rand_direc = random_directions / np.linalg.norm(random_directions, axis=1, keepdims=True)
+        probability = self.dtype.type(self.params.direc_prob)
+        biased_vec = (1 - probability) * norm_rand_direc + probability * norm_pref_direc
+        biased_vec /= np.linalg.norm(biased_vec, axis=1, keepdims=True)
+        return nearest, distances, positions + biased_vec * self.dtype.type(self.params.step)
+
+    @staticmethod
+    def _nearest_electrodes(positions: np.ndarray, electrodes: np.ndarray) -> tuple:
+        """
+        Find the nearest electrode of every position.
+
+        Squared distances are summed per axis, so the result of every ion does
+        not depend on the size of its chunk.
+
+        Args:
+            positions (np.ndarray): Ion positions, shape (n, 3).
+            electrodes (np.ndarray): Electrode positions, shape (m, 3).
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray) - nearest electrode index (-1 without electrodes) and distance to it.
+        """
+        if len(electrodes) == 0:
+            return np.full(len(positions), -1, dtype=np.int64), np.full(len(positions), np.inf)
+        dist_sq = (positions[:, None, 0] - electrodes[None, :, 0]) ** 2
+        dist_sq += (positions[:, None, 1] - electrodes[None, :, 1]) ** 2
+        dist_sq += (positions[:, None, 2] - electrodes[None, :, 2]) ** 2
+        nearest = np.argmin(dist_sq, axis=1)
+        return nearest, np.sqrt(dist_sq[np.arange(len(positions)), nearest])
@@ -0,0 +1,9 @@
+from enum import Enum
+
+class UpdateOrderType(Enum):
+    """
+    Order in which free ions are advanced within a sweep.
+    """
+    SEQUENTIAL = "sequential"  # fixed order of the active ion set
+    RANDOM = "random"  # new random permutation in every sweep
+    SYNCHRONOUS = "synchronous"  # all ions see the dendrimer as it was at the start of the sweep
@@ -0,0 +1,236 @@
+import math
+
+import numpy as np
+
+import config
+from layout.layout import Layout
+from engine_type import EngineType
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from simulation_params import SimulationParams
+from simulation import Simulation
+from validation.permutation_test import PermutationTest
+
+
+class EngineValidation ():
+    """
+    Check that a candidate engine produces the same dendrimers as the reference engine.
+
+    For every layout and number of atoms, the same seeds are simulated with
+    both engines, alternating between them so that both see the same machine
+    load. The samples are compared by three permutation tests: a
+    Kolmogorov-Smirnov test of the Rg distributions, a test of the mean Rg
+    and a test of the mean generation histograms. For every layout with at
+    least two numbers of atoms, the fractal dimensions fitted from log N
+    against log Rg are compared by a bootstrap of their difference. The
+    verdict is Bonferroni-corrected over all tests. A permutation test of
+    n runs per engine cannot give a p-value below 2 / C(2n, n), so the number
+    of seeds is raised until this bound is below the corrected significance
+    level; otherwise no difference could ever be detected. The speedup is
+    measured from the calculation durations of the same runs.
+
+    Attributes:
+        candidate (EngineType): Engine under validation.
+        reference (EngineType): Engine whose results are taken as correct.
+        params (SimulationParams): Physical parameters of the simulations.
+        electrode_type (ElectrodeGeometryType): Shape of the electrode of the simulations.
+        threads (int): Number of threads of the threaded engine.
+        gyrations (dict): Rg samples (reference, candidate) for each (layout, number of atoms).
+        histograms (dict): Generation histograms (reference, candidate), one row per run, for each (layout, number of atoms).
+        durations (dict): Total calculation time (reference, candidate) for each (layout, number of atoms).
+        dimensions (dict): Fitted fractal dimensions (reference, candidate) for each layout.
+        p_values (dict): p-value of every test, keyed by (layout, number of atoms or None, test name).
+        replicates (int): Number of seeds of every layout and number of atoms in the last run.
+    """
+    def __init__(self, candidate: EngineType, params: SimulationParams,
+                 electrode_type: ElectrodeGeometryType = ElectrodeGeometryType.POINT,
+                 reference: EngineType = EngineType.REFERENCE, threads: int = config.THREADS_DEFAULT) -> None:
+        """
+        Initialize the validation.
+
+        Args:
+            candidate (EngineType): Engine under validation.
+            params (SimulationParams): Physical parameters of the simulations.
+            electrode_type (ElectrodeGeometryType): Shape of the electrode of the simulations.
+            reference (EngineType): Engine whose results are taken as correct.
+            threads (int): Number of threads of the threaded engine.
+        """
+        self.candidate = candidate
+        self.reference = reference
+        self.params = params
+        self.electrode_type = electrode_type
+        self.threads = threads
+        self.gyrations = {}
+        self.histograms = {}
+        self.durations = {}
+        self.dimensions = {}
+        self.p_values = {}
+        self.replicates = 0
+
+    def run(self, layouts: list[Layout], atom_numbers: list[int], replicates: int) -> bool:
+        """
+        Simulate every layout and number of atoms with both engines and test the differences.
+
+        Args:
+            layouts (list[Layout]): Starting layouts to validate.
+            atom_numbers (list[int]): Numbers of atoms to validate.
+            replicates (int): Number of seeds for each layout and number of atoms, raised to the
+                smallest number that can show a significant difference.
+
+        Returns:
+            bool: True if no test shows a significant difference.
+        """
+        distinct = len(set(atom_numbers))
+        tests = len(layouts) * (3 * distinct + (1 if distinct >= 2 else 0))
+        self.replicates = max(replicates, self._required_replicates(config.VALIDATION_SIGNIFICANCE / tests))
+        if self.replicates > replicates:
+            print(f"Using {self.replicates} seeds instead of {replicates}, fewer cannot reach the significance level of {tests} tests")
+        seeds = np.random.SeedSequence().generate_state(self.replicates)
+        test = PermutationTest()
+        for layout in layouts:
+            for atom_number in atom_numbers:
+                runs = [[self._simulate(layout, atom_number, int(seed), engine) for engine in (self.reference, self.candidate)]
+                        for seed in seeds]
+                key = (layout, atom_number)
+                self.gyrations[key] = tuple(np.array([run[i][0] for run in runs]) for i in range(2))
+                self.histograms[key] = self._stack_histograms([run[i][1] for run in runs] for i in range(2))
+                self.durations[key] = tuple(sum(run[i][2] for run in runs) for i in range(2))
+                reference_rg, candidate_rg = self.gyrations[key]
+                self.p_values[(layout, atom_number, "Rg distribution")] = test.kolmogorov_smirnov(reference_rg, candidate_rg)[1]
+                self.p_values[(layout, atom_number, "Rg mean")] = test.mean_difference(reference_rg, candidate_rg)
+                self.p_values[(layout, atom_number, "generations")] = test.distribution_difference(*self.histograms[key])[1]
+            if len(set(atom_numbers)) >= 2:
+                self._compare_dimensions(layout, atom_numbers, test.rng)
+        return self.passed
+
+    @property
+    def passed(self) -> bool:
+        """Whether no test shows a significant difference."""
+        return all(p_value >= self._threshold for p_value in self.p_values.values())
+
+    @property
+    def speedup(self) -> float:
+        """Total reference calculation time divided by the total candidate calculation time."""
+        reference_time = sum(duration[0] for duration in self.durations.values())
+        candidate_time = sum(duration[1] for duration in self.durations.values())
+        return reference_time / candidate_time if candidate_time > 0 else float("inf")
+
+    def report(self) -> None:
+        """
+        Print the compared quantities, p-values and speedup of every layout and number of atoms, and the verdict.
+        """
+        for (layout, atom_number), (reference_rg, candidate_rg) in self.gyrations.items():
+            reference_time, candidate_time = self.durations[(layout, atom_number)]
+            tests = ", ".join(f"{name} p = {self.p_values[(layout, atom_number, name)]:.4f}"
+                              for name in ("Rg distribution", "Rg mean", "generations"))
+            print(f"{layout.value}, N = {atom_number}: Rg {self.reference.value} = {reference_rg.mean():.4f} +- {reference_rg.std(ddof=1):.4f}, "
+                  f"{self.candidate.value} = {candidate_rg.mean():.4f} +- {candidate_rg.std(ddof=1):.4f}; {tests}; "
+                  f"speedup {reference_time / max(candidate_time, 1e-12):.2f}x")
+        for layout, (reference_df, candidate_df) in self.dimensions.items():
+            print(f"{layout.value}: Df {self.reference.value} = {reference_df:.4f}, {self.candidate.value} = {candidate_df:.4f}, "
+                  f"p = {self.p_values[(layout, None, 'fractal dimension')]:.4f}")
+        failed = [key for key, p_value in self.p_values.items() if p_value < self._threshold]
+        for layout, atom_number, name in failed:
+            print(f"DIFFERENT: {layout.value}{'' if atom_number is None else f', N = {atom_number}'}, {name}")
+        print(f"Engine validation of {self.candidate.value} against {self.reference.value} {'passed' if self.passed else 'failed'} "
+              f"(significance {config.VALIDATION_SIGNIFICANCE} over {len(self.p_values)} tests), speedup {self.speedup:.2f}x")
+
+    @staticmethod
+    def _required_replicates(threshold: float) -> int:
+        """
+        Smallest number of runs per engine whose permutation tests can reach a significance level.
+
+        Args:
+            threshold (float): Significance level of a single test.
+
+        Returns:
+            int: Number of runs per engine, at least two.
+        """
+        replicates = 2
+        while 2 / math.comb(2 * replicates, replicates) >= threshold:
+            replicates += 1
+        return replicates
+
+    @property
+    def _threshold(self) -> float:
+        """Bonferroni-corrected significance level of a single test."""
+        return config.VALIDATION_SIGNIFICANCE / max(len(self.p_values), 1)
+
+    def _simulate(self, layout: Layout, atom_number: int, seed: int, engine: EngineType) -> tuple:
+        """
+        Run a single simulation without storing it.
+
+        Args:
+            layout (Layout): Starting layout of free ions.
+            atom_number (int): Number of atoms.
+            seed (int): Seed of the random number generator.
+            engine (EngineType): Calculation engine of the simulation.
+
+        Returns:
+            tuple: (float, np.ndarray, float) - gyration radius, generation histogram and calculation duration.
+        """
+        np.random.seed(seed)
+        sim = Simulation(layout, atom_number, engine, self.params, self.electrode_type, save_to_db=False, threads=self.threads)
+        sim.release_storage()
+        return sim.get_radius_of_gyration(), sim.topology.generation_histogram, sim.duration
+
+    def _compare_dimensions(self, layout: Layout, atom_numbers: list[int], rng: np.random.Generator) -> None:
+        """
+        Fit the fractal dimension of both engines and bootstrap the p-value of their difference.
+
+        Args:
+            layout (Layout): Starting layout of the compared runs.
+            atom_numbers (list[int]): Numbers of atoms of the compared runs.
+            rng (np.random.Generator): Random number generator.
+        """
+        fits = []
+        for i in range(2):
+            atoms = np.concatenate([np.full(len(self.gyrations[(layout, n)][i]), n) for n in atom_numbers])
+            gyrations = np.concatenate([self.gyrations[(layout, n)][i] for n in atom_numbers])
+            fits.append((np.polyfit(np.log10(gyrations), np.log10(atoms), 1)[0],
+                         self._bootstrap_slopes(np.log10(atoms), np.log10(gyrations), atoms, rng)))
+        self.dimensions[layout] = (float(fits[0][0]), float(fits[1][0]))
+        difference = fits[1][1] - fits[0][1]
+        difference = difference[np.isfinite(difference)]
+        extreme = min(np.count_nonzero(difference <= 0), np.count_nonzero(difference >= 0))
+        self.p_values[(layout, None, "fractal dimension")] = min(1.0, 2 * (extreme + 1) / (len(difference) + 1))
+
+    @staticmethod
+    def _bootstrap_slopes(log_n: np.ndarray, log_rg: np.ndarray, atoms: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Bootstrap the least-squares slope of log N against log Rg, resampling runs within each number of atoms.
+
+        Args:
+            log_n (np.ndarray): log10 of the number of atoms of every run.
+            log_rg (np.ndarray): log10 of the gyration radius of every run.
+            atoms (np.ndarray): Number of atoms of every run.
+            rng (np.random.Generator): Random number generator.
+
+        Returns:
+            np.ndarray: Slope of every resample, shape (BOOTSTRAP_RESAMPLES,).
+        """
+        order = np.argsort(atoms, kind="stable")
+        _, starts, counts = np.unique(atoms[order], return_index=True, return_counts=True)
+        group_start = np.repeat(starts, counts)
+        group_count = np.repeat(counts, counts)
+        offsets = np.floor(rng.random((config.BOOTSTRAP_RESAMPLES, len(atoms))) * group_count).astype(np.int64)
+        resample_idx = order[group_start + offsets]
+        x = log_rg[resample_idx]
+        y = log_n[resample_idx]
+        x_centered = x - x.mean(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sum(x_centered * (y - y.mean(axis=1, keepdims=True)), axis=1) / np.sum(x_centered ** 2, axis=1)
+
+    @staticmethod
+    def _stack_histograms(groups) -> tuple:
+        """
+        Stack the generation histograms of both engines into zero-padded matrices of equal width.
+
+        Args:
+            groups (Iterable[list[np.ndarray]]): Histograms of the reference and of the candidate runs.
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray) - histograms of both engines, one row per run.
+        """
+        groups = [list(group) for group in groups]
+        width = max(len(histogram) for group in groups for histogram in group)
+        return tuple(np.array([np.pad(histogram, (0, width - len(histogram))) for histogram in group]) for group in groups)
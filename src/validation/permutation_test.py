@@ -0,0 +1,153 @@
+import numpy as np
+
+import config
+
+
+class PermutationTest ():
+    """
+    Permutation tests used by the validations.
+
+    The null distribution of every two-sample statistic is obtained by
+    drawing VALIDATION_PERMUTATIONS random relabelings of the pooled sample
+    at once, and that of a paired statistic by as many random sign flips of
+    the per-pair differences. This is exact enough for the small samples of
+    a validation run and needs no distribution tables.
+
+    Attributes:
+        rng (np.random.Generator): Random number generator of the relabelings.
+    """
+    def __init__(self, rng: np.random.Generator | None = None) -> None:
+        """
+        Initialize the tests.
+
+        Args:
+            rng (np.random.Generator | None): Random number generator, a fresh one if None.
+        """
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def mean_difference(self, first: np.ndarray, second: np.ndarray) -> float:
+        """
+        Two-sided test of the difference of two sample means.
+
+        Args:
+            first (np.ndarray): First sample.
+            second (np.ndarray): Second sample.
+
+        Returns:
+            float: p-value of the observed difference of means.
+        """
+        pooled = np.concatenate([first, second])
+        observed = abs(first.mean() - second.mean())
+        labels = self._draw_labels(len(first), len(pooled))
+        first_means = (labels * pooled).sum(axis=1) / len(first)
+        second_means = (~labels * pooled).sum(axis=1) / len(second)
+        return self._p_value(np.abs(first_means - second_means), observed)
+
+    def paired_mean_difference(self, first: np.ndarray, second: np.ndarray) -> float:
+        """
+        Two-sided test of the mean difference of paired samples.
+
+        Under the null hypothesis, the two values of every pair are
+        exchangeable, so every per-pair difference is equally likely to have
+        either sign.
+
+        Args:
+            first (np.ndarray): First value of every pair.
+            second (np.ndarray): Second value of every pair.
+
+        Returns:
+            float: p-value of the observed mean difference.
+        """
+        differences = np.asarray(first, dtype=np.float64) - np.asarray(second, dtype=np.float64)
+        observed = abs(differences.mean())
+        signs = self.rng.choice([-1.0, 1.0], size=(config.VALIDATION_PERMUTATIONS, len(differences)))
+        return self._p_value(np.abs(signs @ differences) / len(differences), observed)
+
+    def kolmogorov_smirnov(self, first: np.ndarray, second: np.ndarray) -> tuple:
+        """
+        Two-sample Kolmogorov-Smirnov test of two continuous samples.
+
+        The statistic is the largest distance of the two empirical distribution functions.
+
+        Args:
+            first (np.ndarray): First sample.
+            second (np.ndarray): Second sample.
+
+        Returns:
+            tuple: (float, float) - KS statistic and its p-value.
+        """
+        pooled = np.concatenate([first, second])
+        order = np.argsort(pooled, kind="stable")
+        is_first = np.arange(len(pooled)) < len(first)
+        observed = self._ks_statistics(is_first[order][None, :], len(first), len(second))[0]
+        labels = self._draw_labels(len(first), len(pooled))[:, order]
+        return float(observed), self._p_value(self._ks_statistics(labels, len(first), len(second)), observed)
+
+    def distribution_difference(self, first: np.ndarray, second: np.ndarray) -> tuple:
+        """
+        Test of the difference of two groups of discrete distributions.
+
+        Every row holds the counts of one run (e.g. its generation histogram).
+        Rows are normalized and the statistic is the L1 distance of the group
+        means. Whole runs are relabeled, so correlations within a run are kept.
+
+        Args:
+            first (np.ndarray): Counts of the first group, shape (runs, bins).
+            second (np.ndarray): Counts of the second group, shape (runs, bins).
+
+        Returns:
+            tuple: (float, float) - L1 distance of the mean distributions and its p-value.
+        """
+        pooled = np.concatenate([first, second]).astype(np.float64)
+        pooled /= np.maximum(pooled.sum(axis=1, keepdims=True), 1)
+        is_first = np.arange(len(pooled)) < len(first)
+        observed = np.abs(pooled[is_first].mean(axis=0) - pooled[~is_first].mean(axis=0)).sum()
+        labels = self._draw_labels(len(first), len(pooled))
+        first_means = labels @ pooled / len(first)
+        second_means = ~labels @ pooled / len(second)
+        return float(observed), self._p_value(np.abs(first_means - second_means).sum(axis=1), observed)
+
+    def _draw_labels(self, first_size: int, total_size: int) -> np.ndarray:
+        """
+        Draw random assignments of the pooled sample to the first group.
+
+        Args:
+            first_size (int): Size of the first sample.
+            total_size (int): Size of the pooled sample.
+
+        Returns:
+            np.ndarray: Membership in the first sample, shape (VALIDATION_PERMUTATIONS, total_size).
+        """
+        return self.rng.permuted(np.tile(np.arange(total_size) < first_size, (config.VALIDATION_PERMUTATIONS, 1)), axis=1)
+
+    @staticmethod
+    def _p_value(statistics: np.ndarray, observed: float) -> float:
+        """
+        Share of relabelings at least as extreme as the observation, counting the observation itself.
+
+        Args:
+            statistics (np.ndarray): Statistic of every relabeling.
+            observed (float): Observed statistic.
+
+        Returns:
+            float: p-value.
+        """
+        extreme = np.count_nonzero(statistics >= observed - 1e-12)
+        return float((extreme + 1) / (config.VALIDATION_PERMUTATIONS + 1))
+
+    @staticmethod
+    def _ks_statistics(labels: np.ndarray, first_size: int, second_size: int) -> np.ndarray:
+        """
+        KS statistics of labelings of a sorted pooled sample.
+
+        Args:
+            labels (np.ndarray): Membership in the first sample in ascending order of values, shape (k, n).
+            first_size (int): Size of the first sample.
+            second_size (int): Size of the second sample.
+
+        Returns:
+            np.ndarray: KS statistic of every labeling, shape (k,).
+        """
+        first_cdf = np.cumsum(labels, axis=1) / first_size
+        second_cdf = np.cumsum(~labels, axis=1) / second_size
+        return np.abs(first_cdf - second_cdf).max(axis=1)
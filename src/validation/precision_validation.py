@@ -0,0 +1,135 @@
+import numpy as np
+
+import config
+from layout.layout import Layout
+from engine_type import EngineType
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+from precision_type import PrecisionType
+from simulation_params import SimulationParams
+from simulation import Simulation
+from validation.permutation_test import PermutationTest
+
+
+class PrecisionValidation ():
+    """
+    Check that the float32 mode leaves the gyration radius statistically unchanged.
+
+    For every number of atoms, the same seeds are simulated in float64 and in
+    float32 precision, so the runs form pairs that share everything but the
+    precision. The per-seed differences of Rg are compared with a two-sided
+    sign-flip permutation test of their mean, Bonferroni-corrected over all
+    numbers of atoms. Pairing removes the seed-to-seed spread of Rg from the
+    test, which is much larger than the effect of the precision. A sign-flip
+    test of n pairs cannot give a p-value below 2 / 2^n, so the number of
+    seeds is raised until this bound is below the corrected significance
+    level; otherwise no difference could ever be detected.
+
+    Attributes:
+        layout (Layout): Starting layout of the simulations.
+        engine (EngineType): Calculation engine of the simulations.
+        params (SimulationParams): Physical parameters of the simulations.
+        electrode_type (ElectrodeGeometryType): Shape of the electrode of the simulations.
+        threads (int): Number of threads of the threaded and lattice engines.
+        results (dict): Rg samples (float64, float32) for each number of atoms.
+        p_values (dict): Permutation test p-value for each number of atoms.
+        replicates (int): Number of seeds of every number of atoms in the last run.
+    """
+    def __init__(self, layout: Layout, engine: EngineType, params: SimulationParams,
+                 electrode_type: ElectrodeGeometryType = ElectrodeGeometryType.POINT,
+                 threads: int = config.THREADS_DEFAULT) -> None:
+        """
+        Initialize the validation.
+
+        Args:
+            layout (Layout): Starting layout of the simulations.
+            engine (EngineType): Calculation engine of the simulations.
+            params (SimulationParams): Physical parameters of the simulations.
+            electrode_type (ElectrodeGeometryType): Shape of the electrode of the simulations.
+            threads (int): Number of threads of the threaded and lattice engines.
+        """
+        self.layout = layout
+        self.engine = engine
+        self.params = params
+        self.electrode_type = electrode_type
+        self.threads = threads
+        self.results = {}
+        self.p_values = {}
+        self.replicates = 0
+
+    def run(self, atom_numbers: list[int], replicates: int) -> bool:
+        """
+        Simulate every number of atoms in both precisions and test the differences.
+
+        Args:
+            atom_numbers (list[int]): Numbers of atoms to validate.
+            replicates (int): Number of seeds for each number of atoms, raised to the smallest number
+                that can show a significant difference.
+
+        Returns:
+            bool: True if no number of atoms shows a significant difference.
+        """
+        tests = len(set(atom_numbers))
+        self.replicates = max(replicates, self._required_replicates(config.VALIDATION_SIGNIFICANCE / tests))
+        if self.replicates > replicates:
+            print(f"Using {self.replicates} seeds instead of {replicates}, fewer cannot reach the significance level of {tests} tests")
+        seeds = np.random.SeedSequence().generate_state(self.replicates)
+        test = PermutationTest()
+        for atom_number in atom_numbers:
+            samples = tuple(np.array([self._simulate(atom_number, int(seed), precision) for seed in seeds])
+                            for precision in PrecisionType)
+            self.results[atom_number] = samples
+            self.p_values[atom_number] = test.paired_mean_difference(samples[0], samples[1])
+        return self.passed
+
+    @property
+    def passed(self) -> bool:
+        """Whether no number of atoms shows a significant difference."""
+        threshold = config.VALIDATION_SIGNIFICANCE / max(len(self.p_values), 1)
+        return all(p_value >= threshold for p_value in self.p_values.values())
+
+    def report(self) -> None:
+        """
+        Print the Rg of both precisions, the p-value and the verdict for every number of atoms.
+        """
+        threshold = config.VALIDATION_SIGNIFICANCE / max(len(self.p_values), 1)
+        for atom_number, (rg_64, rg_32) in self.results.items():
+            p_value = self.p_values[atom_number]
+            print(f"N = {atom_number}: Rg float64 = {rg_64.mean():.4f} +- {rg_64.std(ddof=1):.4f}, "
+                  f"float32 = {rg_32.mean():.4f} +- {rg_32.std(ddof=1):.4f}, "
+                  f"p = {p_value:.4f} {'OK' if p_value >= threshold else 'DIFFERENT'}")
+        print(f"Precision validation {'passed' if self.passed else 'failed'} "
+              f"(significance {config.VALIDATION_SIGNIFICANCE} over {len(self.p_values)} atom counts)")
+
+    @staticmethod
+    def _required_replicates(threshold: float) -> int:
+        """
+        Smallest number of pairs whose sign-flip test can reach a significance level.
+
+        Args:
+            threshold (float): Significance level of a single test.
+
+        Returns:
+            int: Number of seeds, at least two.
+        """
+        replicates = 2
+        while 2 / 2 ** replicates >= threshold:
+            replicates += 1
+        return replicates
+
+    def _simulate(self, atom_number: int, seed: int, precision: PrecisionType) -> float:
+        """
+        Run a single simulation without storing it.
+
+        Args:
+            atom_number (int): Number of atoms.
+            seed (int): Seed of the random number generator.
+            precision (PrecisionType): Floating-point precision of particle positions.
+
+        Returns:
+            float: Gyration radius of the resulting dendrimer.
+        """
+        np.random.seed(seed)
+        sim = Simulation(self.layout, atom_number, self.engine, self.params, self.electrode_type, precision,
+                         save_to_db=False, threads=self.threads)
+        sim.release_storage()
+        return sim.get_radius_of_gyration()
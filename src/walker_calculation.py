@@ -0,0 +1,123 @@
+import numpy as np
+
+import config
+from calculation import Calculation
+from geometry.electrode_geometry_type import ElectrodeGeometryType
+
+class WalkerCalculation (Calculation):
+    """
+    Witten-Sander launch-and-kill calculation with a single walker at a time.
+
+    Free ions are released one after another, in the order of the active set,
+    from a random point of a launch sphere WALKER_LAUNCH_MARGIN atom diameters
+    outside the bounding radius of the dendrimer. A walker moves by the biased
+    step of the reference engine, in batches of END_PHASE_STEPS steps as in
+    the end phase, until it is within the bonding distance of the dendrimer.
+    A walker found outside the kill sphere of WALKER_KILL_FACTOR launch radii
+    after a batch is relaunched. Only one ion moves at a time, so the cost of
+    a particle depends on the size and shape of the dendrimer, not on the
+    number of ions still waiting. The starting layout only decides the order
+    of release, and the update order does not apply. The launch sphere is
+    centered at the origin and must enclose the electrode, so only the
+    electrodes of ELECTRODES are supported: the plane and the wire have no
+    end, and walkers landing far out on them would grow the launch and kill
+    spheres without bound.
+
+    Attributes:
+        bounding_radius (float): Distance from the origin that no part of the dendrimer exceeds.
+        kills (int): Number of walkers relaunched after leaving the kill sphere.
+    """
+    ELECTRODES = (ElectrodeGeometryType.POINT, ElectrodeGeometryType.SPHERE) # electrodes a launch sphere can enclose
+    def __init__(self, simulation, reporter=None) -> None:
+        """
+        Initialize the WalkerCalculation helper.
+
+        Args:
+            simulation (Simulation): Parent simulation instance.
+            reporter (ProgressReporter | None): Receiver of progress events, None to run silently.
+        """
+        super().__init__(simulation, reporter)
+        self.bounding_radius = 0.0
+        if self.geometry is not None:
+            self.bounding_radius = self.geometry.surface_distance(np.zeros(3))
+        for electrode in self.electrodes:
+            self._grow_bounding_radius(electrode.position)
+        self.kills = 0
+
+    def calculate_sim(self) -> None:
+        """
+        Release the free ions one at a time until all of them are bound.
+
+        Progress is passed to the reporter after every bound ion.
+        """
+        while len(self.active) != 0:
+            last = len(self.active) - 1
+            self._walk(self.active[last])
+            self.active.remove_at(last)
+            if self.reporter is not None:
+                self.reporter.update(len(self.active), self.ion_steps, self.cluster_gyration())
+        if self.reporter is not None:
+            self.reporter.finish(self.ion_steps, self.cluster_gyration())
+
+    def _walk(self, ion) -> None:
+        """
+        Launch an ion and move it until it binds to the dendrimer.
+
+        Args:
+            ion (Ion): Free ion of interest.
+        """
+        launch_radius = self.bounding_radius + config.WALKER_LAUNCH_MARGIN * 2 * self.params.atom_radius
+        kill_radius = config.WALKER_KILL_FACTOR * launch_radius
+        self._launch(ion, launch_radius)
+        while not self._advance_straggler(ion):
+            if np.dot(ion.position, ion.position) > kill_radius ** 2:
+                self.kills += 1
+                self._launch(ion, launch_radius)
+
+    def _launch(self, ion, launch_radius: float) -> None:
+        """
+        Place an ion at a random point of the launch sphere.
+
+        A launched walker has not taken a step yet, so its distance before
+        the last step is unknown and it cannot bond before its first step.
+
+        Args:
+            ion (Ion): Free ion of interest.
+            launch_radius (float): Radius of the launch sphere.
+        """
+        ion.update_position(self._launch_position(launch_radius))
+        ion.electrode_dist = np.inf
+
+    def _launch_position(self, launch_radius: float) -> np.ndarray:
+        """
+        Draw a uniformly distributed point of the launch sphere.
+
+        Args:
+            launch_radius (float): Radius of the launch sphere.
+
+        Returns:
+            np.ndarray: Launch position in the precision of the simulation.
+        """
+        direction = np.random.randn(3)
+        return np.asarray(direction / np.linalg.norm(direction) * launch_radius, dtype=self.dtype)
+
+    def _attach(self, ion, nearest_electrode) -> None:
+        """
+        Bind a free ion to the dendrimer and grow the bounding radius over it.
+
+        Args:
+            ion (Ion): Free ion of interest.
+            nearest_electrode (Electrode): Parent electrode of the ion.
+        """
+        super()._attach(ion, nearest_electrode)
+        self._grow_bounding_radius(ion.position)
+
+    def _grow_bounding_radius(self, position: np.ndarray) -> None:
+        """
+        Grow the bounding radius over an electrode of the dendrimer.
+
+        Args:
+            position (np.ndarray): Position of the electrode.
+        """
+        distance = float(np.linalg.norm(np.asarray(position, dtype=np.float64))) + self.params.atom_radius
+        self.bounding_radius = max(self.bounding_radius, distance)